@@ -1,5 +1,14 @@
 from django.contrib import admin
-from .models import AcademicSession
+from .models import AcademicSession, Semester
+from .resolver import activate_session
+
+
+class SemesterInline(admin.TabularInline):
+    """Semesters edited on their session's page"""
+    
+    model = Semester
+    extra = 0
+    fields = ['name', 'start', 'end']
 
 
 @admin.register(AcademicSession)
@@ -15,9 +24,6 @@ class AcademicSessionAdmin(admin.ModelAdmin):
         ('Session Information', {
             'fields': ('name', 'start', 'end', 'active')
         }),
-        ('Semesters', {
-            'fields': ('semesters',)
-        }),
         ('Timestamps', {
             'fields': ('created_at', 'updated_at'),
             'classes': ('collapse',)
@@ -25,6 +31,16 @@ class AcademicSessionAdmin(admin.ModelAdmin):
     )
     
     readonly_fields = ['created_at', 'updated_at']
+    inlines = [SemesterInline]
+    actions = ['make_active']
+    
+    @admin.action(description='Make selected session active')
+    def make_active(self, request, queryset):
+        if queryset.count() != 1:
+            self.message_user(request, "Select exactly one session to activate.", level='error')
+            return
+        session = activate_session(queryset.get())
+        self.message_user(request, f"{session.name} is now the active session.")
     
     def get_queryset(self, request):
         return super().get_queryset(request)
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:30
+
+from django.db import migrations, models
+
+
+def keep_latest_active(apps, schema_editor):
+    """Leave only the most recently started session active before the constraint is added"""
+    AcademicSession = apps.get_model("academic_sessions", "AcademicSession")
+    latest = (
+        AcademicSession.objects.filter(active=True)
+        .order_by("-start", "-id")
+        .values_list("id", flat=True)
+        .first()
+    )
+    if latest is not None:
+        AcademicSession.objects.filter(active=True).exclude(id=latest).update(
+            active=False
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("academic_sessions", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(keep_latest_active, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="academicsession",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("active", True)),
+                fields=("active",),
+                name="single_active_session",
+            ),
+        ),
+    ]
@@ -0,0 +1,148 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:40
+
+import datetime
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+BATCH_SIZE = 500
+
+
+def parse_date(value):
+    try:
+        return datetime.date.fromisoformat(str(value)[:10]) if value else None
+    except ValueError:
+        return None
+
+
+def semester_rows(Semester, session_id, entries):
+    """Semester rows for a legacy JSON list of names or {name, start, end} objects"""
+    seen = set()
+    for entry in entries if isinstance(entries, list) else []:
+        if isinstance(entry, dict):
+            name = entry.get("name") or entry.get("semester")
+            start, end = parse_date(entry.get("start")), parse_date(entry.get("end"))
+        else:
+            name, start, end = entry, None, None
+        name = str(name or "").strip()[:20]
+        if name and name.lower() not in seen:
+            seen.add(name.lower())
+            yield Semester(session_id=session_id, name=name, start=start, end=end)
+
+
+def copy_semesters(apps, schema_editor):
+    """Create Semester rows from each session's ``semesters`` JSON list"""
+    AcademicSession = apps.get_model("academic_sessions", "AcademicSession")
+    Semester = apps.get_model("academic_sessions", "Semester")
+
+    batch = []
+    sessions = AcademicSession.objects.order_by("pk").values_list("pk", "semesters")
+    for session_id, entries in sessions.iterator(chunk_size=BATCH_SIZE):
+        batch.extend(semester_rows(Semester, session_id, entries))
+        if len(batch) >= BATCH_SIZE:
+            Semester.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        Semester.objects.bulk_create(batch)
+
+
+def restore_semesters(apps, schema_editor):
+    """Write Semester rows back to the JSON list"""
+    AcademicSession = apps.get_model("academic_sessions", "AcademicSession")
+    Semester = apps.get_model("academic_sessions", "Semester")
+
+    by_session = {}
+    for session_id, name, start, end in (
+        Semester.objects.order_by("session_id", "start", "id")
+        .values_list("session_id", "name", "start", "end")
+        .iterator(chunk_size=BATCH_SIZE)
+    ):
+        entry = {"name": name}
+        if start:
+            entry["start"] = start.isoformat()
+        if end:
+            entry["end"] = end.isoformat()
+        by_session.setdefault(session_id, []).append(entry)
+
+    sessions = []
+    for session_id, entries in by_session.items():
+        sessions.append(AcademicSession(pk=session_id, semesters=entries))
+        if len(sessions) >= BATCH_SIZE:
+            AcademicSession.objects.bulk_update(sessions, ["semesters"])
+            sessions = []
+    if sessions:
+        AcademicSession.objects.bulk_update(sessions, ["semesters"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("academic_sessions", "0002_single_active_session"),
+    ]
+
+    operations = [
+        # Created with a temporary reverse accessor: "semesters" is still the JSON field
+        migrations.CreateModel(
+            name="Semester",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(
+                        help_text="Semester name, e.g. first", max_length=20
+                    ),
+                ),
+                (
+                    "start",
+                    models.DateField(
+                        blank=True, help_text="Semester start date", null=True
+                    ),
+                ),
+                (
+                    "end",
+                    models.DateField(
+                        blank=True, help_text="Semester end date", null=True
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "session",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="semester_set",
+                        to="academic_sessions.academicsession",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Semester",
+                "verbose_name_plural": "Semesters",
+                "db_table": "academic_sessions_semester",
+                "ordering": ["session", "start", "id"],
+                "unique_together": {("session", "name")},
+            },
+        ),
+        migrations.RunPython(copy_semesters, restore_semesters),
+        migrations.RemoveField(
+            model_name="academicsession",
+            name="semesters",
+        ),
+        migrations.AlterField(
+            model_name="semester",
+            name="session",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="semesters",
+                to="academic_sessions.academicsession",
+            ),
+        ),
+    ]
@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 
 
 class AcademicSession(models.Model):
@@ -7,7 +7,6 @@ class AcademicSession(models.Model):
     name = models.CharField(max_length=255, help_text="Session name")
     start = models.DateField(help_text="Session start date")
     end = models.DateField(help_text="Session end date")
-    semesters = models.JSONField(default=list, help_text="List of semesters")
     active = models.BooleanField(default=False, help_text="Is this session active")
     
     created_at = models.DateTimeField(auto_now_add=True)
@@ -18,6 +17,43 @@ class AcademicSession(models.Model):
         verbose_name = 'Academic Session'
         verbose_name_plural = 'Academic Sessions'
         ordering = ['-start']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['active'],
+                condition=models.Q(active=True),
+                name='single_active_session'
+            ),
+        ]
     
     def __str__(self):
         return f"{self.name} ({self.start} - {self.end})"
+    
+    def save(self, *args, **kwargs):
+        """Saving a session as active deactivates the previous one in the same transaction"""
+        if not self.active:
+            return super().save(*args, **kwargs)
+        with transaction.atomic():
+            AcademicSession.objects.filter(active=True).exclude(pk=self.pk).update(active=False)
+            super().save(*args, **kwargs)
+
+
+class Semester(models.Model):
+    """A semester of an academic session, referenced by courses and attendance"""
+    
+    session = models.ForeignKey(AcademicSession, on_delete=models.CASCADE, related_name='semesters')
+    name = models.CharField(max_length=20, help_text="Semester name, e.g. first")
+    start = models.DateField(null=True, blank=True, help_text="Semester start date")
+    end = models.DateField(null=True, blank=True, help_text="Semester end date")
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'academic_sessions_semester'
+        verbose_name = 'Semester'
+        verbose_name_plural = 'Semesters'
+        ordering = ['session', 'start', 'id']
+        unique_together = ['session', 'name']
+    
+    def __str__(self):
+        return f"{self.session.name} - {self.name}"
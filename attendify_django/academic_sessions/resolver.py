@@ -0,0 +1,65 @@
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from utils.versioned_cache import VersionedLocalCache
+from .models import AcademicSession
+
+active_session_cache = VersionedLocalCache(
+    'academic_sessions:active',
+    timeout=settings.ACTIVE_SESSION_CACHE_TIMEOUT,
+)
+
+
+def _load_active_session():
+    return AcademicSession.objects.filter(active=True).first()
+
+
+def get_active_session():
+    """The active ``AcademicSession``, or None; cached per process.
+
+    The returned instance is shared between requests in this process, so
+    treat it as read-only and re-fetch it before saving.
+    """
+    return active_session_cache.get_or_set('session', _load_active_session)
+
+
+def current_semester(session, today=None):
+    """The ``Semester`` of ``session`` in progress on ``today``.
+
+    A semester whose dates cover today wins, then the latest one already
+    started; undated semesters fall back to the first one created.
+    """
+    if session is None:
+        return None
+    today = today or timezone.localdate()
+    semesters = list(session.semesters.all())
+
+    for semester in semesters:
+        if semester.start and semester.end and semester.start <= today <= semester.end:
+            return semester
+    started = [semester for semester in semesters if semester.start and semester.start <= today]
+    if started:
+        return max(started, key=lambda semester: semester.start)
+    return min(semesters, key=lambda semester: semester.pk, default=None)
+
+
+def get_current_semester():
+    """Current ``Semester`` of the active session, cached per process and day"""
+    today = timezone.localdate()
+    return active_session_cache.get_or_set(
+        ('semester', today),
+        lambda: current_semester(get_active_session(), today)
+    )
+
+
+def activate_session(session):
+    """Make ``session`` the only active session in one transaction"""
+    with transaction.atomic():
+        # Deactivate first: the partial unique constraint allows one active row
+        AcademicSession.objects.filter(active=True).exclude(pk=session.pk).update(active=False)
+        AcademicSession.objects.filter(pk=session.pk).update(active=True, updated_at=timezone.now())
+        # update() sends no signals
+        active_session_cache.bump()
+    session.active = True
+    return session
@@ -0,0 +1,21 @@
+from rest_framework import serializers
+
+from .models import AcademicSession, Semester
+
+
+class SemesterSerializer(serializers.ModelSerializer):
+    """Serializer for the semesters of a session"""
+    
+    class Meta:
+        model = Semester
+        fields = ['id', 'name', 'start', 'end']
+
+
+class AcademicSessionSerializer(serializers.ModelSerializer):
+    """Serializer for academic sessions"""
+    
+    semesters = SemesterSerializer(many=True, read_only=True)
+    
+    class Meta:
+        model = AcademicSession
+        fields = ['id', 'name', 'start', 'end', 'semesters', 'active']
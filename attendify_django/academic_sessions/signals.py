@@ -0,0 +1,13 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import AcademicSession, Semester
+from .resolver import active_session_cache
+
+
+@receiver(post_save, sender=AcademicSession)
+@receiver(post_delete, sender=AcademicSession)
+@receiver(post_save, sender=Semester)
+@receiver(post_delete, sender=Semester)
+def invalidate_active_session(sender, **kwargs):
+    active_session_cache.bump()
@@ -1,3 +1,213 @@
-from django.test import TestCase
+import datetime
+import importlib
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase
+from rest_framework.test import APIClient
+
+from attendance.models import Attendance, AttendanceSummary
+from authentication.models import User
+from courses.models import Course
+from utils.versioned_cache import VersionedLocalCache
+
+from .models import AcademicSession, Semester
+from .resolver import activate_session, active_session_cache, get_active_session, get_current_semester
+
+BEFORE = [('academic_sessions', '0002_single_active_session')]
+
+
+class ActiveSessionResolverTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        active_session_cache.clear_local()
+        self.addCleanup(active_session_cache.clear_local)
+        self.current = AcademicSession.objects.create(
+            name='2024/2025', start=datetime.date(2024, 9, 1), end=datetime.date(2025, 8, 31), active=True
+        )
+        self.next = AcademicSession.objects.create(
+            name='2025/2026', start=datetime.date(2025, 9, 1), end=datetime.date(2026, 8, 31)
+        )
+
+    def version(self):
+        return cache.get(active_session_cache.version_key, 0)
+
+    def test_active_session_is_cached(self):
+        self.assertEqual(get_active_session(), self.current)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_active_session(), self.current)
+
+    def test_activate_session_bumps_version(self):
+        get_active_session()
+        version = self.version()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            activate_session(self.next)
+
+        # Once on write, once more after commit
+        self.assertEqual(self.version(), version + 2)
+        self.assertEqual(get_active_session(), self.next)
+        self.assertEqual(
+            list(AcademicSession.objects.filter(active=True).values_list('pk', flat=True)), [self.next.pk]
+        )
+
+    def test_other_process_sees_the_bump(self):
+        # Another worker: its own local entries, the same shared version counter
+        other = VersionedLocalCache(active_session_cache.name, check_interval=0)
+        load = AcademicSession.objects.filter(active=True).first
+        self.assertEqual(other.get_or_set('session', load), self.current)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            activate_session(self.next)
+
+        self.assertEqual(other.get_or_set('session', load), self.next)
+
+    def test_semester_change_invalidates_current_semester(self):
+        self.assertIsNone(get_current_semester())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            semester = Semester.objects.create(session=self.current, name='First')
+
+        self.assertEqual(get_current_semester(), semester)
+
+    def active_id(self, client):
+        return client.get('/api/v1/academic-sessions/active/').json()['data']['session']['id']
+
+    def test_activate_endpoint(self):
+        admin = User.objects.create(email='admin@example.com', fullName='Admin', role='admin', access='approved')
+        client = APIClient()
+        client.force_authenticate(admin)
+        self.assertEqual(self.active_id(client), self.current.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.patch(f'/api/v1/academic-sessions/{self.next.pk}/activate/')
+
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(self.active_id(client), self.next.pk)
+
+
+class SemesterMigrationTests(TransactionTestCase):
+    """Semester JSON lists and strings become Semester rows (0003_semester and its dependents)"""
+
+    def setUp(self):
+        self.migrate(BEFORE)
+        self.addCleanup(self.migrate, None)
+        apps = self.applied_apps()
+        HistoricalSession = apps.get_model('academic_sessions', 'AcademicSession')
+        HistoricalCourse = apps.get_model('courses', 'Course')
+        HistoricalAttendance = apps.get_model('attendance', 'Attendance')
+        lecturer = apps.get_model('authentication', 'User').objects.create(
+            email='lecturer@example.com', fullName='Ada Lecturer'
+        )
+        student = apps.get_model('students', 'Student').objects.create(
+            name='Grace', regNo='2024/001', level='100', addmissionYear='2024'
+        )
+
+        self.current = HistoricalSession.objects.create(
+            name='2024/2025', start=datetime.date(2024, 9, 1), end=datetime.date(2025, 8, 31), active=True,
+            semesters=[
+                'First',
+                {'name': 'Second', 'start': '2025-01-10', 'end': '2025-05-01'},
+                # Duplicates and blanks are dropped
+                'first', '',
+            ],
+        )
+        self.previous = HistoricalSession.objects.create(
+            name='2023/2024', start=datetime.date(2023, 9, 1), end=datetime.date(2024, 8, 31), semesters=[],
+        )
+        self.course = HistoricalCourse.objects.create(
+            courseTitle='Algorithms', courseCode='CSC301', semester='first', level='300'
+        )
+        self.unscheduled = HistoricalCourse.objects.create(
+            courseTitle='Seminar', courseCode='CSC399', semester='', level='300'
+        )
+        self.attendance = {}
+        for day, (session, semester, status) in enumerate([
+            (self.current, 'First', 'present'),
+            (self.current, 'second ', 'late'),
+            (self.previous, '', 'absent'),
+            (self.previous, 'Rain', 'present'),
+        ], start=1):
+            self.attendance[session.pk, semester] = HistoricalAttendance.objects.create(
+                student=student, course=self.course, lecturer=lecturer, session=session,
+                semester=semester, status=status, level='300',
+                date=datetime.date(2024, 10, day), time=datetime.time(9),
+            ).pk
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.migrate(targets or executor.loader.graph.leaf_nodes())
+
+    def applied_apps(self):
+        loader = MigrationExecutor(connection).loader
+        return loader.project_state(list(loader.applied_migrations)).apps
+
+    def semester(self, session, name):
+        return Semester.objects.get(session_id=session.pk, name=name)
+
+    def test_forwards_creates_and_links_semesters(self):
+        self.migrate(None)
+
+        first, second = self.semester(self.current, 'First'), self.semester(self.current, 'Second')
+        self.assertEqual(Semester.objects.filter(session_id=self.current.pk).count(), 2)
+        self.assertEqual((second.start, second.end), (datetime.date(2025, 1, 10), datetime.date(2025, 5, 1)))
+        # Semesters only named by attendance are created in that attendance's session
+        self.assertEqual(
+            set(Semester.objects.filter(session_id=self.previous.pk).values_list('name', flat=True)),
+            {'unspecified', 'Rain'},
+        )
+
+        self.assertEqual(Course.objects.get(pk=self.course.pk).semester, first)
+        self.assertIsNone(Course.objects.get(pk=self.unscheduled.pk).semester)
+
+        expected = {
+            (self.current.pk, 'First'): first,
+            (self.current.pk, 'second '): second,
+            (self.previous.pk, ''): self.semester(self.previous, 'unspecified'),
+            (self.previous.pk, 'Rain'): self.semester(self.previous, 'Rain'),
+        }
+        for key, semester in expected.items():
+            self.assertEqual(Attendance.objects.get(pk=self.attendance[key]).semester, semester)
+
+        self.assertEqual(
+            set(AttendanceSummary.objects.values_list('semester__name', 'present', 'late', 'absent')),
+            {('First', 1, 0, 0), ('Second', 0, 1, 0), ('unspecified', 0, 0, 1), ('Rain', 1, 0, 0)},
+        )
+
+    def test_backwards_restores_semester_strings(self):
+        self.migrate(None)
+        self.migrate(BEFORE)
+
+        apps = self.applied_apps()
+        sessions = dict(apps.get_model('academic_sessions', 'AcademicSession').objects.values_list('pk', 'semesters'))
+        self.assertEqual(sessions[self.current.pk], [
+            {'name': 'First'},
+            {'name': 'Second', 'start': '2025-01-10', 'end': '2025-05-01'},
+        ])
+        self.assertEqual(
+            apps.get_model('courses', 'Course').objects.get(pk=self.course.pk).semester, 'First'
+        )
+        self.assertEqual(
+            dict(apps.get_model('attendance', 'Attendance').objects.values_list('pk', 'semester')),
+            {
+                self.attendance[self.current.pk, 'First']: 'First',
+                self.attendance[self.current.pk, 'second ']: 'Second',
+                self.attendance[self.previous.pk, '']: '',
+                self.attendance[self.previous.pk, 'Rain']: 'Rain',
+            },
+        )
+
+
+class SmallBatchSemesterMigrationTests(SemesterMigrationTests):
+    """The same migration walked one attendance row per batch"""
+
+    def setUp(self):
+        migration = importlib.import_module('attendance.migrations.0005_semester_fk')
+        patcher = mock.patch.object(migration, 'BATCH_SIZE', 1)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        super().setUp()
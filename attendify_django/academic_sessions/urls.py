@@ -0,0 +1,7 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('active/', views.fetch_active_session, name='fetch_active_session'),
+    path('<int:session_id>/activate/', views.activate_academic_session, name='activate_academic_session'),
+]
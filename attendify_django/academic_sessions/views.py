@@ -1,3 +1,65 @@
-from django.shortcuts import render
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework import status
 
-# Create your views here.
+from utils.responses import success_response, error_response
+from .models import AcademicSession
+from .resolver import activate_session, get_active_session, get_current_semester
+from .serializers import AcademicSessionSerializer, SemesterSerializer
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def fetch_active_session(request):
+    """The active academic session and its current semester"""
+    try:
+        session = get_active_session()
+        
+        if session is None:
+            return error_response(
+                "No academic session is active",
+                status.HTTP_404_NOT_FOUND
+            )
+        
+        semester = get_current_semester()
+        
+        return success_response(
+            "Active session fetched successfully",
+            data={
+                'session': AcademicSessionSerializer(session).data,
+                'semester': SemesterSerializer(semester).data if semester else None,
+            }
+        )
+        
+    except Exception as e:
+        return error_response(str(e), status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(['PATCH'])
+@permission_classes([IsAuthenticated])
+def activate_academic_session(request, session_id):
+    """Switch the active academic session (admin only)"""
+    try:
+        if request.user.role != 'admin':
+            return error_response(
+                "You are not authorized to perform this action",
+                status.HTTP_403_FORBIDDEN
+            )
+        
+        try:
+            session = AcademicSession.objects.get(id=session_id)
+        except AcademicSession.DoesNotExist:
+            return error_response(
+                "Academic session not found",
+                status.HTTP_404_NOT_FOUND
+            )
+        
+        activate_session(session)
+        
+        return success_response(
+            "Academic session activated successfully",
+            data=AcademicSessionSerializer(session).data
+        )
+        
+    except Exception as e:
+        return error_response(str(e), status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,218 @@
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.core.signals import request_finished, setting_changed
+from django.db import close_old_connections
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Activity
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    # Flush once this many events are waiting...
+    'BATCH_SIZE': 200,
+    # ...or the oldest waiting event is this many seconds old
+    'FLUSH_INTERVAL': 2.0,
+    # Events held in memory before the overflow policy applies
+    'MAX_BUFFER': 10000,
+    # 'drop' discards new events when full; 'flush' writes synchronously in the caller
+    'OVERFLOW': 'drop',
+    # Write every event immediately (tests, management commands)
+    'ALWAYS_FLUSH': False,
+    # Flush from a background thread; without it only requests and exit flush
+    'THREAD': True,
+}
+
+# Times a batch is written before its events are given up
+MAX_WRITE_ATTEMPTS = 2
+
+
+class ActivityBuffer:
+    """In-process buffer that writes ``Activity`` rows in batches.
+
+    ``log()`` only appends to a deque, so recording an event costs no query.
+    Batches are written with ``bulk_create`` by a background thread when the
+    size or age threshold is reached, after requests that find the buffer
+    due, and at interpreter exit. Buffered events are not part of the
+    caller's transaction and are lost if the process is killed outright.
+    """
+
+    def __init__(self, **options):
+        self.options = {**DEFAULTS, **options}
+        self._events = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._oldest = None
+        self._thread = None
+        self._pid = None
+        self.dropped = 0
+
+    def __len__(self):
+        return len(self._events)
+
+    def log(self, activity_type, user=None, description='', metadata=None):
+        """Record an event; returns False if it was dropped by backpressure"""
+        activity = Activity(
+            user_id=getattr(user, 'pk', user),
+            activity_type=activity_type,
+            description=description,
+            metadata=metadata or {},
+            # Stamped now: the row may only be written seconds later
+            created_at=timezone.now(),
+        )
+        if self.options['ALWAYS_FLUSH']:
+            return self._write([activity])
+        return self._append(activity)
+
+    def _append(self, activity):
+        with self._lock:
+            if len(self._events) >= self.options['MAX_BUFFER']:
+                if self.options['OVERFLOW'] != 'flush':
+                    self.dropped += 1
+                    if self.dropped == 1 or self.dropped % 1000 == 0:
+                        logger.warning('Activity buffer full; %s event(s) dropped so far', self.dropped)
+                    return False
+                overflow = True
+            else:
+                overflow = False
+                self._events.append(activity)
+                if self._oldest is None:
+                    self._oldest = time.monotonic()
+                full = len(self._events) >= self.options['BATCH_SIZE']
+
+        if overflow:
+            # Backpressure: the caller drains the buffer before its event is accepted
+            self.flush()
+            return self._append(activity)
+
+        if self.options['THREAD']:
+            self._ensure_worker()
+            if full:
+                self._wakeup.set()
+        elif full:
+            self.flush()
+        return True
+
+    def is_due(self):
+        with self._lock:
+            if not self._events:
+                return False
+            return (
+                len(self._events) >= self.options['BATCH_SIZE']
+                or time.monotonic() - self._oldest >= self.options['FLUSH_INTERVAL']
+            )
+
+    def flush(self):
+        """Write every buffered event now; returns the number written"""
+        written = 0
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    batch = [
+                        self._events.popleft()
+                        for _ in range(min(len(self._events), self.options['BATCH_SIZE']))
+                    ]
+                    self._oldest = time.monotonic() if self._events else None
+                if not batch:
+                    return written
+                if not self._write(batch):
+                    self._requeue(batch)
+                    return written
+                written += len(batch)
+
+    def flush_if_due(self):
+        if self.is_due():
+            self.flush()
+
+    def _write(self, batch):
+        try:
+            Activity.objects.bulk_create(batch, batch_size=self.options['BATCH_SIZE'])
+        except Exception:
+            # A failing batch must not take the request or the worker down with it
+            logger.exception('Could not write %s activity event(s)', len(batch))
+            return False
+        return True
+
+    def _requeue(self, batch):
+        """Put a failed batch back in front for one more attempt"""
+        retry = []
+        for activity in batch:
+            activity._write_attempts = getattr(activity, '_write_attempts', 0) + 1
+            if activity._write_attempts < MAX_WRITE_ATTEMPTS:
+                retry.append(activity)
+        if len(retry) < len(batch):
+            logger.error('Dropped %s activity event(s) after %s attempts', len(batch) - len(retry), MAX_WRITE_ATTEMPTS)
+        with self._lock:
+            self._events.extendleft(reversed(retry))
+            if self._events and self._oldest is None:
+                self._oldest = time.monotonic()
+
+    def _ensure_worker(self):
+        # Started lazily, and again in forked worker processes where the thread does not survive
+        if self._pid == os.getpid() and self._thread is not None:
+            return
+        with self._lock:
+            if self._pid == os.getpid() and self._thread is not None:
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='activity-buffer', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.options['FLUSH_INTERVAL'])
+            self._wakeup.clear()
+            try:
+                self.flush_if_due()
+            finally:
+                # The worker thread owns its own database connection
+                close_old_connections()
+
+
+_activity_buffer = None
+
+
+def get_activity_buffer():
+    """Return the process-wide buffer configured by ``settings.ACTIVITY_LOG``"""
+    global _activity_buffer
+    if _activity_buffer is None:
+        _activity_buffer = ActivityBuffer(**getattr(settings, 'ACTIVITY_LOG', {}))
+    return _activity_buffer
+
+
+def log_activity(activity_type, user=None, description='', metadata=None):
+    """Record an ``Activity`` without touching the database in the caller"""
+    return get_activity_buffer().log(activity_type, user, description, metadata)
+
+
+def flush_activities():
+    """Write all buffered events; use in tests or before reading the log"""
+    if _activity_buffer is None:
+        return 0
+    return _activity_buffer.flush()
+
+
+@receiver(setting_changed)
+def reset_activity_buffer(setting, **kwargs):
+    global _activity_buffer
+    if setting == 'ACTIVITY_LOG':
+        flush_activities()
+        _activity_buffer = None
+
+
+@receiver(request_finished)
+def flush_after_request(**kwargs):
+    # Runs after the response has been handed to the server
+    if _activity_buffer is not None:
+        _activity_buffer.flush_if_due()
+
+
+atexit.register(flush_activities)
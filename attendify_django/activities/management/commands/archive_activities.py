@@ -0,0 +1,43 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from activities.partitions import add_months, archive_period, get_partitioner, month_start
+
+
+class Command(BaseCommand):
+    help = 'Roll activity months into partitions or archive tables and archive expired months to JSONL'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--keep-days', type=int, default=settings.ACTIVITY_RETENTION_DAYS,
+                            help='Months entirely older than this are archived and removed')
+        parser.add_argument('--hot-days', type=int, default=settings.ACTIVITY_HOT_DAYS,
+                            help='Without partitioning, months older than this leave the live table')
+        parser.add_argument('--output-dir', default=str(settings.ACTIVITY_ARCHIVE_DIR))
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--dry-run', action='store_true', help='Only list the months that would be archived')
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        partitioner = get_partitioner()
+        # Only months that ended before the cutoff are archived, never part of a month
+        cutoff = month_start(now - timedelta(days=options['keep_days']))
+
+        if not options['dry_run']:
+            created = partitioner.prepare(now, hot_days=options['hot_days'], batch_size=options['batch_size'])
+            for table in created:
+                self.stdout.write(f'Created {table}')
+
+        expired = [period for period in partitioner.periods() if add_months(period.start, 1) <= cutoff]
+        for period in expired:
+            if options['dry_run']:
+                self.stdout.write(f'Would archive {period.table}')
+                continue
+            partitioner.release(period)
+            path, rows = archive_period(period, options['output_dir'], options['batch_size'])
+            self.stdout.write(f'Archived {rows} row(s) from {period.table} to {path}')
+
+        if not expired:
+            self.stdout.write('No expired activity months')
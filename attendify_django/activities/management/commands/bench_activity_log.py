@@ -0,0 +1,48 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from activities.buffer import ActivityBuffer
+from activities.models import Activity
+
+
+class Command(BaseCommand):
+    help = 'Compare per-event latency of buffered activity logging with one INSERT per event'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--events', type=int, default=20000, help='Events to log')
+        parser.add_argument('--batch-size', type=int, default=200, help='Buffer flush batch size')
+
+    def handle(self, *args, **options):
+        events = options['events']
+
+        # Everything written here is rolled back at the end
+        with transaction.atomic():
+            direct = []
+            for i in range(events):
+                start = time.perf_counter()
+                Activity.objects.create(activity_type='login', description=f'bench {i}')
+                direct.append(time.perf_counter() - start)
+
+            # No background thread: flushes happen in the logging call when a batch fills
+            buffer = ActivityBuffer(BATCH_SIZE=options['batch_size'], MAX_BUFFER=events, THREAD=False)
+            buffered = []
+            for i in range(events):
+                start = time.perf_counter()
+                buffer.log('login', description=f'bench {i}')
+                buffered.append(time.perf_counter() - start)
+            buffer.flush()
+
+            self.report('one INSERT per event', direct)
+            self.report(f'buffered, batches of {options["batch_size"]}', buffered)
+            transaction.set_rollback(True)
+
+    def report(self, label, timings):
+        timings = sorted(timings)
+        p99 = timings[int(len(timings) * 0.99) - 1]
+        self.stdout.write(
+            f'{label}: median {statistics.median(timings) * 1e6:.1f} us, '
+            f'p99 {p99 * 1e6:.1f} us, total {sum(timings):.2f} s'
+        )
@@ -0,0 +1,141 @@
+import datetime
+
+from django.db import migrations
+
+TABLE = "activities_activity"
+UNPARTITIONED = "activities_activity_unpartitioned"
+SEQUENCE = "activities_activity_id_seq"
+MONTHS_AHEAD = 3
+
+INDEXES = [
+    ("activity_created_idx", "(created_at DESC)"),
+    ("activity_user_created_idx", "(user_id, created_at DESC)"),
+    ("activity_type_created_idx", "(activity_type, created_at DESC)"),
+]
+
+
+def next_month(start):
+    if start.month == 12:
+        return start.replace(year=start.year + 1, month=1)
+    return start.replace(month=start.month + 1)
+
+
+def month_starts(first, last):
+    start = datetime.datetime(first.year, first.month, 1, tzinfo=datetime.timezone.utc)
+    while start <= last:
+        yield start
+        start = next_month(start)
+
+
+def partition_table(apps, schema_editor):
+    """Rebuild the activity table as monthly range partitions on created_at.
+
+    PostgreSQL only; other backends keep a plain table and roll old months
+    into archive tables with ``archive_activities``. The primary key becomes
+    (id, created_at) because it must include the partition key.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    user_table = (
+        apps.get_model("activities", "Activity")
+        ._meta.get_field("user")
+        .related_model._meta.db_table
+    )
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT min(created_at), max(created_at), coalesce(max(id), 0) FROM "
+            + TABLE
+        )
+        oldest, newest, last_id = cursor.fetchone()
+
+    now = datetime.datetime.now(datetime.timezone.utc)
+    first = min(oldest or now, now).astimezone(datetime.timezone.utc)
+    last = max(newest or now, now).astimezone(datetime.timezone.utc)
+    last = last + datetime.timedelta(days=31 * MONTHS_AHEAD)
+
+    for name, _ in INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+    schema_editor.execute(f"ALTER TABLE {TABLE} RENAME TO {UNPARTITIONED}")
+    # Index names are schema-wide; free the primary key name for the new table
+    schema_editor.execute(f"ALTER INDEX {TABLE}_pkey RENAME TO {UNPARTITIONED}_pkey")
+    schema_editor.execute(f"CREATE SEQUENCE {SEQUENCE}_part")
+    schema_editor.execute(
+        f"CREATE TABLE {TABLE} ("
+        f"id bigint NOT NULL DEFAULT nextval('{SEQUENCE}_part'), "
+        "activity_type varchar(50) NOT NULL, "
+        "description text NOT NULL, "
+        "metadata jsonb NOT NULL, "
+        "created_at timestamp with time zone NOT NULL, "
+        f"user_id bigint NULL REFERENCES {user_table} (id) DEFERRABLE INITIALLY DEFERRED, "
+        "PRIMARY KEY (id, created_at)"
+        ") PARTITION BY RANGE (created_at)"
+    )
+    schema_editor.execute(f"ALTER SEQUENCE {SEQUENCE}_part OWNED BY {TABLE}.id")
+    schema_editor.execute(f"CREATE TABLE {TABLE}_default PARTITION OF {TABLE} DEFAULT")
+    for start in month_starts(first, last):
+        schema_editor.execute(
+            f"CREATE TABLE {TABLE}_p{start:%Y_%m} PARTITION OF {TABLE} "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{next_month(start).isoformat()}')"
+        )
+    for name, columns in INDEXES:
+        schema_editor.execute(f"CREATE INDEX {name} ON {TABLE} {columns}")
+
+    schema_editor.execute(
+        f"INSERT INTO {TABLE} (id, activity_type, description, metadata, created_at, user_id) "
+        f"SELECT id, activity_type, description, metadata, created_at, user_id FROM {UNPARTITIONED}"
+    )
+    schema_editor.execute(
+        f"SELECT setval('{SEQUENCE}_part', {int(last_id) + 1}, false)"
+    )
+    schema_editor.execute(f"DROP TABLE {UNPARTITIONED}")
+
+
+def unpartition_table(apps, schema_editor):
+    """Collapse the partitions back into a plain table"""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    user_table = (
+        apps.get_model("activities", "Activity")
+        ._meta.get_field("user")
+        .related_model._meta.db_table
+    )
+
+    schema_editor.execute(f"ALTER TABLE {TABLE} RENAME TO {UNPARTITIONED}")
+    schema_editor.execute(f"ALTER INDEX {TABLE}_pkey RENAME TO {UNPARTITIONED}_pkey")
+    for name, _ in INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+    schema_editor.execute(
+        f"CREATE TABLE {TABLE} ("
+        "id bigint GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY, "
+        "activity_type varchar(50) NOT NULL, "
+        "description text NOT NULL, "
+        "metadata jsonb NOT NULL, "
+        "created_at timestamp with time zone NOT NULL, "
+        f"user_id bigint NULL REFERENCES {user_table} (id) DEFERRABLE INITIALLY DEFERRED"
+        ")"
+    )
+    schema_editor.execute(
+        f"INSERT INTO {TABLE} (id, activity_type, description, metadata, created_at, user_id) "
+        f"SELECT id, activity_type, description, metadata, created_at, user_id FROM {UNPARTITIONED}"
+    )
+    schema_editor.execute(
+        f"SELECT setval(pg_get_serial_sequence('{TABLE}', 'id'), "
+        f"coalesce((SELECT max(id) FROM {TABLE}), 0) + 1, false)"
+    )
+    schema_editor.execute(f"CREATE INDEX {TABLE}_user_id_idx ON {TABLE} (user_id)")
+    for name, columns in INDEXES:
+        schema_editor.execute(f"CREATE INDEX {name} ON {TABLE} {columns}")
+    # Partitions are dropped with their parent; archived months stay archived
+    schema_editor.execute(f"DROP TABLE {UNPARTITIONED}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("activities", "0003_activity_feed_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_table, unpartition_table),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.4 on 2026-10-18 16:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("activities", "0004_partition_activity"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="activity",
+            name="activity_type",
+            field=models.CharField(
+                choices=[
+                    ("login", "Login"),
+                    ("logout", "Logout"),
+                    ("register", "Register"),
+                    ("attendance_marked", "Attendance Marked"),
+                    ("student_added", "Student Added"),
+                    ("course_added", "Course Added"),
+                    ("user_approved", "User Approved"),
+                    ("user_denied", "User Denied"),
+                    ("password_changed", "Password Changed"),
+                    ("email_verified", "Email Verified"),
+                    ("sessions_revoked", "Sessions Revoked"),
+                ],
+                max_length=50,
+            ),
+        ),
+    ]
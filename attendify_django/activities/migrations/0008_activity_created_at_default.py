@@ -0,0 +1,19 @@
+# Generated by Django 5.2.4 on 2026-10-18 11:35
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("activities", "0007_catalogue_synced_activity"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="activity",
+            name="created_at",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
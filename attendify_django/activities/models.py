@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -18,6 +19,9 @@ class Activity(models.Model):
         ('user_denied', 'User Denied'),
         ('password_changed', 'Password Changed'),
         ('email_verified', 'Email Verified'),
+        ('sessions_revoked', 'Sessions Revoked'),
+        ('students_imported', 'Students Imported'),
+        ('catalogue_synced', 'Catalogue Synced'),
     ]
     
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='activities', null=True, blank=True)
@@ -25,13 +29,20 @@ class Activity(models.Model):
     description = models.TextField(help_text="Activity description")
     metadata = models.JSONField(default=dict, help_text="Additional activity data")
     
-    created_at = models.DateTimeField(auto_now_add=True)
+    # Set by the caller when the event happens, not when a buffered batch is written
+    created_at = models.DateTimeField(default=timezone.now)
     
     class Meta:
         db_table = 'activities_activity'
         verbose_name = 'Activity'
         verbose_name_plural = 'Activities'
         ordering = ['-created_at']
+        # Recent-activity feeds: overall, per user and per type, newest first
+        indexes = [
+            models.Index(fields=['-created_at'], name='activity_created_idx'),
+            models.Index(fields=['user', '-created_at'], name='activity_user_created_idx'),
+            models.Index(fields=['activity_type', '-created_at'], name='activity_type_created_idx'),
+        ]
     
     def __str__(self):
         user_name = self.user.fullName if self.user else "System"
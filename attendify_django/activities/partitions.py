@@ -0,0 +1,246 @@
+import datetime
+import gzip
+import json
+import os
+import re
+from dataclasses import dataclass
+
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Activity
+
+TABLE = Activity._meta.db_table
+COLUMNS = ('id', 'user_id', 'activity_type', 'description', 'metadata', 'created_at')
+PERIOD_TABLE = re.compile(rf'^{TABLE}_p(\d{{4}})_(\d{{2}})$')
+DEFAULT_PARTITION = f'{TABLE}_default'
+
+
+def month_start(value):
+    """First instant (UTC) of the month containing ``value``"""
+    if isinstance(value, datetime.datetime):
+        value = value.astimezone(datetime.timezone.utc)
+    return datetime.datetime(value.year, value.month, 1, tzinfo=datetime.timezone.utc)
+
+
+def add_months(start, months):
+    index = start.year * 12 + start.month - 1 + months
+    return start.replace(year=index // 12, month=index % 12 + 1)
+
+
+def period_table(start):
+    return f'{TABLE}_p{start:%Y_%m}'
+
+
+@dataclass(frozen=True)
+class Period:
+    """One month of activity rows held in its own table"""
+
+    table: str
+    start: datetime.datetime
+
+    @property
+    def end(self):
+        return add_months(self.start, 1)
+
+
+def _quote(name):
+    return connection.ops.quote_name(name)
+
+
+def _periods(names):
+    periods = []
+    for name in names:
+        match = PERIOD_TABLE.match(name)
+        if match:
+            start = datetime.datetime(int(match[1]), int(match[2]), 1, tzinfo=datetime.timezone.utc)
+            periods.append(Period(name, start))
+    return sorted(periods, key=lambda period: period.start)
+
+
+def _period_tables():
+    return _periods(connection.introspection.table_names())
+
+
+class PostgresPartitions:
+    """Monthly range partitions of the activity table (PostgreSQL).
+
+    The table is converted by migration ``0004_partition_activity``; new
+    months are created ahead of time so inserts never land in the default
+    partition, and expired months are detached and dropped whole.
+    """
+
+    def is_partitioned(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid '
+                'WHERE c.relname = %s AND pg_table_is_visible(c.oid)',
+                [TABLE],
+            )
+            return cursor.fetchone() is not None
+
+    def attached(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT child.relname FROM pg_inherits i '
+                'JOIN pg_class parent ON parent.oid = i.inhparent '
+                'JOIN pg_class child ON child.oid = i.inhrelid '
+                'WHERE parent.relname = %s AND pg_table_is_visible(parent.oid)',
+                [TABLE],
+            )
+            return {name for name, in cursor.fetchall()}
+
+    def periods(self):
+        # introspection.table_names() skips partitions, so attached months come from
+        # pg_inherits; months detached by an interrupted run are plain tables again
+        return _periods(self.attached() | set(connection.introspection.table_names()))
+
+    def prepare(self, now, months_ahead=3, **options):
+        """Create partitions for the coming months and for rows stuck in the default partition"""
+        if not self.is_partitioned():
+            return []
+        starts = {add_months(month_start(now), offset) for offset in range(months_ahead + 1)}
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT DISTINCT date_trunc('month', created_at AT TIME ZONE 'UTC') "
+                f"FROM {_quote(DEFAULT_PARTITION)}"
+            )
+            starts.update(month_start(value.replace(tzinfo=datetime.timezone.utc)) for value, in cursor.fetchall())
+
+        existing = self.attached()
+        created = []
+        for start in sorted(starts):
+            name = period_table(start)
+            if name not in existing:
+                self.create_partition(start)
+                created.append(name)
+        return created
+
+    def create_partition(self, start):
+        """Attach a partition for the month at ``start``, moving its rows out of the default partition"""
+        name, end = period_table(start), add_months(start, 1)
+        bounds = [start.isoformat(), end.isoformat()]
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute('DROP TABLE IF EXISTS pg_temp.activity_moved')
+            cursor.execute(f'CREATE TEMP TABLE activity_moved (LIKE {_quote(TABLE)}) ON COMMIT DROP')
+            cursor.execute(
+                f'WITH moved AS (DELETE FROM {_quote(DEFAULT_PARTITION)} '
+                f'WHERE created_at >= %s AND created_at < %s RETURNING *) '
+                f'INSERT INTO activity_moved SELECT * FROM moved',
+                bounds,
+            )
+            cursor.execute(
+                f"CREATE TABLE {_quote(name)} PARTITION OF {_quote(TABLE)} "
+                f"FOR VALUES FROM ('{bounds[0]}') TO ('{bounds[1]}')"
+            )
+            cursor.execute(f'INSERT INTO {_quote(TABLE)} SELECT * FROM activity_moved')
+
+    def release(self, period):
+        """Detach a partition so it can be archived without blocking the live table"""
+        if period.table in self.attached():
+            with connection.cursor() as cursor:
+                cursor.execute(f'ALTER TABLE {_quote(TABLE)} DETACH PARTITION {_quote(period.table)}')
+
+
+class ArchiveTables:
+    """Portable fallback: roll old months out of the live table into per-month tables.
+
+    Used on SQLite and any backend without declarative partitioning. Rows
+    older than the hot window are moved in batches, so the live table, and
+    every feed query on it, only ever holds recent months.
+    """
+
+    def periods(self):
+        return _period_tables()
+
+    def prepare(self, now, hot_days=90, batch_size=5000, **options):
+        """Move whole months older than ``hot_days`` into their period tables"""
+        boundary = month_start(now - datetime.timedelta(days=hot_days))
+        created = []
+        existing = {period.table for period in self.periods()}
+        while True:
+            batch = list(
+                Activity.objects.filter(created_at__lt=boundary)
+                .order_by('created_at', 'id')
+                .values_list('id', 'created_at')[:batch_size]
+            )
+            if not batch:
+                return created
+            by_table = {}
+            for activity_id, created_at in batch:
+                by_table.setdefault(period_table(month_start(created_at)), []).append(activity_id)
+            with transaction.atomic(), connection.cursor() as cursor:
+                for name, ids in by_table.items():
+                    if name not in existing:
+                        cursor.execute(
+                            f'CREATE TABLE {_quote(name)} AS SELECT * FROM {_quote(TABLE)} WHERE 1 = 0'
+                        )
+                        existing.add(name)
+                        created.append(name)
+                    columns = ', '.join(_quote(column) for column in COLUMNS)
+                    placeholders = ', '.join(['%s'] * len(ids))
+                    cursor.execute(
+                        f'INSERT INTO {_quote(name)} ({columns}) SELECT {columns} FROM {_quote(TABLE)} '
+                        f'WHERE id IN ({placeholders})',
+                        ids,
+                    )
+                    Activity.objects.filter(id__in=ids).delete()
+
+    def release(self, period):
+        pass
+
+
+def get_partitioner():
+    if connection.vendor == 'postgresql' and PostgresPartitions().is_partitioned():
+        return PostgresPartitions()
+    return ArchiveTables()
+
+
+def _json_row(row):
+    data = dict(zip(COLUMNS, row))
+    if isinstance(data['metadata'], str):
+        data['metadata'] = json.loads(data['metadata'])
+    created_at = data['created_at']
+    if isinstance(created_at, str):
+        # SQLite hands raw rows back as text
+        created_at = parse_datetime(created_at)
+    if timezone.is_naive(created_at):
+        # Backends without time zone support store UTC
+        created_at = timezone.make_aware(created_at, datetime.timezone.utc)
+    data['created_at'] = created_at.isoformat()
+    return json.dumps(data, separators=(',', ':'), default=str)
+
+
+def archive_period(period, output_dir, batch_size=5000):
+    """Stream one period table to ``<table>.jsonl.gz`` and drop it.
+
+    Rows are read in keyset batches on ``id``, so memory stays flat. The file
+    is written under a temporary name and renamed once complete; the table is
+    only dropped after that. Returns ``(path, rows)``.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, f'{period.table}.jsonl.gz')
+    partial = f'{path}.partial'
+    columns = ', '.join(_quote(column) for column in COLUMNS)
+    rows = 0
+    last_id = 0
+    with gzip.open(partial, 'wt', encoding='utf-8') as archive:
+        while True:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f'SELECT {columns} FROM {_quote(period.table)} WHERE id > %s ORDER BY id LIMIT %s',
+                    [last_id, batch_size],
+                )
+                batch = cursor.fetchall()
+            if not batch:
+                break
+            for row in batch:
+                archive.write(_json_row(row))
+                archive.write('\n')
+            rows += len(batch)
+            last_id = batch[-1][0]
+    os.replace(partial, path)
+    with connection.cursor() as cursor:
+        cursor.execute(f'DROP TABLE {_quote(period.table)}')
+    return path, rows
@@ -0,0 +1,27 @@
+import datetime
+
+from utils.pagination import KeysetPagination
+from utils.query_audit import canonical_query
+from .models import Activity
+
+# A cursor position in the default (-created_at, -id) ordering
+POSITION = [datetime.datetime(2025, 1, 6, tzinfo=datetime.timezone.utc), 1]
+
+
+def _page(queryset):
+    return KeysetPagination().page_queryset(queryset, POSITION)
+
+
+@canonical_query('activities.feed')
+def feed():
+    return _page(Activity.objects.all())
+
+
+@canonical_query('activities.feed_by_user')
+def feed_by_user():
+    return _page(Activity.objects.filter(user_id=1))
+
+
+@canonical_query('activities.feed_by_type')
+def feed_by_type():
+    return _page(Activity.objects.filter(activity_type='login'))
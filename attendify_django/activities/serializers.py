@@ -0,0 +1,11 @@
+from rest_framework import serializers
+
+from .models import Activity
+
+
+class ActivitySerializer(serializers.ModelSerializer):
+    """Serializer for activity log entries"""
+    
+    class Meta:
+        model = Activity
+        fields = ['id', 'user', 'activity_type', 'description', 'metadata', 'created_at']
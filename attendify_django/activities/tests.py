@@ -1,3 +1,208 @@
-from django.test import TestCase
+import datetime
+import gzip
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from authentication.models import User
+
+from . import buffer
+from .buffer import ActivityBuffer, flush_activities, get_activity_buffer, log_activity
+from .models import Activity
+from .partitions import DEFAULT_PARTITION, TABLE, ArchiveTables, PostgresPartitions
+
+
+class PostgresPartitionsTests(TestCase):
+    """The PostgreSQL catalog is stubbed: the test database is SQLite"""
+
+    def setUp(self):
+        self.partitions = PostgresPartitions()
+        attached = mock.patch.object(
+            PostgresPartitions, 'attached',
+            return_value={f'{TABLE}_p2024_01', f'{TABLE}_p2023_12', DEFAULT_PARTITION},
+        )
+        # Partitions are not ordinary tables; only a month detached earlier shows up here
+        table_names = mock.patch.object(
+            connection.introspection, 'table_names', return_value=[TABLE, f'{TABLE}_p2023_11'],
+        )
+        attached.start()
+        table_names.start()
+        self.addCleanup(attached.stop)
+        self.addCleanup(table_names.stop)
+
+    def test_periods_lists_attached_and_detached_months(self):
+        periods = self.partitions.periods()
+
+        self.assertEqual(
+            [period.table for period in periods],
+            [f'{TABLE}_p2023_11', f'{TABLE}_p2023_12', f'{TABLE}_p2024_01'],
+        )
+        self.assertEqual(periods[0].start, datetime.datetime(2023, 11, 1, tzinfo=datetime.timezone.utc))
+
+    def test_archive_command_detaches_and_archives_expired_partitions(self):
+        now = datetime.datetime(2024, 3, 15, tzinfo=datetime.timezone.utc)
+        command = 'activities.management.commands.archive_activities'
+        with mock.patch(f'{command}.timezone.now', return_value=now), \
+                mock.patch(f'{command}.get_partitioner', return_value=self.partitions), \
+                mock.patch.object(PostgresPartitions, 'prepare', return_value=[]), \
+                mock.patch.object(PostgresPartitions, 'release') as release, \
+                mock.patch(f'{command}.archive_period', return_value=('archive.jsonl.gz', 0)) as archive:
+            call_command('archive_activities', keep_days=60, stdout=StringIO())
+
+        # Cutoff is January 2024: November (detached earlier) and December (attached) have ended
+        expired = [f'{TABLE}_p2023_11', f'{TABLE}_p2023_12']
+        self.assertEqual([call.args[0].table for call in release.call_args_list], expired)
+        self.assertEqual([call.args[0].table for call in archive.call_args_list], expired)
+
+
+class ArchiveTablesTests(TestCase):
+    """The SQLite fallback, run for real against the test database"""
+
+    def setUp(self):
+        self.user = User.objects.create(email='lecturer@example.com', fullName='Ada Lecturer')
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.output_dir = directory.name
+
+        def at(*args):
+            return datetime.datetime(*args, tzinfo=datetime.timezone.utc)
+
+        self.january = Activity.objects.bulk_create([
+            Activity(user=self.user, activity_type='login', description='January', metadata={'ip': '10.0.0.1'},
+                     created_at=at(2024, 1, 5, 10, 30)),
+            Activity(activity_type='logout', description='Late January', created_at=at(2024, 1, 31, 23, 59, 59)),
+        ])
+        self.february = Activity.objects.create(activity_type='login', description='February',
+                                                created_at=at(2024, 2, 10))
+        self.june = Activity.objects.create(activity_type='login', description='June', created_at=at(2024, 6, 10))
+
+    def archive(self):
+        now = datetime.datetime(2024, 6, 15, tzinfo=datetime.timezone.utc)
+        output = StringIO()
+        with mock.patch('activities.management.commands.archive_activities.timezone.now', return_value=now):
+            # Months before March leave the live table; January ends before the retention cutoff
+            call_command('archive_activities', keep_days=120, hot_days=90, batch_size=2,
+                         output_dir=self.output_dir, stdout=output)
+        return output.getvalue()
+
+    def test_moves_old_months_out_of_the_live_table(self):
+        ArchiveTables().prepare(datetime.datetime(2024, 6, 15, tzinfo=datetime.timezone.utc), hot_days=90, batch_size=2)
+
+        self.assertEqual(list(Activity.objects.values_list('description', flat=True)), ['June'])
+        self.assertEqual(
+            [period.table for period in ArchiveTables().periods()], [f'{TABLE}_p2024_01', f'{TABLE}_p2024_02'],
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT id FROM {TABLE}_p2024_01 ORDER BY id')
+            self.assertEqual([row[0] for row in cursor.fetchall()], [activity.pk for activity in self.january])
+
+    def test_archives_and_drops_expired_months(self):
+        output = self.archive()
+
+        path = os.path.join(self.output_dir, f'{TABLE}_p2024_01.jsonl.gz')
+        self.assertIn(f'Archived 2 row(s) from {TABLE}_p2024_01 to {path}', output)
+        with gzip.open(path, 'rt', encoding='utf-8') as archive:
+            rows = [json.loads(line) for line in archive]
+        self.assertEqual(rows, [
+            {'id': self.january[0].pk, 'user_id': self.user.pk, 'activity_type': 'login', 'description': 'January',
+             'metadata': {'ip': '10.0.0.1'}, 'created_at': '2024-01-05T10:30:00+00:00'},
+            {'id': self.january[1].pk, 'user_id': None, 'activity_type': 'logout', 'description': 'Late January',
+             'metadata': {}, 'created_at': '2024-01-31T23:59:59+00:00'},
+        ])
+        self.assertEqual(os.listdir(self.output_dir), [f'{TABLE}_p2024_01.jsonl.gz'])
+
+        # January is gone; February waits in its table for its own cutoff
+        self.assertEqual([period.table for period in ArchiveTables().periods()], [f'{TABLE}_p2024_02'])
+        self.assertEqual(list(Activity.objects.values_list('description', flat=True)), ['June'])
+
+
+class ListActivitiesTests(TestCase):
+
+    def test_requires_approved_staff(self):
+        client = APIClient()
+        for role, access, expected in [
+            ('lecturer', 'approved', 200), ('lecturer', 'pending', 403), ('user', 'approved', 403),
+        ]:
+            user = User.objects.create(email=f'{role}-{access}@example.com', fullName='User', role=role, access=access)
+            client.force_authenticate(user)
+            with self.subTest(role=role, access=access):
+                self.assertEqual(client.get('/api/v1/activities/').status_code, expected)
+
+
+class ActivityBufferTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create(email='lecturer@example.com', fullName='Ada Lecturer')
+
+    def make_buffer(self, **options):
+        return ActivityBuffer(THREAD=False, **options)
+
+    def test_writes_a_batch_once_full(self):
+        activities = self.make_buffer(BATCH_SIZE=3)
+
+        with self.assertNumQueries(0):
+            activities.log('login', self.user, 'first')
+            activities.log('login', self.user, 'second')
+        self.assertEqual(Activity.objects.count(), 0)
+
+        activities.log('logout', self.user.pk, 'third')
+
+        self.assertEqual(len(activities), 0)
+        self.assertEqual(
+            list(Activity.objects.order_by('id').values_list('user_id', 'description')),
+            [(self.user.pk, 'first'), (self.user.pk, 'second'), (self.user.pk, 'third')],
+        )
+
+    def test_keeps_the_time_of_the_event(self):
+        logged_at = datetime.datetime(2024, 3, 1, 9, 30, tzinfo=datetime.timezone.utc)
+        activities = self.make_buffer()
+        with mock.patch('activities.buffer.timezone.now', return_value=logged_at):
+            activities.log('login', self.user, 'Logged in')
+
+        # Written later, the row still carries the time log() was called
+        activities.flush()
+
+        self.assertEqual(Activity.objects.get().created_at, logged_at)
+
+    def test_drops_events_when_full(self):
+        activities = self.make_buffer(MAX_BUFFER=2)
+
+        with self.assertLogs('activities.buffer', 'WARNING'):
+            results = [activities.log('login', self.user, str(number)) for number in range(4)]
+
+        self.assertEqual(results, [True, True, False, False])
+        self.assertEqual((len(activities), activities.dropped), (2, 2))
+        self.assertEqual(activities.flush(), 2)
+        self.assertEqual(sorted(Activity.objects.values_list('description', flat=True)), ['0', '1'])
+
+    def test_flush_overflow_drains_the_buffer_in_the_caller(self):
+        activities = self.make_buffer(MAX_BUFFER=2, OVERFLOW='flush')
+        activities.log('login', self.user, '0')
+        activities.log('login', self.user, '1')
+
+        self.assertTrue(activities.log('login', self.user, '2'))
+
+        self.assertEqual(Activity.objects.count(), 2)
+        self.assertEqual((len(activities), activities.dropped), (1, 0))
+        activities.flush()
+        self.assertEqual(sorted(Activity.objects.values_list('description', flat=True)), ['0', '1', '2'])
+
+    @override_settings(ACTIVITY_LOG={'THREAD': False})
+    def test_flushes_at_exit(self):
+        log_activity('login', self.user, 'Logged in')
+        self.assertEqual(len(get_activity_buffer()), 1)
+
+        # Not due yet; only the exit hook writes it
+        buffer._activity_buffer.flush_if_due()
+        self.assertEqual(Activity.objects.count(), 0)
+
+        self.assertEqual(flush_activities(), 1)
+        self.assertEqual(Activity.objects.get().description, 'Logged in')
+        self.assertEqual(len(buffer._activity_buffer), 0)
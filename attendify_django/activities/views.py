@@ -1,3 +1,44 @@
-from django.shortcuts import render
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework import status
 
-# Create your views here.
+from utils.pagination import paginate
+from utils.replicas import use_replica
+from utils.responses import error_response
+from .models import Activity
+from .serializers import ActivitySerializer
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@use_replica
+def list_activities(request):
+    """Recent activity, newest first; admins see everyone's, others their own"""
+    try:
+        if request.user.role not in ['admin', 'lecturer'] or request.user.access != 'approved':
+            return error_response(
+                "You are not authorized to perform this action",
+                status.HTTP_403_FORBIDDEN
+            )
+        
+        activities = Activity.objects.all()
+        
+        user_id = request.query_params.get('user')
+        if request.user.role != 'admin':
+            activities = activities.filter(user_id=request.user.id)
+        elif user_id:
+            if not user_id.isdigit():
+                return error_response(
+                    "Invalid 'user' id",
+                    status.HTTP_400_BAD_REQUEST
+                )
+            activities = activities.filter(user_id=user_id)
+        
+        activity_type = request.query_params.get('type')
+        if activity_type:
+            activities = activities.filter(activity_type=activity_type)
+        
+        return paginate(request, activities, ActivitySerializer, "Activities fetched successfully")
+        
+    except Exception as e:
+        return error_response(str(e), status.HTTP_400_BAD_REQUEST)
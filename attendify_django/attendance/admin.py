@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import Attendance
+from attendify_backend.admin import ReadOnlyModelAdmin
+from .models import Attendance, AttendanceSummary
 
 
 @admin.register(Attendance)
@@ -46,3 +47,13 @@ class AttendanceAdmin(admin.ModelAdmin):
                 role__in=['admin', 'lecturer']
             )
         return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+
+@admin.register(AttendanceSummary)
+class AttendanceSummaryAdmin(ReadOnlyModelAdmin):
+    """Admin interface for the maintained attendance summaries"""
+    
+    list_display = ['student', 'course', 'session', 'semester', 'present', 'late', 'absent', 'last_attended']
+    list_filter = ['session', 'semester']
+    search_fields = ['student__name', 'student__regNo', 'course__courseCode']
+    list_select_related = ['student', 'course', 'session']
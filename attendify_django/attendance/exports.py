@@ -0,0 +1,87 @@
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+from utils.spreadsheets import stream_csv, stream_xlsx
+from .models import Attendance
+
+# (header, lookup) pairs; related columns are joined in the same query
+EXPORT_COLUMNS = [
+    ('Reg No', 'student__regNo'),
+    ('Student', 'student__name'),
+    ('Course Code', 'course__courseCode'),
+    ('Course Title', 'course__courseTitle'),
+    ('Lecturer', 'lecturer__fullName'),
+    ('Session', 'session__name'),
+    ('Semester', 'semester__name'),
+    ('Level', 'level'),
+    ('Date', 'date'),
+    ('Time', 'time'),
+    ('Status', 'status'),
+]
+
+# Spreadsheet apps evaluate CSV cells starting with these as formulas
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+EXPORT_FORMATS = {
+    'csv': ('text/csv', stream_csv),
+    'xlsx': ('application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', stream_xlsx),
+}
+
+
+def export_queryset(course=None, session=None, semester=None, level=None, date_from=None, date_to=None):
+    """Attendance rows matching the export filters, in chronological order"""
+    queryset = Attendance.objects.all()
+    if course:
+        queryset = queryset.filter(course_id=course)
+    if session:
+        queryset = queryset.filter(session_id=session)
+    if semester:
+        queryset = queryset.filter(semester_id=semester)
+    if level:
+        queryset = queryset.filter(level=level)
+    if date_from:
+        queryset = queryset.filter(date__gte=date_from)
+    if date_to:
+        queryset = queryset.filter(date__lte=date_to)
+    return queryset.order_by('date', 'time', 'id')
+
+
+def export_rows(queryset, chunk_size=2000):
+    """Stream export rows as tuples.
+
+    ``values_list`` over the related lookups fetches student, course, lecturer
+    and session columns through joins in the one query (what ``select_related``
+    would do, without building model instances), and ``iterator`` reads it in
+    chunks instead of caching the result.
+    """
+    return queryset.values_list(*[lookup for _, lookup in EXPORT_COLUMNS]).iterator(chunk_size=chunk_size)
+
+
+def escape_formula(value):
+    """Quote text a spreadsheet would run as a formula, e.g. a student named ``=HYPERLINK(...)``"""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return f"'{value}"
+    return value
+
+
+def stream_export(queryset, file_type, chunk_size=2000):
+    """Yield the encoded export file for ``queryset``.
+
+    XLSX cells are written as inline strings, which are never evaluated, so
+    only CSV cells are escaped.
+    """
+    _, writer = EXPORT_FORMATS[file_type]
+    header = [title for title, _ in EXPORT_COLUMNS]
+    rows = export_rows(queryset, chunk_size=chunk_size)
+    if file_type == 'xlsx':
+        return writer(header, rows, sheet_name='Attendance')
+    return writer(header, ([escape_formula(value) for value in row] for row in rows))
+
+
+def export_response(queryset, file_type):
+    """Streaming download of ``queryset`` as CSV or XLSX"""
+    content_type, _ = EXPORT_FORMATS[file_type]
+    response = StreamingHttpResponse(stream_export(queryset, file_type), content_type=content_type)
+    filename = f"attendance-{timezone.localdate():%Y%m%d}.{file_type}"
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
@@ -0,0 +1,104 @@
+import datetime
+import gc
+import resource
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from academic_sessions.models import AcademicSession, Semester
+from attendance.exports import export_queryset, stream_export
+from attendance.models import Attendance
+from courses.models import Course
+from students.models import Student
+
+User = get_user_model()
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far, in MiB (Linux reports KiB)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def current_rss_mb():
+    try:
+        with open('/proc/self/statm') as statm:
+            pages = int(statm.read().split()[1])
+        return pages * resource.getpagesize() / 1024 / 1024
+    except OSError:
+        return float('nan')
+
+
+class Command(BaseCommand):
+    help = 'Export synthetic attendance rows through the streaming exporter and record peak RSS'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000000, help='Synthetic attendance rows')
+        parser.add_argument('--students', type=int, default=1000, help='Students the rows are spread over')
+        parser.add_argument('--type', choices=['csv', 'xlsx'], default='csv', help='Export format')
+
+    def handle(self, *args, **options):
+        rows, students = options['rows'], options['students']
+
+        # Synthetic data lives only inside this transaction and is rolled back
+        with transaction.atomic():
+            start = time.perf_counter()
+            self.seed(rows, students)
+            self.stdout.write(f'Seeded {rows} rows in {time.perf_counter() - start:.1f} s')
+
+            gc.collect()
+            rss_before, peak_before = current_rss_mb(), peak_rss_mb()
+
+            start = time.perf_counter()
+            size = 0
+            for chunk in stream_export(export_queryset(), options['type']):
+                size += len(chunk)
+            elapsed = time.perf_counter() - start
+
+            self.stdout.write(
+                f'Exported {size / 1024 / 1024:.1f} MiB of {options["type"]} in {elapsed:.1f} s '
+                f'({rows / elapsed:,.0f} rows/s)'
+            )
+            self.stdout.write(
+                f'RSS before export {rss_before:.1f} MiB, after {current_rss_mb():.1f} MiB; '
+                f'peak RSS {peak_before:.1f} -> {peak_rss_mb():.1f} MiB'
+            )
+            transaction.set_rollback(True)
+
+    def seed(self, rows, students, batch_size=5000):
+        lecturer = User.objects.create(email='bench-export@attendify.invalid', fullName='Benchmark Lecturer')
+        session = AcademicSession.objects.create(
+            name='Benchmark', start=datetime.date(2024, 1, 1), end=datetime.date(2024, 12, 31)
+        )
+        semester = Semester.objects.create(session=session, name='first')
+        course = Course.objects.create(
+            courseTitle='Benchmark Course', courseCode='BENCH-EXPORT', semester=semester, level='100'
+        )
+        student_ids = [
+            student.pk for student in Student.objects.bulk_create([
+                Student(name=f'Student {i}', regNo=f'BENCH/{i:06d}', level='100',
+                        addmissionYear='2024', email=f'bench-{i}@attendify.invalid')
+                for i in range(students)
+            ])
+        ]
+
+        first_day = datetime.date(2000, 1, 1)
+        batch = []
+        for i in range(rows):
+            batch.append(Attendance(
+                student_id=student_ids[i % students],
+                course=course,
+                lecturer=lecturer,
+                session=session,
+                date=first_day + datetime.timedelta(days=i // students),
+                time=datetime.time(9, 0),
+                status=('present', 'late', 'absent')[i % 3],
+                semester=semester,
+                level='100',
+            ))
+            if len(batch) >= batch_size:
+                Attendance.objects.bulk_create(batch)
+                batch = []
+        if batch:
+            Attendance.objects.bulk_create(batch)
@@ -0,0 +1,119 @@
+import datetime
+import statistics
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, connection, connections
+
+from academic_sessions.models import AcademicSession, Semester
+from attendance.models import Attendance
+from attendance.services import mark_attendance_bulk
+from authentication.models import User
+from courses.models import Course
+from students.models import Enrollment, Student
+from students.rosters import invalidate_rosters
+
+
+class Command(BaseCommand):
+    help = 'Post attendance rolls from concurrent workers and report write throughput per worker count'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8], help='Worker counts to compare')
+        parser.add_argument('--posts', type=int, default=200, help='Rolls posted per worker count')
+        parser.add_argument('--roll', type=int, default=50, help='Students marked per roll')
+
+    def handle(self, *args, **options):
+        # Workers commit on their own connections, so the synthetic data can't be rolled
+        # back; it is deleted at the end instead
+        self.stdout.write(f'{connection.vendor} ({connection.settings_dict["NAME"]}), {options["roll"]} students per roll')
+        try:
+            self.seed(options['roll'])
+            baseline = None
+            offset = 0
+            for workers in options['workers']:
+                dates = [
+                    datetime.date(2000, 1, 1) + datetime.timedelta(days=offset + i)
+                    for i in range(options['posts'])
+                ]
+                offset += options['posts']
+                rate = self.run(workers, dates)
+                baseline = baseline or rate
+                self.stdout.write(f'    speedup over {options["workers"][0]} worker(s): {rate / baseline:.2f}x')
+        finally:
+            self.cleanup()
+
+    def seed(self, roll):
+        self.session = AcademicSession.objects.create(
+            name='Benchmark writes', start=datetime.date(2000, 1, 1), end=datetime.date(2099, 12, 31)
+        )
+        self.semester = Semester.objects.create(session=self.session, name='bench')
+        self.course = Course.objects.create(
+            courseTitle='Benchmark writes', courseCode='BENCH-WRITES', level='100', semester=self.semester
+        )
+        self.lecturer = User.objects.create(
+            email='bench-writes@attendify.invalid', fullName='Benchmark Lecturer', role='lecturer', access='approved'
+        )
+        students = Student.objects.bulk_create([
+            Student(
+                name=f'Student {i}', regNo=f'BENCH/WRITES/{i:05d}', level='100',
+                addmissionYear='2024', email=f'bench-writes-{i}@attendify.invalid',
+            )
+            for i in range(roll)
+        ])
+        Enrollment.objects.bulk_create([Enrollment(student=student, course=self.course) for student in students])
+        invalidate_rosters()
+        self.records = [{'studentId': student.pk, 'status': 'present'} for student in students]
+
+    def cleanup(self):
+        # Looked up by their synthetic names, so a seed that failed halfway is still removed
+        Attendance.objects.filter(course__courseCode='BENCH-WRITES').delete()
+        Student.objects.filter(regNo__startswith='BENCH/WRITES/').delete()
+        Course.objects.filter(courseCode='BENCH-WRITES').delete()
+        AcademicSession.objects.filter(name='Benchmark writes').delete()
+        User.objects.filter(email='bench-writes@attendify.invalid').delete()
+        invalidate_rosters()
+
+    def run(self, workers, dates):
+        latencies = []
+        errors = []
+        lock = threading.Lock()
+
+        def work(chunk):
+            try:
+                for date in chunk:
+                    start = time.perf_counter()
+                    try:
+                        mark_attendance_bulk(
+                            self.course, self.session, self.lecturer, date, datetime.time(9, 0),
+                            self.semester, '100', self.records,
+                        )
+                    except DatabaseError as e:
+                        with lock:
+                            errors.append(str(e))
+                        continue
+                    with lock:
+                        latencies.append(time.perf_counter() - start)
+            finally:
+                # Return the thread's connection (to the pool, if one is configured)
+                connections.close_all()
+
+        threads = [threading.Thread(target=work, args=(dates[i::workers],)) for i in range(workers)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        rate = len(latencies) * len(self.records) / elapsed
+        latencies.sort()
+        p95 = latencies[int(len(latencies) * 0.95) - 1] if latencies else 0
+        self.stdout.write(
+            f'{workers} worker(s): {len(latencies)} rolls in {elapsed:.2f} s, {rate:,.0f} rows/s, '
+            f'median {statistics.median(latencies or [0]) * 1e3:.1f} ms, p95 {p95 * 1e3:.1f} ms, '
+            f'{len(errors)} failed'
+        )
+        if errors:
+            self.stdout.write(f'    first failure: {errors[0]}')
+        return rate
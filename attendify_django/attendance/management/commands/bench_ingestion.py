@@ -0,0 +1,244 @@
+import asyncio
+import datetime
+import json
+import random
+import socket
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from academic_sessions.models import AcademicSession, Semester
+from attendance.models import Attendance
+from authentication.authentication import create_jwt_token
+from authentication.models import User
+from courses.models import Course
+from students.models import Enrollment, Student
+from students.rosters import invalidate_rosters
+
+ENDPOINTS = ['me', 'mark', 'scan']
+
+SERVERS = {
+    # gthread workers: each thread serves one connection's request at a time
+    'wsgi': lambda workers, threads, port: [
+        sys.executable, '-m', 'gunicorn', 'attendify_backend.wsgi',
+        '--workers', str(workers), '--threads', str(threads),
+        '--bind', f'127.0.0.1:{port}', '--log-level', 'warning',
+    ],
+    'asgi': lambda workers, threads, port: [
+        sys.executable, '-m', 'uvicorn', 'attendify_backend.asgi:application',
+        '--workers', str(workers), '--host', '127.0.0.1', '--port', str(port),
+        '--log-level', 'warning', '--no-access-log',
+    ],
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Load-test the scan, mark and me endpoints over keep-alive HTTP connections, under gunicorn '
+        '(WSGI) and uvicorn (ASGI), and report throughput and latency percentiles'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--server', nargs='+', choices=list(SERVERS), default=list(SERVERS),
+                            help='Servers to start and compare')
+        parser.add_argument('--url', help='Test an already running server instead of starting one')
+        parser.add_argument('--endpoint', nargs='+', choices=ENDPOINTS, default=ENDPOINTS, help='Endpoints to load')
+        parser.add_argument('--connections', type=int, default=200, help='Concurrent client connections')
+        parser.add_argument('--duration', type=float, default=10, help='Seconds measured per run')
+        parser.add_argument('--warmup', type=float, default=2, help='Seconds of load before measuring')
+        parser.add_argument('--workers', type=int, default=2, help='Server worker processes')
+        parser.add_argument('--threads', type=int, default=4, help='Threads per gunicorn worker')
+        parser.add_argument('--roll', type=int, default=20, help='Students per marked roll')
+        parser.add_argument('--port', type=int, default=8765, help='Port the started servers listen on')
+
+    def handle(self, *args, **options):
+        # Servers run in other processes, so the synthetic data is committed and deleted at the end
+        try:
+            self.seed(options['roll'])
+            if options['url']:
+                url = urlsplit(options['url'])
+                self.load_all('external', url.hostname, url.port or 80, options)
+            else:
+                for server in options['server']:
+                    process = self.start(server, options)
+                    try:
+                        self.load_all(server, '127.0.0.1', options['port'], options)
+                    finally:
+                        process.terminate()
+                        process.wait(timeout=30)
+        finally:
+            self.cleanup()
+
+    def start(self, server, options):
+        command = SERVERS[server](options['workers'], options['threads'], options['port'])
+        try:
+            process = subprocess.Popen(command, cwd=settings.BASE_DIR)
+        except OSError as e:
+            raise CommandError(f'Could not start {server}: {e}')
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise CommandError(f'{command[2]} exited with {process.returncode}; is it installed?')
+            try:
+                socket.create_connection(('127.0.0.1', options['port']), timeout=1).close()
+                return process
+            except OSError:
+                time.sleep(0.2)
+        process.terminate()
+        raise CommandError(f'{server} did not start listening within 30 s')
+
+    def seed(self, roll):
+        rng = np.random.default_rng(0)
+        self.session = AcademicSession.objects.create(
+            name='Benchmark ingestion', start=datetime.date(2000, 1, 1), end=datetime.date(2099, 12, 31)
+        )
+        self.semester = Semester.objects.create(session=self.session, name='bench')
+        self.course = Course.objects.create(
+            courseTitle='Benchmark ingestion', courseCode='BENCH-INGEST', level='100', semester=self.semester
+        )
+        self.lecturer = User.objects.create(
+            email='bench-ingest@attendify.invalid', fullName='Benchmark Lecturer', role='lecturer', access='approved'
+        )
+        self.token = create_jwt_token(self.lecturer)
+        students = Student.objects.bulk_create([
+            Student(
+                name=f'Student {i}', regNo=f'BENCH/INGEST/{i:05d}', level='100',
+                addmissionYear='2024', email=f'bench-ingest-{i}@attendify.invalid',
+            )
+            for i in range(roll)
+        ])
+        Enrollment.objects.bulk_create([Enrollment(student=student, course=self.course) for student in students])
+        invalidate_rosters()
+        self.templates = []
+        for student in students:
+            template = rng.standard_normal(256).astype(np.float32).tolist()
+            student.set_fingerprint(template)
+            self.templates.append(template)
+        self.student_ids = [student.pk for student in students]
+
+    def cleanup(self):
+        # Looked up by their synthetic names, so a seed that failed halfway is still removed
+        Attendance.objects.filter(course__courseCode='BENCH-INGEST').delete()
+        Student.objects.filter(regNo__startswith='BENCH/INGEST/').delete()
+        Course.objects.filter(courseCode='BENCH-INGEST').delete()
+        AcademicSession.objects.filter(name='Benchmark ingestion').delete()
+        User.objects.filter(email='bench-ingest@attendify.invalid').delete()
+        invalidate_rosters()
+
+    def build_request(self, endpoint, host):
+        if endpoint == 'me':
+            method, path, body = 'GET', '/api/v1/auth/me/', b''
+        elif endpoint == 'mark':
+            # Spread rolls over a year of dates: mostly inserts at first, upserts later
+            date = datetime.date(2000, 1, 1) + datetime.timedelta(days=random.randrange(365))
+            method, path = 'POST', '/api/v1/attendance/bulk/'
+            body = json.dumps({
+                'courseId': self.course.pk, 'sessionId': self.session.pk, 'semesterId': self.semester.pk,
+                'date': date.isoformat(), 'records': [{'studentId': pk} for pk in self.student_ids],
+            }).encode()
+        else:
+            method, path = 'POST', '/api/v1/students/identify/'
+            body = json.dumps({'fingerPrint': random.choice(self.templates), 'courseId': self.course.pk}).encode()
+        head = (
+            f'{method} {path} HTTP/1.1\r\nHost: {host}\r\nAuthorization: Bearer {self.token}\r\n'
+            f'Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n'
+        )
+        return head.encode() + body
+
+    def load_all(self, label, host, port, options):
+        for endpoint in options['endpoint']:
+            stats = asyncio.run(self.load(endpoint, host, port, options))
+            latencies = sorted(stats['latencies'])
+            if not latencies:
+                self.stdout.write(f'{label} {endpoint}: no completed requests, {stats["errors"]} connection errors')
+                continue
+
+            def percentile(p):
+                return latencies[int(p * (len(latencies) - 1))] * 1000
+
+            self.stdout.write(
+                f'{label:8} {endpoint:5} {options["connections"]} connections: '
+                f'{len(latencies) / options["duration"]:,.0f} req/s, '
+                f'p50 {percentile(0.5):.1f} ms, p99 {percentile(0.99):.1f} ms, '
+                f'{stats["failed"]} non-2xx, {stats["errors"]} connection errors'
+            )
+
+    async def load(self, endpoint, host, port, options):
+        stats = {'latencies': [], 'failed': 0, 'errors': 0}
+        now = time.monotonic()
+        measure_from = now + options['warmup']
+        deadline = measure_from + options['duration']
+        await asyncio.gather(*[
+            self.client(endpoint, host, port, measure_from, deadline, stats)
+            for _ in range(options['connections'])
+        ])
+        return stats
+
+    async def client(self, endpoint, host, port, measure_from, deadline, stats):
+        """One device: a keep-alive connection posting requests back to back"""
+        writer = None
+        while time.monotonic() < deadline:
+            if writer is None:
+                try:
+                    reader, writer = await asyncio.open_connection(host, port)
+                except OSError:
+                    stats['errors'] += 1
+                    await asyncio.sleep(0.1)
+                    continue
+            start = time.monotonic()
+            try:
+                status, close = await self.exchange(reader, writer, self.build_request(endpoint, host))
+            except (OSError, ValueError, asyncio.IncompleteReadError):
+                stats['errors'] += 1
+                writer.close()
+                writer = None
+                continue
+            end = time.monotonic()
+            # Requests completed inside the measured window count, however long they queued
+            if measure_from <= end <= deadline:
+                stats['latencies'].append(end - start)
+                stats['failed'] += not 200 <= status < 300
+            if close:
+                writer.close()
+                writer = None
+        if writer is not None:
+            writer.close()
+
+    async def exchange(self, reader, writer, request):
+        """Send one request and read its response; returns the status and whether the server closes"""
+        writer.write(request)
+        await writer.drain()
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError('Server closed the connection')
+        status = int(status_line.split()[1])
+
+        length, chunked, close = 0, False, False
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            name, value = name.strip().lower(), value.strip().lower()
+            if name == 'content-length':
+                length = int(value)
+            elif name == 'transfer-encoding':
+                chunked = 'chunked' in value
+            elif name == 'connection':
+                close = value == 'close'
+
+        if chunked:
+            while True:
+                size = int((await reader.readline()).split(b';')[0], 16)
+                # Chunk data and its CRLF; the last chunk is followed by the closing CRLF
+                await reader.readexactly(size + 2)
+                if size == 0:
+                    break
+        elif length:
+            await reader.readexactly(length)
+        return status, close
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from attendance.summaries import rebuild_summaries
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the attendance summary table from scratch'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows written per insert')
+
+    def handle(self, *args, **options):
+        created = rebuild_summaries(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {created} attendance summary rows.'))
@@ -0,0 +1,75 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("academic_sessions", "0001_initial"),
+        ("attendance", "0002_initial"),
+        ("courses", "0001_initial"),
+        ("students", "0004_remove_student_fingerprint"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AttendanceSummary",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("semester", models.CharField(help_text="Semester", max_length=20)),
+                ("present", models.PositiveIntegerField(default=0)),
+                ("late", models.PositiveIntegerField(default=0)),
+                ("absent", models.PositiveIntegerField(default=0)),
+                (
+                    "last_attended",
+                    models.DateField(
+                        blank=True,
+                        help_text="Last date marked present or late",
+                        null=True,
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "course",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="attendance_summaries",
+                        to="courses.course",
+                    ),
+                ),
+                (
+                    "session",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="attendance_summaries",
+                        to="academic_sessions.academicsession",
+                    ),
+                ),
+                (
+                    "student",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="attendance_summaries",
+                        to="students.student",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Attendance Summary",
+                "verbose_name_plural": "Attendance Summaries",
+                "db_table": "attendance_attendancesummary",
+                "ordering": ["student", "course"],
+                "unique_together": {("student", "course", "session", "semester")},
+            },
+        ),
+    ]
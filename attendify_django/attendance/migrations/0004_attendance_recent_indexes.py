@@ -0,0 +1,31 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("academic_sessions", "0001_initial"),
+        ("attendance", "0003_attendancesummary"),
+        ("courses", "0001_initial"),
+        ("students", "0004_remove_student_fingerprint"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="attendance",
+            index=models.Index(
+                fields=["-date", "-time", "-id"], name="attendance_recent_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="attendance",
+            index=models.Index(
+                fields=["course", "-date", "-time", "-id"],
+                name="attendance_course_recent_idx",
+            ),
+        ),
+    ]
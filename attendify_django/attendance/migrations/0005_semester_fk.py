@@ -0,0 +1,207 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Max, Q
+
+BATCH_SIZE = 5000
+
+# Attendance saved without a semester string is filed under this semester
+UNSPECIFIED = "unspecified"
+
+
+def summary_rows(Attendance, group_by):
+    return (
+        Attendance.objects.values(*group_by)
+        .order_by()
+        .annotate(
+            present=Count("id", filter=Q(status="present")),
+            late=Count("id", filter=Q(status="late")),
+            absent=Count("id", filter=Q(status="absent")),
+            last_attended=Max("date", filter=Q(status__in=["present", "late"])),
+        )
+    )
+
+
+def rebuild_summaries(Attendance, AttendanceSummary, group_by):
+    """Recreate summaries from attendance; derived data is cheaper to rebuild than to map"""
+    AttendanceSummary.objects.all().delete()
+    batch = []
+    for row in summary_rows(Attendance, group_by).iterator(chunk_size=BATCH_SIZE):
+        batch.append(AttendanceSummary(**row))
+        if len(batch) >= BATCH_SIZE:
+            AttendanceSummary.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        AttendanceSummary.objects.bulk_create(batch)
+
+
+def id_batches(queryset, *fields):
+    """Yield ``(id, *fields)`` rows in primary key ranges; each batch is an index seek"""
+    last_id = 0
+    while True:
+        rows = list(
+            queryset.filter(id__gt=last_id)
+            .order_by("id")
+            .values_list("id", *fields)[:BATCH_SIZE]
+        )
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1][0]
+
+
+def link_semesters(apps, schema_editor):
+    """Map each (session, semester string) pair to a Semester row, in batches"""
+    Attendance = apps.get_model("attendance", "Attendance")
+    AttendanceSummary = apps.get_model("attendance", "AttendanceSummary")
+    Semester = apps.get_model("academic_sessions", "Semester")
+
+    semester_ids = {}
+    # (session_id, raw string) -> semester id, for the pass over attendance
+    targets = {}
+    pairs = (
+        Attendance.objects.values_list("session_id", "semester").distinct().order_by()
+    )
+    for session_id, raw in list(pairs.iterator()):
+        name = (raw or "").strip()[:20] or UNSPECIFIED
+        key = (session_id, name.lower())
+        if key not in semester_ids:
+            semester = Semester.objects.filter(
+                session_id=session_id, name__iexact=name
+            ).first()
+            if semester is None:
+                semester = Semester.objects.create(session_id=session_id, name=name)
+            semester_ids[key] = semester.id
+        targets[session_id, raw] = semester_ids[key]
+
+    # One pass over the table; short UPDATEs by primary key keep locks brief
+    for rows in id_batches(Attendance.objects.all(), "session_id", "semester"):
+        by_semester = {}
+        for attendance_id, session_id, raw in rows:
+            by_semester.setdefault(targets[session_id, raw], []).append(attendance_id)
+        for semester_id, ids in by_semester.items():
+            Attendance.objects.filter(id__in=ids).update(semester_ref_id=semester_id)
+
+    rebuild_summaries(
+        Attendance,
+        AttendanceSummary,
+        ["student_id", "course_id", "session_id", "semester_ref_id"],
+    )
+
+
+def unlink_semesters(apps, schema_editor):
+    """Write semester names back to the string columns"""
+    Attendance = apps.get_model("attendance", "Attendance")
+    AttendanceSummary = apps.get_model("attendance", "AttendanceSummary")
+    Semester = apps.get_model("academic_sessions", "Semester")
+
+    names = {
+        semester_id: "" if name == UNSPECIFIED else name
+        for semester_id, name in Semester.objects.values_list("id", "name")
+    }
+    for rows in id_batches(Attendance.objects.all(), "semester_ref_id"):
+        by_name = {}
+        for attendance_id, semester_id in rows:
+            by_name.setdefault(names[semester_id], []).append(attendance_id)
+        for name, ids in by_name.items():
+            Attendance.objects.filter(id__in=ids).update(semester=name)
+
+    rebuild_summaries(
+        Attendance,
+        AttendanceSummary,
+        ["student_id", "course_id", "session_id", "semester"],
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("academic_sessions", "0003_semester"),
+        ("attendance", "0004_attendance_recent_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name="attendancesummary",
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name="attendance",
+            name="semester_ref",
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="+",
+                to="academic_sessions.semester",
+            ),
+        ),
+        migrations.AddField(
+            model_name="attendancesummary",
+            name="semester_ref",
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="+",
+                to="academic_sessions.semester",
+            ),
+        ),
+        migrations.RunPython(link_semesters, unlink_semesters),
+        # A default lets the string columns be re-added when migrating backwards
+        migrations.AlterField(
+            model_name="attendance",
+            name="semester",
+            field=models.CharField(default="", help_text="Semester", max_length=20),
+        ),
+        migrations.AlterField(
+            model_name="attendancesummary",
+            name="semester",
+            field=models.CharField(default="", help_text="Semester", max_length=20),
+        ),
+        migrations.RemoveField(
+            model_name="attendance",
+            name="semester",
+        ),
+        migrations.RemoveField(
+            model_name="attendancesummary",
+            name="semester",
+        ),
+        migrations.RenameField(
+            model_name="attendance",
+            old_name="semester_ref",
+            new_name="semester",
+        ),
+        migrations.RenameField(
+            model_name="attendancesummary",
+            old_name="semester_ref",
+            new_name="semester",
+        ),
+        migrations.AlterField(
+            model_name="attendance",
+            name="semester",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="attendances",
+                to="academic_sessions.semester",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="attendancesummary",
+            name="semester",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="attendance_summaries",
+                to="academic_sessions.semester",
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name="attendancesummary",
+            unique_together={("student", "course", "session", "semester")},
+        ),
+        migrations.AddIndex(
+            model_name="attendance",
+            index=models.Index(
+                fields=["semester", "course"], name="attendance_semester_course_idx"
+            ),
+        ),
+    ]
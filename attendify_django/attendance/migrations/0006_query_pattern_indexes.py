@@ -0,0 +1,36 @@
+# Generated by Django 5.2.4 on 2026-10-18 15:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("academic_sessions", "0003_semester"),
+        ("attendance", "0005_semester_fk"),
+        ("courses", "0003_course_active"),
+        ("students", "0005_enrollment"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="attendance",
+            index=models.Index(
+                fields=["student", "-date", "-time", "-id"],
+                name="attendance_student_recent_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="attendance",
+            index=models.Index(
+                fields=["status", "-date", "-time", "-id"],
+                name="attendance_status_recent_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="attendance",
+            index=models.Index(fields=["-created_at"], name="attendance_created_idx"),
+        ),
+    ]
@@ -2,7 +2,7 @@ from django.db import models
 from django.contrib.auth import get_user_model
 from students.models import Student
 from courses.models import Course
-from academic_sessions.models import AcademicSession
+from academic_sessions.models import AcademicSession, Semester
 
 User = get_user_model()
 
@@ -20,13 +20,13 @@ class Attendance(models.Model):
     course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='attendances')
     lecturer = models.ForeignKey(User, on_delete=models.CASCADE, related_name='attendances')
     session = models.ForeignKey(AcademicSession, on_delete=models.CASCADE, related_name='attendances')
+    semester = models.ForeignKey(Semester, on_delete=models.PROTECT, related_name='attendances')
     
     date = models.DateField(help_text="Attendance date")
     time = models.TimeField(help_text="Attendance time")
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='present')
     
     # Additional fields
-    semester = models.CharField(max_length=20, help_text="Semester")
     level = models.CharField(max_length=20, help_text="Academic level")
     
     created_at = models.DateTimeField(auto_now_add=True)
@@ -38,6 +38,56 @@ class Attendance(models.Model):
         verbose_name_plural = 'Attendances'
         ordering = ['-date', '-time']
         unique_together = ['student', 'course', 'date']
+        # Keyset pagination seeks on (date, time, id), overall and within a course
+        indexes = [
+            models.Index(fields=['-date', '-time', '-id'], name='attendance_recent_idx'),
+            models.Index(fields=['course', '-date', '-time', '-id'], name='attendance_course_recent_idx'),
+            models.Index(fields=['semester', 'course'], name='attendance_semester_course_idx'),
+            # A student's history and the status filter page in the same order
+            models.Index(fields=['student', '-date', '-time', '-id'], name='attendance_student_recent_idx'),
+            models.Index(fields=['status', '-date', '-time', '-id'], name='attendance_status_recent_idx'),
+            # Admin change list
+            models.Index(fields=['-created_at'], name='attendance_created_idx'),
+        ]
     
     def __str__(self):
         return f"{self.student.name} - {self.course.courseCode} - {self.date}"
+
+
+class AttendanceSummary(models.Model):
+    """Attendance counts per student, course, session and semester.
+
+    Maintained from ``Attendance`` writes (see ``attendance.summaries``) so
+    dashboards read one indexed row per course instead of aggregating.
+    """
+    
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='attendance_summaries')
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='attendance_summaries')
+    session = models.ForeignKey(AcademicSession, on_delete=models.CASCADE, related_name='attendance_summaries')
+    semester = models.ForeignKey(Semester, on_delete=models.CASCADE, related_name='attendance_summaries')
+    
+    present = models.PositiveIntegerField(default=0)
+    late = models.PositiveIntegerField(default=0)
+    absent = models.PositiveIntegerField(default=0)
+    last_attended = models.DateField(null=True, blank=True, help_text="Last date marked present or late")
+    
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'attendance_attendancesummary'
+        verbose_name = 'Attendance Summary'
+        verbose_name_plural = 'Attendance Summaries'
+        ordering = ['student', 'course']
+        unique_together = ['student', 'course', 'session', 'semester']
+    
+    def __str__(self):
+        return f"{self.student_id} - {self.course_id} - {self.semester_id}: {self.rate:.0%}"
+    
+    @property
+    def total(self):
+        return self.present + self.late + self.absent
+    
+    @property
+    def rate(self):
+        """Share of classes attended, counting late as attended"""
+        return (self.present + self.late) / self.total if self.total else 0.0
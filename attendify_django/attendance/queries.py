@@ -0,0 +1,71 @@
+import datetime
+
+from utils.pagination import KeysetPagination
+from utils.query_audit import canonical_query
+from .exports import export_queryset
+from .models import Attendance, AttendanceSummary
+from .summaries import summary_counts
+
+DAY = datetime.date(2025, 1, 6)
+# A cursor position in the default (-date, -time, -id) ordering
+POSITION = [DAY, datetime.time(9, 0), 1]
+
+
+def _page(queryset):
+    return KeysetPagination().page_queryset(queryset, POSITION)
+
+
+@canonical_query('attendance.list')
+def attendance_list():
+    return _page(Attendance.objects.all())
+
+
+@canonical_query('attendance.list_by_course')
+def attendance_by_course():
+    return _page(Attendance.objects.filter(course_id=1))
+
+
+@canonical_query('attendance.list_by_student')
+def attendance_by_student():
+    return _page(Attendance.objects.filter(student_id=1))
+
+
+@canonical_query('attendance.list_by_status')
+def attendance_by_status():
+    return _page(Attendance.objects.filter(status='absent'))
+
+
+@canonical_query('attendance.roll_existing')
+def roll_existing():
+    return Attendance.objects.filter(course_id=1, date=DAY, student_id__in=[1, 2, 3]).values_list(
+        'student_id', 'session_id', 'semester_id'
+    )
+
+
+@canonical_query('attendance.summary_refresh')
+def summary_refresh():
+    return summary_counts(
+        Attendance.objects.filter(
+            course_id=1, session_id=1, semester_id=1, student_id__in=[1, 2, 3]
+        ).values('student_id').order_by()
+    )
+
+
+@canonical_query('attendance.export_by_course')
+def export_by_course():
+    return export_queryset(course=1, date_from=DAY)
+
+
+@canonical_query('attendance.export_by_semester')
+def export_by_semester():
+    return export_queryset(semester=1)
+
+
+@canonical_query('attendance.admin_recent')
+def admin_recent():
+    return Attendance.objects.order_by('-created_at')[:100]
+
+
+@canonical_query('attendance.student_summary')
+def student_summary():
+    return AttendanceSummary.objects.filter(student_id=1, session_id=1)
@@ -0,0 +1,55 @@
+from rest_framework import serializers
+
+from .models import Attendance, AttendanceSummary
+
+
+class AttendanceSerializer(serializers.ModelSerializer):
+    """Serializer for attendance records"""
+    
+    regNo = serializers.CharField(source='student.regNo', read_only=True)
+    studentName = serializers.CharField(source='student.name', read_only=True)
+    courseCode = serializers.CharField(source='course.courseCode', read_only=True)
+    semesterName = serializers.CharField(source='semester.name', read_only=True)
+    
+    class Meta:
+        model = Attendance
+        fields = [
+            'id', 'student', 'regNo', 'studentName', 'course', 'courseCode', 'lecturer',
+            'session', 'date', 'time', 'status', 'semester', 'semesterName', 'level'
+        ]
+
+
+class BulkAttendanceSerializer(serializers.Serializer):
+    """Serializer for marking a whole class roll at once"""
+    
+    courseId = serializers.IntegerField()
+    sessionId = serializers.IntegerField(required=False)
+    date = serializers.DateField()
+    time = serializers.TimeField(required=False)
+    semesterId = serializers.IntegerField(required=False)
+    # Semester name within the session, for clients that predate semesterId
+    semester = serializers.CharField(max_length=20, required=False)
+    level = serializers.CharField(max_length=20, required=False)
+    # Records are validated row by row so one bad row does not reject the roll
+    records = serializers.ListField(
+        child=serializers.JSONField(),
+        allow_empty=False,
+        max_length=5000
+    )
+
+
+class AttendanceSummarySerializer(serializers.ModelSerializer):
+    """Serializer for a student's attendance in one course"""
+    
+    courseCode = serializers.CharField(source='course.courseCode', read_only=True)
+    courseTitle = serializers.CharField(source='course.courseTitle', read_only=True)
+    semesterName = serializers.CharField(source='semester.name', read_only=True)
+    total = serializers.IntegerField(read_only=True)
+    rate = serializers.FloatField(read_only=True)
+    
+    class Meta:
+        model = AttendanceSummary
+        fields = [
+            'course', 'courseCode', 'courseTitle', 'session', 'semester', 'semesterName',
+            'present', 'late', 'absent', 'total', 'rate', 'last_attended'
+        ]
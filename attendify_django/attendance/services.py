@@ -0,0 +1,118 @@
+from django.db import transaction
+
+from students.models import Student
+from students.rosters import enrolled_among
+from .models import Attendance
+from .summaries import refresh_summaries
+
+VALID_STATUSES = {choice for choice, _ in Attendance.STATUS_CHOICES}
+
+# Columns refreshed when a student is marked again for the same course and date
+UPSERT_FIELDS = ['status', 'time', 'lecturer', 'session', 'semester', 'level', 'updated_at']
+
+
+def mark_attendance_bulk(course, session, lecturer, date, time, semester, level, records):
+    """Mark a whole roll for one course and date.
+
+    ``semester`` is a ``Semester`` of ``session``. Each record carries a
+    ``status`` and either a ``studentId`` or a ``regNo``.
+    The payload is checked against the cached course roster (students missing
+    from it are rechecked in the database) and
+    written with a single upsert on (student, course, date), so submitting the
+    same roll twice is idempotent. Returns one outcome per record, in order.
+    """
+    results = [{'index': index} for index in range(len(records))]
+
+    # Normalize records and collect identifiers for the roster query
+    student_ids = set()
+    reg_nos = set()
+    for result, record in zip(results, records):
+        if not isinstance(record, dict):
+            result.update(result='rejected', error='Record must be an object')
+            continue
+
+        student_id = record.get('studentId')
+        reg_no = record.get('regNo')
+        mark = record.get('status', 'present')
+        result.update(studentId=student_id, regNo=reg_no)
+
+        if mark not in VALID_STATUSES:
+            result.update(result='rejected', error=f'Invalid status "{mark}"')
+        elif student_id is not None:
+            try:
+                result['studentId'] = student_id = int(student_id)
+            except (TypeError, ValueError):
+                result.update(result='rejected', error='Invalid studentId')
+                continue
+            student_ids.add(student_id)
+        elif reg_no:
+            reg_nos.add(str(reg_no))
+        else:
+            result.update(result='rejected', error='studentId or regNo is required')
+        result['mark'] = mark
+
+    # Only regNo records need a query to resolve; enrollment is a set lookup
+    # unless some students are missing from the cached roster
+    id_by_reg_no = {}
+    if reg_nos:
+        id_by_reg_no = dict(
+            Student.objects.filter(regNo__in=reg_nos).values_list('regNo', 'id')
+        )
+    pending = [result for result in results if 'result' not in result]
+    for result in pending:
+        if result['studentId'] is None:
+            result['studentId'] = id_by_reg_no.get(str(result['regNo']))
+    enrolled_ids = enrolled_among(
+        course.pk, {result['studentId'] for result in pending if result['studentId'] is not None}
+    )
+
+    rows = {}
+    for result in pending:
+        student_id = result['studentId']
+        if student_id is None or student_id not in enrolled_ids:
+            result.update(result='rejected', error='Student is not enrolled in this course')
+        elif student_id in rows:
+            result.update(result='rejected', error='Duplicate record for student')
+        else:
+            rows[student_id] = result
+
+    with transaction.atomic():
+        # Existing rows may move to another session or semester when re-marked
+        previous_keys = {
+            (student_id, course.pk, session_id, semester_id)
+            for student_id, session_id, semester_id in Attendance.objects.filter(
+                course=course, date=date, student_id__in=rows
+            ).values_list('student_id', 'session_id', 'semester_id')
+        }
+        existing = {key[0] for key in previous_keys}
+        Attendance.objects.bulk_create(
+            [
+                Attendance(
+                    student_id=student_id,
+                    course=course,
+                    lecturer_id=lecturer.pk,
+                    session=session,
+                    date=date,
+                    time=time,
+                    status=result['mark'],
+                    semester=semester,
+                    level=level,
+                )
+                for student_id, result in rows.items()
+            ],
+            batch_size=500,
+            update_conflicts=True,
+            unique_fields=['student', 'course', 'date'],
+            update_fields=UPSERT_FIELDS,
+        )
+        # bulk_create sends no signals, so refresh the affected summaries here
+        refresh_summaries(
+            previous_keys | {(student_id, course.pk, session.pk, semester.pk) for student_id in rows}
+        )
+
+    for student_id, result in rows.items():
+        result['result'] = 'updated' if student_id in existing else 'created'
+    for result in results:
+        result.pop('mark', None)
+
+    return results
@@ -0,0 +1,30 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Attendance
+from .summaries import summary_key, schedule_summary_refresh
+
+
+@receiver(pre_save, sender=Attendance)
+def remember_summary_key(sender, instance, **kwargs):
+    """Record the summary an existing row counted towards before it changes"""
+    instance._previous_summary_key = None
+    if instance.pk:
+        previous = Attendance.objects.filter(pk=instance.pk).values_list(
+            'student_id', 'course_id', 'session_id', 'semester_id'
+        ).first()
+        instance._previous_summary_key = previous
+
+
+@receiver(post_save, sender=Attendance)
+def refresh_summary_on_save(sender, instance, **kwargs):
+    keys = {summary_key(instance)}
+    previous = getattr(instance, '_previous_summary_key', None)
+    if previous:
+        keys.add(previous)
+    schedule_summary_refresh(keys)
+
+
+@receiver(post_delete, sender=Attendance)
+def refresh_summary_on_delete(sender, instance, **kwargs):
+    schedule_summary_refresh({summary_key(instance)})
@@ -0,0 +1,117 @@
+import threading
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count, Max, Q
+
+from .models import Attendance, AttendanceSummary
+
+SUMMARY_FIELDS = ['present', 'late', 'absent', 'last_attended', 'updated_at']
+
+_pending = threading.local()
+
+
+def summary_key(attendance):
+    """Key of the summary row an attendance record counts towards"""
+    return (attendance.student_id, attendance.course_id, attendance.session_id, attendance.semester_id)
+
+
+def summary_counts(queryset):
+    """Annotate grouped attendance rows with the counts stored in a summary"""
+    return queryset.annotate(
+        present=Count('id', filter=Q(status='present')),
+        late=Count('id', filter=Q(status='late')),
+        absent=Count('id', filter=Q(status='absent')),
+        last_attended=Max('date', filter=Q(status__in=['present', 'late'])),
+    )
+
+
+def refresh_summaries(keys):
+    """Recompute the summary rows for the given keys.
+
+    Only the attendance rows behind the affected keys are read: one grouped
+    query per (course, session, semester) plus one upsert and one delete.
+    """
+    students_by_scope = defaultdict(set)
+    for student_id, course_id, session_id, semester_id in keys:
+        students_by_scope[(course_id, session_id, semester_id)].add(student_id)
+
+    for (course_id, session_id, semester_id), student_ids in students_by_scope.items():
+        rows = summary_counts(
+            Attendance.objects.filter(
+                course_id=course_id,
+                session_id=session_id,
+                semester_id=semester_id,
+                student_id__in=student_ids,
+            ).values('student_id').order_by()
+        )
+        summaries = [
+            AttendanceSummary(
+                student_id=row['student_id'],
+                course_id=course_id,
+                session_id=session_id,
+                semester_id=semester_id,
+                present=row['present'],
+                late=row['late'],
+                absent=row['absent'],
+                last_attended=row['last_attended'],
+            )
+            for row in rows
+        ]
+        AttendanceSummary.objects.bulk_create(
+            summaries,
+            batch_size=500,
+            update_conflicts=True,
+            unique_fields=['student', 'course', 'session', 'semester'],
+            update_fields=SUMMARY_FIELDS,
+        )
+
+        emptied = student_ids - {summary.student_id for summary in summaries}
+        if emptied:
+            AttendanceSummary.objects.filter(
+                course_id=course_id,
+                session_id=session_id,
+                semester_id=semester_id,
+                student_id__in=emptied,
+            ).delete()
+
+
+def schedule_summary_refresh(keys):
+    """Refresh summaries once the current transaction commits.
+
+    Keys are collected per thread, so cascading deletes that send one signal
+    per attendance row still refresh each summary only once.
+    """
+    pending = getattr(_pending, 'keys', None)
+    if pending is None:
+        pending = _pending.keys = set()
+    pending.update(keys)
+    transaction.on_commit(flush_scheduled_refreshes)
+
+
+def flush_scheduled_refreshes():
+    keys = getattr(_pending, 'keys', None)
+    if keys:
+        _pending.keys = set()
+        refresh_summaries(keys)
+
+
+def rebuild_summaries(batch_size=1000):
+    """Recreate every summary row from the attendance table"""
+    rows = summary_counts(
+        Attendance.objects.values('student_id', 'course_id', 'session_id', 'semester_id').order_by()
+    )
+    created = 0
+    with transaction.atomic():
+        AttendanceSummary.objects.all().delete()
+        batch = []
+        for row in rows.iterator(chunk_size=batch_size):
+            batch.append(AttendanceSummary(**row))
+            if len(batch) >= batch_size:
+                AttendanceSummary.objects.bulk_create(batch)
+                created += len(batch)
+                batch = []
+        if batch:
+            AttendanceSummary.objects.bulk_create(batch)
+            created += len(batch)
+    return created
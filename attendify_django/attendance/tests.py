@@ -1,3 +1,482 @@
-from django.test import TestCase
+import base64
+import csv
+import datetime
+import json
+from io import BytesIO, StringIO
+from urllib.parse import parse_qs, urlparse
+from unittest import mock
 
-# Create your tests here.
+from django.core.management import call_command
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from rest_framework.test import APIClient
+
+from academic_sessions.models import AcademicSession, Semester
+from activities.models import Activity
+from authentication.authentication import create_jwt_token
+from authentication.models import User
+from courses.models import Course
+from students.models import Enrollment, Student
+from students.rosters import get_roster, invalidate_rosters
+from utils.replicas import ReplicaPinMiddleware, ReplicaRouter, primary, use_replica
+from utils.spreadsheets import read_xlsx
+from .exports import EXPORT_COLUMNS, export_queryset, stream_export
+from .models import Attendance, AttendanceSummary
+from .services import mark_attendance_bulk
+from .summaries import refresh_summaries
+
+
+class AttendanceFixtures:
+
+    def setUp(self):
+        invalidate_rosters()
+        self.session = AcademicSession.objects.create(
+            name='2024/2025', start=datetime.date(2024, 9, 1), end=datetime.date(2025, 8, 31)
+        )
+        self.semester = Semester.objects.create(session=self.session, name='first')
+        self.course = Course.objects.create(
+            courseTitle='Compilers', courseCode='CSC 401', level='400', semester=self.semester
+        )
+        self.lecturer = User.objects.create(
+            email='lecturer@example.com', fullName='Ada Lecturer', access='approved'
+        )
+        self.enrolled, self.other = Student.objects.bulk_create([
+            Student(name='Ada', regNo='2021/0001', level='400', addmissionYear='2021', email='ada@example.com'),
+            Student(name='Bob', regNo='2021/0002', level='400', addmissionYear='2021', email='bob@example.com'),
+        ])
+
+    def mark(self, records, semester=None):
+        return mark_attendance_bulk(
+            self.course, self.session, self.lecturer, datetime.date(2025, 1, 6), datetime.time(9, 0),
+            semester or self.semester, '400', records,
+        )
+
+
+class AttendanceTestCase(AttendanceFixtures, TestCase):
+    pass
+
+
+class MarkAttendanceBulkTests(AttendanceTestCase):
+
+    def test_student_enrolled_after_roster_was_cached_is_accepted(self):
+        get_roster(self.course.pk)
+        # Enrolled without this process seeing a version bump
+        Enrollment.objects.bulk_create([Enrollment(student=self.enrolled, course=self.course)])
+
+        results = self.mark([{'studentId': self.enrolled.pk}, {'regNo': self.other.regNo}])
+
+        self.assertEqual(results[0]['result'], 'created')
+        self.assertEqual(results[1]['error'], 'Student is not enrolled in this course')
+        self.assertEqual(Attendance.objects.get().student_id, self.enrolled.pk)
+
+    def test_resubmitted_roll_updates_existing_rows(self):
+        Enrollment.objects.bulk_create([
+            Enrollment(student=self.enrolled, course=self.course), Enrollment(student=self.other, course=self.course),
+        ])
+        self.mark([{'studentId': self.enrolled.pk}, {'studentId': self.other.pk}])
+        first = dict(Attendance.objects.values_list('student_id', 'id'))
+        substitute = User.objects.create(email='substitute@example.com', fullName='Sub Lecturer', access='approved')
+
+        results = mark_attendance_bulk(
+            self.course, self.session, substitute, datetime.date(2025, 1, 6), datetime.time(10, 30),
+            self.semester, '400', [{'regNo': self.enrolled.regNo, 'status': 'late'}, {'studentId': self.other.pk}],
+        )
+
+        self.assertEqual([result['result'] for result in results], ['updated', 'updated'])
+        self.assertEqual(results[0]['studentId'], self.enrolled.pk)
+        # Same rows, refreshed in place
+        self.assertEqual(dict(Attendance.objects.values_list('student_id', 'id')), first)
+        self.assertEqual(
+            set(Attendance.objects.values_list('student_id', 'status', 'time', 'lecturer_id')),
+            {
+                (self.enrolled.pk, 'late', datetime.time(10, 30), substitute.pk),
+                (self.other.pk, 'present', datetime.time(10, 30), substitute.pk),
+            },
+        )
+
+    def test_rejects_bad_rows_and_writes_the_rest(self):
+        Enrollment.objects.bulk_create([Enrollment(student=self.enrolled, course=self.course)])
+
+        results = self.mark([
+            'not an object',
+            {'studentId': self.enrolled.pk, 'status': 'asleep'},
+            {'studentId': 'abc'},
+            {'status': 'present'},
+            {'regNo': 'UNKNOWN/1'},
+            {'studentId': self.other.pk},
+            {'regNo': self.enrolled.regNo, 'status': 'late'},
+            {'studentId': self.enrolled.pk},
+        ])
+
+        self.assertEqual([(result['index'], result['result'], result.get('error')) for result in results], [
+            (0, 'rejected', 'Record must be an object'),
+            (1, 'rejected', 'Invalid status "asleep"'),
+            (2, 'rejected', 'Invalid studentId'),
+            (3, 'rejected', 'studentId or regNo is required'),
+            (4, 'rejected', 'Student is not enrolled in this course'),
+            (5, 'rejected', 'Student is not enrolled in this course'),
+            (6, 'created', None),
+            (7, 'rejected', 'Duplicate record for student'),
+        ])
+        self.assertEqual(list(Attendance.objects.values_list('student_id', 'status')), [(self.enrolled.pk, 'late')])
+
+
+@override_settings(ACTIVITY_LOG={'ALWAYS_FLUSH': True})
+class BulkMarkEndpointTests(AttendanceFixtures, TransactionTestCase):
+    """The async view writes from another thread, outside a test transaction"""
+
+    def test_reports_outcomes(self):
+        Enrollment.objects.bulk_create([Enrollment(student=self.enrolled, course=self.course)])
+        client = APIClient()
+        client.cookies['jwt'] = create_jwt_token(self.lecturer)
+        payload = {
+            'courseId': self.course.pk, 'sessionId': self.session.pk, 'semesterId': self.semester.pk,
+            'date': '2025-01-06', 'records': [{'studentId': self.enrolled.pk}, {'studentId': self.other.pk}],
+        }
+
+        first = client.post('/api/v1/attendance/bulk/', payload, format='json')
+        again = client.post('/api/v1/attendance/bulk/', payload, format='json')
+
+        self.assertEqual(first.status_code, 200, first.content)
+        data = first.json()['data']
+        self.assertEqual((data['created'], data['updated'], data['rejected']), (1, 0, 1))
+        self.assertEqual([result['result'] for result in data['results']], ['created', 'rejected'])
+        data = again.json()['data']
+        self.assertEqual((data['created'], data['updated'], data['rejected']), (0, 1, 1))
+        self.assertEqual(Attendance.objects.count(), 1)
+        self.assertEqual(
+            [activity.metadata['created'] for activity in Activity.objects.filter(activity_type='attendance_marked')],
+            [0, 1],
+        )
+
+
+class AttendanceSummaryTests(AttendanceTestCase):
+    """Summaries kept up to date on every write must equal a full rebuild"""
+
+    def setUp(self):
+        super().setUp()
+        self.second = Semester.objects.create(session=self.session, name='second')
+
+    def summaries(self):
+        return set(AttendanceSummary.objects.values_list(
+            'student_id', 'course_id', 'session_id', 'semester_id', 'present', 'late', 'absent', 'last_attended'
+        ))
+
+    def assertMatchesRebuild(self, expected):
+        self.assertEqual(self.summaries(), expected)
+        call_command('rebuild_attendance_summary', stdout=StringIO())
+        self.assertEqual(self.summaries(), expected)
+
+    def attend(self, student, date, status='present'):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Attendance.objects.create(
+                student=student, course=self.course, lecturer=self.lecturer, session=self.session,
+                semester=self.semester, date=date, time=datetime.time(9, 0), status=status, level='400',
+            )
+
+    def key(self, student, semester=None):
+        return (student.pk, self.course.pk, self.session.pk, (semester or self.semester).pk)
+
+    def test_insert(self):
+        self.attend(self.enrolled, datetime.date(2025, 1, 6))
+        self.attend(self.enrolled, datetime.date(2025, 1, 7), 'absent')
+
+        self.assertMatchesRebuild({(*self.key(self.enrolled), 1, 0, 1, datetime.date(2025, 1, 6))})
+
+    def test_status_change(self):
+        attendance = self.attend(self.enrolled, datetime.date(2025, 1, 6))
+
+        attendance.status = 'late'
+        with self.captureOnCommitCallbacks(execute=True):
+            attendance.save()
+
+        self.assertMatchesRebuild({(*self.key(self.enrolled), 0, 1, 0, datetime.date(2025, 1, 6))})
+
+    def test_move_to_other_semester_and_course(self):
+        attendance = self.attend(self.enrolled, datetime.date(2025, 1, 6))
+        self.attend(self.other, datetime.date(2025, 1, 6))
+        other_course = Course.objects.create(
+            courseTitle='Networks', courseCode='CSC 403', level='400', semester=self.second
+        )
+
+        attendance.semester = self.second
+        with self.captureOnCommitCallbacks(execute=True):
+            attendance.save()
+        self.assertMatchesRebuild({
+            (*self.key(self.enrolled, self.second), 1, 0, 0, datetime.date(2025, 1, 6)),
+            (*self.key(self.other), 1, 0, 0, datetime.date(2025, 1, 6)),
+        })
+
+        attendance.course = other_course
+        with self.captureOnCommitCallbacks(execute=True):
+            attendance.save()
+        self.assertMatchesRebuild({
+            (self.enrolled.pk, other_course.pk, self.session.pk, self.second.pk, 1, 0, 0, datetime.date(2025, 1, 6)),
+            (*self.key(self.other), 1, 0, 0, datetime.date(2025, 1, 6)),
+        })
+
+    def test_delete(self):
+        attendance = self.attend(self.enrolled, datetime.date(2025, 1, 6))
+        self.attend(self.enrolled, datetime.date(2025, 1, 7), 'late')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            attendance.delete()
+        self.assertMatchesRebuild({(*self.key(self.enrolled), 0, 1, 0, datetime.date(2025, 1, 7))})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Attendance.objects.all().delete()
+        self.assertMatchesRebuild(set())
+
+    def test_cascading_delete_refreshes_once(self):
+        for day in range(1, 4):
+            self.attend(self.enrolled, datetime.date(2025, 1, day))
+            self.attend(self.other, datetime.date(2025, 1, day))
+        keys = {self.key(self.enrolled), self.key(self.other)}
+
+        with mock.patch('attendance.summaries.refresh_summaries', wraps=refresh_summaries) as refresh, \
+                self.captureOnCommitCallbacks(execute=True):
+            self.course.delete()
+
+        refresh.assert_called_once()
+        self.assertEqual(refresh.call_args.args[0], keys)
+        self.assertMatchesRebuild(set())
+
+    def test_mark_attendance_bulk(self):
+        Enrollment.objects.bulk_create([
+            Enrollment(student=self.enrolled, course=self.course),
+            Enrollment(student=self.other, course=self.course),
+        ])
+        self.mark([{'studentId': self.enrolled.pk}, {'studentId': self.other.pk, 'status': 'absent'}])
+        self.assertMatchesRebuild({
+            (*self.key(self.enrolled), 1, 0, 0, datetime.date(2025, 1, 6)),
+            (*self.key(self.other), 0, 0, 1, None),
+        })
+
+        # Marked again under another semester: the rows move and the old summaries go
+        self.mark([{'studentId': self.enrolled.pk, 'status': 'late'}], semester=self.second)
+        self.assertMatchesRebuild({
+            (*self.key(self.enrolled, self.second), 0, 1, 0, datetime.date(2025, 1, 6)),
+            (*self.key(self.other), 0, 0, 1, None),
+        })
+
+    def test_summary_endpoint_requires_approved_staff(self):
+        self.attend(self.enrolled, datetime.date(2025, 1, 6))
+        url = f'/api/v1/attendance/students/{self.enrolled.pk}/summary/'
+        client = APIClient()
+
+        client.force_authenticate(self.lecturer)
+        response = client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data'][0]['present'], 1)
+
+        for role, access in [('lecturer', 'pending'), ('user', 'approved')]:
+            user = User.objects.create(email=f'{role}-{access}@example.com', fullName='User', role=role, access=access)
+            client.force_authenticate(user)
+            self.assertEqual(client.get(url).status_code, 403)
+
+
+class ListAttendanceTests(AttendanceTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.students = Student.objects.bulk_create([
+            Student(name=f'Student {n}', regNo=f'2022/{n:04}', level='400', addmissionYear='2022')
+            for n in range(7)
+        ])
+        # Several rows share (date, time), so only the id tells them apart
+        stamps = [
+            (datetime.date(2025, 1, 6), datetime.time(9)),
+            (datetime.date(2025, 1, 6), datetime.time(9)),
+            (datetime.date(2025, 1, 6), datetime.time(9)),
+            (datetime.date(2025, 1, 6), datetime.time(8)),
+            (datetime.date(2025, 1, 6), datetime.time(8)),
+            (datetime.date(2025, 1, 5), datetime.time(9)),
+            (datetime.date(2025, 1, 5), datetime.time(9)),
+        ]
+        Attendance.objects.bulk_create([
+            Attendance(
+                student=student, course=self.course, lecturer=self.lecturer, session=self.session,
+                semester=self.semester, date=date, time=time, level='400',
+            )
+            for student, (date, time) in zip(self.students, stamps)
+        ])
+        self.expected = list(Attendance.objects.order_by('-date', '-time', '-id').values_list('id', flat=True))
+        self.client = APIClient()
+        self.client.force_authenticate(self.lecturer)
+
+    def page(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.content)
+        data = response.json()['data']
+        return [row['id'] for row in data['results']], data['next'], data['previous']
+
+    def test_walks_forward_and_back_across_duplicate_sort_keys(self):
+        pages = []
+        url = '/api/v1/attendance/?limit=3'
+        while url:
+            ids, url, previous = self.page(url)
+            pages.append((ids, previous))
+
+        self.assertEqual([ids for ids, _ in pages], [self.expected[:3], self.expected[3:6], self.expected[6:]])
+        self.assertIsNone(pages[0][1])
+
+        backwards = []
+        url = pages[-1][1]
+        while url:
+            ids, _, url = self.page(url)
+            backwards.append(ids)
+        self.assertEqual(backwards, [self.expected[3:6], self.expected[:3]])
+
+    def test_tampered_cursor_is_rejected(self):
+        _, url, _ = self.page('/api/v1/attendance/?limit=3')
+        token = parse_qs(urlparse(url).query)['cursor'][0]
+        payload, signature = token.split(':')
+        # A position moved by the client, keeping the server's signature
+        position = json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+        position['p'][-1] += 1
+        moved = base64.urlsafe_b64encode(json.dumps(position).encode()).decode().rstrip('=')
+
+        for cursor in [f'{moved}:{signature}', 'not-a-cursor', token + 'x']:
+            with self.subTest(cursor=cursor):
+                response = self.client.get('/api/v1/attendance/', {'cursor': cursor, 'limit': 3})
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json()['message'], 'Invalid cursor')
+
+    def test_requires_approved_staff(self):
+        for role, access in [('lecturer', 'pending'), ('user', 'approved')]:
+            user = User.objects.create(email=f'{role}-{access}@example.com', fullName='User', role=role, access=access)
+            self.client.force_authenticate(user)
+            self.assertEqual(self.client.get('/api/v1/attendance/').status_code, 403)
+
+
+class ExportFileTests(AttendanceTestCase):
+
+    def setUp(self):
+        super().setUp()
+        Enrollment.objects.bulk_create([
+            Enrollment(student=self.enrolled, course=self.course), Enrollment(student=self.other, course=self.course),
+        ])
+        Student.objects.filter(pk=self.enrolled.pk).update(name='=HYPERLINK("http://example.com","Ada")')
+        Student.objects.filter(pk=self.other.pk).update(name='@SUM(1+1)')
+        self.mark([{'studentId': self.enrolled.pk}, {'studentId': self.other.pk, 'status': 'late'}])
+
+    def export(self, file_type):
+        return stream_export(export_queryset(course=self.course.pk), file_type)
+
+    def test_csv_cells_are_not_formulas(self):
+        header, *rows = csv.reader(StringIO(''.join(self.export('csv'))))
+
+        self.assertEqual(header, [title for title, _ in EXPORT_COLUMNS])
+        self.assertEqual(
+            [row[:2] for row in rows],
+            [['2021/0001', '\'=HYPERLINK("http://example.com","Ada")'], ['2021/0002', "'@SUM(1+1)"]],
+        )
+        self.assertEqual(rows[0][2:], [
+            'CSC 401', 'Compilers', 'Ada Lecturer', '2024/2025', 'first', '400', '2025-01-06', '09:00:00', 'present',
+        ])
+
+    def test_xlsx_round_trips(self):
+        header, *rows = read_xlsx(BytesIO(b''.join(self.export('xlsx'))))
+
+        self.assertEqual(header, [title for title, _ in EXPORT_COLUMNS])
+        # Inline strings are never evaluated, so names come back as entered
+        self.assertEqual(rows, [
+            ['2021/0001', '=HYPERLINK("http://example.com","Ada")', 'CSC 401', 'Compilers', 'Ada Lecturer',
+             '2024/2025', 'first', '400', '2025-01-06', '09:00:00', 'present'],
+            ['2021/0002', '@SUM(1+1)', 'CSC 401', 'Compilers', 'Ada Lecturer',
+             '2024/2025', 'first', '400', '2025-01-06', '09:00:00', 'late'],
+        ])
+
+
+class ExportAttendanceTests(TestCase):
+
+    def export(self, access):
+        lecturer = User.objects.create(email=f'{access}@example.com', fullName='Lecturer', access=access)
+        client = APIClient()
+        client.force_authenticate(lecturer)
+        return client.get('/api/v1/attendance/export/', {'type': 'csv'})
+
+    def test_approved_lecturer_can_export(self):
+        self.assertEqual(self.export('approved').status_code, 200)
+
+    def test_denied_lecturer_cannot_export(self):
+        self.assertEqual(self.export('denied').status_code, 403)
+
+
+@override_settings(REPLICA_PIN_SECONDS=5)
+class ReplicaRoutingTests(SimpleTestCase):
+    """Routing decisions only: the test settings have no replica, so its alias is patched in"""
+
+    def setUp(self):
+        patcher = mock.patch('utils.replicas.replica_alias', return_value='replica')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.router = ReplicaRouter()
+        self.factory = RequestFactory()
+
+    def route(self, request=None, write=False):
+        """Run a replica view that reads, optionally writes, then reads again"""
+        seen = []
+
+        @use_replica
+        def view(request):
+            seen.append(self.router.db_for_read(Attendance))
+            if write:
+                self.assertEqual(self.router.db_for_write(Attendance), 'default')
+            seen.append(self.router.db_for_read(Attendance))
+            with primary():
+                seen.append(self.router.db_for_read(Attendance))
+            return HttpResponse()
+
+        view(request or self.factory.get('/'))
+        return seen
+
+    def test_reads_outside_replica_views_use_primary(self):
+        self.assertEqual(self.router.db_for_read(Attendance), 'default')
+
+    def test_replica_view_reads_replica_until_it_writes(self):
+        self.assertEqual(self.route(), ['replica', 'replica', 'default'])
+        self.assertEqual(self.route(write=True), ['replica', 'default', 'default'])
+        # State does not leak out of the view
+        self.assertEqual(self.router.db_for_read(Attendance), 'default')
+
+    def test_streamed_body_reads_replica(self):
+        @use_replica
+        def view(request):
+            return StreamingHttpResponse(self.router.db_for_read(Attendance) for _ in range(2))
+
+        response = view(self.factory.get('/'))
+
+        self.assertEqual(b''.join(response.streaming_content), b'replicareplica')
+
+    def test_write_request_pins_client_to_primary(self):
+        middleware = ReplicaPinMiddleware(lambda request: HttpResponse())
+        with mock.patch('utils.replicas.time.time', return_value=1000.0):
+            response = middleware.process_response(self.factory.post('/'), HttpResponse())
+            pin = response.cookies['primary_pin']
+            self.assertEqual((float(pin.value), pin['max-age']), (1005.0, 5))
+
+            # No pin for reads or failed writes
+            self.assertNotIn('primary_pin', middleware.process_response(self.factory.get('/'), HttpResponse()).cookies)
+            self.assertNotIn(
+                'primary_pin', middleware.process_response(self.factory.post('/'), HttpResponse(status=400)).cookies
+            )
+
+            pinned = self.factory.get('/')
+            pinned.COOKIES['primary_pin'] = pin.value
+            self.assertEqual(self.route(pinned), ['default', 'default', 'default'])
+
+        # An expired or malformed pin is ignored
+        for value in ['1004.0', 'soon']:
+            with self.subTest(value=value), mock.patch('utils.replicas.time.time', return_value=1005.0):
+                request = self.factory.get('/')
+                request.COOKIES['primary_pin'] = value
+                self.assertEqual(self.route(request), ['replica', 'replica', 'default'])
+
+    def test_without_replica_nothing_is_routed_or_pinned(self):
+        with mock.patch('utils.replicas.replica_alias', return_value='default'):
+            response = ReplicaPinMiddleware(lambda request: HttpResponse()).process_response(
+                self.factory.post('/'), HttpResponse()
+            )
+            self.assertNotIn('primary_pin', response.cookies)
+            self.assertEqual(self.route(), ['default', 'default', 'default'])
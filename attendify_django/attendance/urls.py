@@ -0,0 +1,9 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('', views.list_attendance, name='list_attendance'),
+    path('bulk/', views.bulk_mark_attendance, name='bulk_mark_attendance'),
+    path('export/', views.export_attendance, name='export_attendance'),
+    path('students/<int:student_id>/summary/', views.student_attendance_summary, name='student_attendance_summary'),
+]
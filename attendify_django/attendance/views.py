@@ -1,3 +1,261 @@
-from django.shortcuts import render
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework import status
+from asgiref.sync import sync_to_async
+from django.utils import timezone
+from django.utils.dateparse import parse_date
 
-# Create your views here.
+from activities.buffer import log_activity
+from courses.models import Course
+from academic_sessions.models import AcademicSession, Semester
+from academic_sessions.resolver import get_active_session, get_current_semester
+from utils.async_views import async_api_view
+from utils.pagination import paginate
+from utils.replicas import use_replica
+from utils.responses import success_response, error_response
+from .exports import EXPORT_FORMATS, export_queryset, export_response
+from .models import Attendance, AttendanceSummary
+from .serializers import AttendanceSerializer, BulkAttendanceSerializer, AttendanceSummarySerializer
+from .services import mark_attendance_bulk
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@use_replica
+def list_attendance(request):
+    """List attendance records, newest first, one keyset page at a time"""
+    try:
+        if request.user.role not in ['admin', 'lecturer'] or request.user.access != 'approved':
+            return error_response(
+                "You are not authorized to perform this action",
+                status.HTTP_403_FORBIDDEN
+            )
+        
+        params = request.query_params
+        attendances = Attendance.objects.select_related('student', 'course', 'semester')
+        
+        for name, lookup in [
+            ('course', 'course_id'), ('session', 'session_id'),
+            ('student', 'student_id'), ('semester', 'semester_id'),
+        ]:
+            value = params.get(name)
+            if value:
+                if not value.isdigit():
+                    return error_response(
+                        f"Invalid '{name}' id",
+                        status.HTTP_400_BAD_REQUEST
+                    )
+                attendances = attendances.filter(**{lookup: value})
+        
+        for name in ['level', 'status']:
+            value = params.get(name)
+            if value:
+                attendances = attendances.filter(**{name: value})
+        
+        for name, lookup in [('from', 'date__gte'), ('to', 'date__lte')]:
+            value = params.get(name)
+            if value:
+                date = parse_date(value)
+                if date is None:
+                    return error_response(
+                        f"Invalid '{name}' date, expected YYYY-MM-DD",
+                        status.HTTP_400_BAD_REQUEST
+                    )
+                attendances = attendances.filter(**{lookup: date})
+        
+        return paginate(request, attendances, AttendanceSerializer, "Attendance fetched successfully")
+        
+    except Exception as e:
+        return error_response(str(e), status.HTTP_400_BAD_REQUEST)
+
+
+def _resolve_semester(session, course, data, active):
+    """Semester of ``session`` a roll is marked for.
+
+    An explicit ``semesterId`` or ``semester`` name wins; otherwise the
+    current semester when marking the active session, then the course's own.
+    """
+    semesters = Semester.objects.filter(session=session)
+    if data.get('semesterId') is not None:
+        return semesters.filter(pk=data['semesterId']).first()
+    if data.get('semester'):
+        return semesters.filter(name=data['semester']).first()
+    if active is not None and session.pk == active.pk:
+        semester = get_current_semester()
+        if semester is not None:
+            return semester
+    if course.semester_id is None:
+        return None
+    if course.semester.session_id == session.pk:
+        return course.semester
+    # A course keeps its semester name from one session to the next
+    return semesters.filter(name=course.semester.name).first()
+
+
+@async_api_view(['POST'])
+async def bulk_mark_attendance(request):
+    """Mark attendance for many students of one course in a single request.
+
+    Async so waiting device connections hold no worker thread; the roll is
+    written in one transaction on Django's sync thread.
+    """
+    try:
+        if request.user.role not in ['admin', 'lecturer'] or request.user.access != 'approved':
+            return error_response(
+                "You are not authorized to perform this action",
+                status.HTTP_403_FORBIDDEN
+            )
+        
+        serializer = BulkAttendanceSerializer(data=request.data)
+        
+        if not serializer.is_valid():
+            return error_response(
+                "Invalid data provided",
+                status.HTTP_400_BAD_REQUEST
+            )
+        
+        data = serializer.validated_data
+        
+        try:
+            course = await Course.objects.select_related('semester').aget(id=data['courseId'])
+        except Course.DoesNotExist:
+            return error_response("Course not found", status.HTTP_404_NOT_FOUND)
+        
+        # Without a sessionId the roll goes to the active session and its current semester
+        active = await sync_to_async(get_active_session)()
+        if data.get('sessionId') is None:
+            session = active
+            if session is None:
+                return error_response("No academic session is active", status.HTTP_400_BAD_REQUEST)
+        else:
+            try:
+                session = await AcademicSession.objects.aget(id=data['sessionId'])
+            except AcademicSession.DoesNotExist:
+                return error_response("Academic session not found", status.HTTP_404_NOT_FOUND)
+        
+        semester = await sync_to_async(_resolve_semester)(session, course, data, active)
+        if semester is None:
+            return error_response(
+                "Semester not found for this academic session",
+                status.HTTP_400_BAD_REQUEST
+            )
+        
+        results = await sync_to_async(mark_attendance_bulk)(
+            course=course,
+            session=session,
+            lecturer=request.user,
+            date=data['date'],
+            time=data.get('time') or timezone.localtime().time(),
+            semester=semester,
+            level=data.get('level') or course.level,
+            records=data['records'],
+        )
+        
+        summary = {'created': 0, 'updated': 0, 'rejected': 0}
+        for result in results:
+            summary[result['result']] += 1
+        await sync_to_async(log_activity)(
+            'attendance_marked',
+            request.user,
+            f"Marked attendance for {course.courseCode} on {data['date']}",
+            {'courseId': course.id, 'sessionId': session.id, 'date': str(data['date']), **summary}
+        )
+        
+        return success_response(
+            "Attendance marked successfully",
+            data={**summary, 'results': results}
+        )
+        
+    except Exception as e:
+        return error_response(str(e), status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@use_replica
+def student_attendance_summary(request, student_id):
+    """Attendance rates of a student across all courses"""
+    try:
+        if request.user.role not in ['admin', 'lecturer'] or request.user.access != 'approved':
+            return error_response(
+                "You are not authorized to perform this action",
+                status.HTTP_403_FORBIDDEN
+            )
+        
+        summaries = AttendanceSummary.objects.filter(
+            student_id=student_id
+        ).select_related('course', 'semester')
+        
+        for name, lookup in [('session', 'session_id'), ('semester', 'semester_id')]:
+            value = request.query_params.get(name)
+            if value:
+                if not value.isdigit():
+                    return error_response(
+                        f"Invalid '{name}' id",
+                        status.HTTP_400_BAD_REQUEST
+                    )
+                summaries = summaries.filter(**{lookup: value})
+        
+        return success_response(
+            "Attendance summary fetched successfully",
+            data=AttendanceSummarySerializer(summaries, many=True).data
+        )
+        
+    except Exception as e:
+        return error_response(str(e), status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@use_replica
+def export_attendance(request):
+    """Download attendance records as a streamed CSV or XLSX file"""
+    try:
+        if request.user.role not in ['admin', 'lecturer'] or request.user.access != 'approved':
+            return error_response(
+                "You are not authorized to perform this action",
+                status.HTTP_403_FORBIDDEN
+            )
+        
+        params = request.query_params
+        file_type = params.get('type', 'csv').lower()
+        
+        if file_type not in EXPORT_FORMATS:
+            return error_response(
+                f"Unsupported export type. Use one of: {', '.join(EXPORT_FORMATS)}",
+                status.HTTP_400_BAD_REQUEST
+            )
+        
+        # Bad filters must fail here: once streaming starts the status is already sent
+        for name in ['course', 'session', 'semester']:
+            value = params.get(name)
+            if value and not value.isdigit():
+                return error_response(
+                    f"Invalid '{name}' id",
+                    status.HTTP_400_BAD_REQUEST
+                )
+        
+        dates = {}
+        for name in ['from', 'to']:
+            value = params.get(name)
+            if value:
+                dates[name] = parse_date(value)
+                if dates[name] is None:
+                    return error_response(
+                        f"Invalid '{name}' date, expected YYYY-MM-DD",
+                        status.HTTP_400_BAD_REQUEST
+                    )
+        
+        queryset = export_queryset(
+            course=params.get('course'),
+            session=params.get('session'),
+            semester=params.get('semester'),
+            level=params.get('level'),
+            date_from=dates.get('from'),
+            date_to=dates.get('to'),
+        )
+        
+        return export_response(queryset, file_type)
+        
+    except Exception as e:
+        return error_response(str(e), status.HTTP_400_BAD_REQUEST)
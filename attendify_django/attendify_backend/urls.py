@@ -28,9 +28,9 @@ urlpatterns = [
     path("admin/", admin.site.urls),
     path('', home_view, name='home'),
     path('api/v1/auth/', include('authentication.urls')),
-    # path('api/v1/courses/', include('courses.urls')),
-    # path('api/v1/students/', include('students.urls')),
-    # path('api/v1/attendance/', include('attendance.urls')),
-    # path('api/v1/academic-sessions/', include('academic_sessions.urls')),
-    # path('api/v1/activities/', include('activities.urls')),
+    path('api/v1/courses/', include('courses.urls')),
+    path('api/v1/students/', include('students.urls')),
+    path('api/v1/attendance/', include('attendance.urls')),
+    path('api/v1/academic-sessions/', include('academic_sessions.urls')),
+    path('api/v1/activities/', include('activities.urls')),
 ]
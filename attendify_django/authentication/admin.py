@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from .models import User
+from .services import revoke_sessions, set_users_access
 
 
 @admin.register(User)
@@ -16,8 +17,8 @@ class UserAdmin(BaseUserAdmin):
         (None, {'fields': ('email', 'password')}),
         ('Personal info', {'fields': ('fullName', 'role', 'access')}),
         ('Email verification', {'fields': ('emailVerified', 'emailVerificationCode', 'emailVerificationCodeExpires')}),
-        ('Password reset', {'fields': ('passwordResetToken', 'passwordResetTokenExpires')}),
-        ('Permissions', {'fields': ('is_active', 'is_staff', 'is_superuser', 'active')}),
+        ('Password reset', {'fields': ('passwordResetSelector', 'passwordResetToken', 'passwordResetTokenExpires')}),
+        ('Permissions', {'fields': ('is_active', 'is_staff', 'is_superuser', 'active', 'tokenVersion')}),
         ('Important dates', {'fields': ('last_login', 'date_joined')}),
     )
     
@@ -28,4 +29,20 @@ class UserAdmin(BaseUserAdmin):
         }),
     )
     
-    readonly_fields = ['date_joined', 'last_login']
+    readonly_fields = ['date_joined', 'last_login', 'tokenVersion']
+    actions = ['approve_users', 'deny_users', 'sign_out_users']
+    
+    @admin.action(description='Approve selected lecturers')
+    def approve_users(self, request, queryset):
+        changed = set_users_access(queryset.values_list('id', flat=True), 'approved', actor=request.user)
+        self.message_user(request, f"{len(changed)} user(s) approved.")
+    
+    @admin.action(description='Deny selected lecturers')
+    def deny_users(self, request, queryset):
+        changed = set_users_access(queryset.values_list('id', flat=True), 'denied', actor=request.user)
+        self.message_user(request, f"{len(changed)} user(s) denied.")
+    
+    @admin.action(description='Sign selected users out of all sessions')
+    def sign_out_users(self, request, queryset):
+        revoked = revoke_sessions(queryset.values_list('id', flat=True), actor=request.user)
+        self.message_user(request, f"{len(revoked)} user(s) signed out.")
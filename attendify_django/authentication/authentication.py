@@ -4,6 +4,9 @@ from django.contrib.auth import get_user_model
 from rest_framework import authentication, exceptions
 from datetime import datetime, timezone
 
+from .revocation import get_revocation_list
+from .user_cache import aget_cached_user, get_cached_user
+
 User = get_user_model()
 
 
@@ -17,27 +20,36 @@ class JWTAuthentication(authentication.BaseAuthentication):
         if not token:
             return None
         
-        try:
-            payload = jwt.decode(token, settings.JWT_SECRET, algorithms=['HS256'])
-            user_id = payload.get('id')
-            
-            if not user_id:
-                raise exceptions.AuthenticationFailed('Invalid token')
-            
-            try:
-                user = User.objects.get(id=user_id)
-            except User.DoesNotExist:
-                raise exceptions.AuthenticationFailed('User not found')
-            
-            if not user.active:
-                raise exceptions.AuthenticationFailed('User account is deactivated')
-            
-            return (user, token)
-            
-        except jwt.ExpiredSignatureError:
-            raise exceptions.AuthenticationFailed('Token has expired')
-        except jwt.InvalidTokenError:
-            raise exceptions.AuthenticationFailed('Invalid token')
+        get_revocation_list().pull()
+        user = get_cached_user(self.get_user_id(token))
+        return self.check_user(user), token
+    
+    async def aauthenticate(self, request):
+        """``authenticate`` for native async views; a cache miss doesn't block the event loop"""
+        token = self.get_token_from_request(request)
+        
+        if not token:
+            return None
+        
+        await get_revocation_list().apull()
+        user = await aget_cached_user(self.get_user_id(token))
+        return self.check_user(user), token
+    
+    def get_user_id(self, token):
+        """Verify the access token and return the id of the user it was issued to"""
+        payload = decode_token(token, 'access')
+        if get_revocation_list().is_revoked(payload['id'], payload.get('ver', 0)):
+            raise exceptions.AuthenticationFailed('Token has been revoked')
+        return payload['id']
+    
+    def check_user(self, user):
+        if user is None:
+            raise exceptions.AuthenticationFailed('User not found')
+        
+        if not user.active:
+            raise exceptions.AuthenticationFailed('User account is deactivated')
+        
+        return user
     
     def get_token_from_request(self, request):
         """Extract JWT token from request cookies or Authorization header"""
@@ -54,10 +66,25 @@ class JWTAuthentication(authentication.BaseAuthentication):
 
 
 def create_jwt_token(user):
-    """Create JWT token for user"""
+    """Create a short-lived access token for user"""
     payload = {
         'id': user.id,
         'email': user.email,
+        'type': 'access',
+        'ver': user.tokenVersion,
+        'exp': datetime.now(timezone.utc) + settings.JWT_ACCESS_EXPIRES_IN,
+        'iat': datetime.now(timezone.utc)
+    }
+    
+    return jwt.encode(payload, settings.JWT_SECRET, algorithm='HS256')
+
+
+def create_refresh_token(user):
+    """Create the refresh token that keeps user signed in for ``JWT_EXPIRES_IN``"""
+    payload = {
+        'id': user.id,
+        'type': 'refresh',
+        'ver': user.tokenVersion,
         'exp': datetime.now(timezone.utc) + settings.JWT_EXPIRES_IN,
         'iat': datetime.now(timezone.utc)
     }
@@ -65,20 +92,34 @@ def create_jwt_token(user):
     return jwt.encode(payload, settings.JWT_SECRET, algorithm='HS256')
 
 
+def decode_token(token, token_type):
+    """Verify a token of ``token_type`` ('access' or 'refresh') and return its payload"""
+    try:
+        payload = jwt.decode(token, settings.JWT_SECRET, algorithms=['HS256'])
+    except jwt.ExpiredSignatureError:
+        raise exceptions.AuthenticationFailed('Token has expired')
+    except jwt.InvalidTokenError:
+        raise exceptions.AuthenticationFailed('Invalid token')
+    
+    # Tokens issued before refresh tokens existed carry no type; they are refused
+    # rather than trusted for their whole 20-day lifetime
+    if not payload.get('id') or payload.get('type') != token_type:
+        raise exceptions.AuthenticationFailed('Invalid token')
+    # Revocations are only remembered for JWT_ACCESS_EXPIRES_IN, so an access
+    # token must not live longer than that
+    lifetime = payload.get('exp', 0) - payload.get('iat', 0)
+    if token_type == 'access' and lifetime > settings.JWT_ACCESS_EXPIRES_IN.total_seconds():
+        raise exceptions.AuthenticationFailed('Invalid token')
+    return payload
+
+
 def verify_token_and_get_user(token):
     """Verify JWT token and return user"""
+    get_revocation_list().pull()
     try:
-        payload = jwt.decode(token, settings.JWT_SECRET, algorithms=['HS256'])
-        user_id = payload.get('id')
-        
-        if not user_id:
-            return None
-        
-        try:
-            user = User.objects.get(id=user_id)
-            return user if user.active else None
-        except User.DoesNotExist:
-            return None
-            
-    except (jwt.ExpiredSignatureError, jwt.InvalidTokenError):
+        user_id = JWTAuthentication().get_user_id(token)
+    except exceptions.AuthenticationFailed:
         return None
+    
+    user = get_cached_user(user_id)
+    return user if user is not None and user.active else None
@@ -0,0 +1,179 @@
+import logging
+import math
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    # Threads hashing in parallel; bcrypt and Argon2 release the GIL, so each can keep a core busy.
+    # 0 hashes on the request thread.
+    'WORKERS': 2,
+    # Hashes waiting for a thread before new ones are turned away
+    'MAX_QUEUE': 32,
+    # Seconds between metrics log lines while the pool is in use
+    'METRICS_INTERVAL': 60.0,
+}
+
+# Recent timings kept for the metrics percentiles
+SAMPLES = 1000
+
+
+class HashingBusy(Exception):
+    """Raised when the hashing queue is full; retry after ``retry_after`` seconds"""
+
+    def __init__(self, retry_after):
+        self.retry_after = retry_after
+        super().__init__('Too many sign-ins right now. Please try again shortly.')
+
+
+class HashPool:
+    """Bounded thread pool that runs password hashing off the request threads.
+
+    At most ``WORKERS`` hashes run at once, so a burst of logins can't take
+    every core from the other endpoints; up to ``MAX_QUEUE`` more wait their
+    turn and anything beyond that fails fast with ``HashingBusy``. Queue
+    wait and hash time are recorded for ``snapshot()`` and logged every
+    ``METRICS_INTERVAL`` seconds.
+    """
+
+    def __init__(self, **options):
+        self.options = {**DEFAULTS, **options}
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pid = None
+        self._pending = 0
+        self._waits = deque(maxlen=SAMPLES)
+        self._hash_times = deque(maxlen=SAMPLES)
+        self.completed = 0
+        self.rejected = 0
+        self._logged_at = time.monotonic()
+
+    def run(self, function, *args):
+        """Call ``function(*args)`` on a pool thread and return its result"""
+        workers = self.options['WORKERS']
+        if workers <= 0:
+            return self._timed(function, args, time.perf_counter())
+
+        with self._lock:
+            if self._pending >= workers + self.options['MAX_QUEUE']:
+                self.rejected += 1
+                raise HashingBusy(self._retry_after())
+            self._pending += 1
+            executor = self._get_executor()
+
+        future = executor.submit(self._timed, function, args, time.perf_counter())
+        future.add_done_callback(self._done)
+        return future.result()
+
+    def _timed(self, function, args, submitted):
+        started = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            finished = time.perf_counter()
+            with self._lock:
+                self._waits.append(started - submitted)
+                self._hash_times.append(finished - started)
+                self.completed += 1
+            self._log_metrics()
+
+    def _done(self, future):
+        with self._lock:
+            self._pending -= 1
+
+    def _get_executor(self):
+        # Created lazily, and again in forked worker processes where the threads do not survive
+        if self._executor is None or self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.options['WORKERS'], thread_name_prefix='password-hash'
+            )
+        return self._executor
+
+    def _retry_after(self):
+        """Seconds until the current queue should have drained"""
+        average = sum(self._hash_times) / len(self._hash_times) if self._hash_times else 0.5
+        return max(1, math.ceil(self._pending * average / self.options['WORKERS']))
+
+    def snapshot(self):
+        """Pool size, queue depth, counters and recent queue wait and hash time in ms"""
+        with self._lock:
+            waits = sorted(self._waits)
+            hash_times = sorted(self._hash_times)
+            workers = self.options['WORKERS']
+            return {
+                'workers': workers,
+                'maxQueue': self.options['MAX_QUEUE'],
+                'running': min(self._pending, workers),
+                'queued': max(self._pending - workers, 0),
+                'completed': self.completed,
+                'rejected': self.rejected,
+                'queueWaitMs': _summary(waits),
+                'hashMs': _summary(hash_times),
+            }
+
+    def _log_metrics(self):
+        now = time.monotonic()
+        if now - self._logged_at < self.options['METRICS_INTERVAL']:
+            return
+        self._logged_at = now
+        metrics = self.snapshot()
+        logger.info(
+            'Password hashing: %s completed, %s rejected, %s queued; queue wait p95 %.0f ms, hash p95 %.0f ms',
+            metrics['completed'], metrics['rejected'], metrics['queued'],
+            metrics['queueWaitMs']['p95'], metrics['hashMs']['p95'],
+        )
+
+
+def _summary(samples):
+    if not samples:
+        return {'avg': 0.0, 'p95': 0.0, 'max': 0.0}
+    return {
+        'avg': round(sum(samples) / len(samples) * 1000, 1),
+        'p95': round(samples[int(0.95 * (len(samples) - 1))] * 1000, 1),
+        'max': round(samples[-1] * 1000, 1),
+    }
+
+
+_hash_pool = None
+
+
+def get_hash_pool():
+    """Return the process-wide pool configured by ``settings.PASSWORD_HASH_POOL``"""
+    global _hash_pool
+    if _hash_pool is None:
+        _hash_pool = HashPool(**getattr(settings, 'PASSWORD_HASH_POOL', {}))
+    return _hash_pool
+
+
+@receiver(setting_changed)
+def reset_hash_pool(setting, **kwargs):
+    global _hash_pool
+    if setting == 'PASSWORD_HASH_POOL':
+        _hash_pool = None
+
+
+def _verify(raw_password, encoded):
+    upgraded = []
+    # The setter runs only for a correct password whose hash is outdated
+    valid = check_password(raw_password, encoded, setter=lambda raw: upgraded.append(make_password(raw)))
+    return valid, upgraded[0] if upgraded else None
+
+
+def verify_password(raw_password, encoded):
+    """Check a password on the pool: ``(valid, new hash or None if it is current)``"""
+    return get_hash_pool().run(_verify, raw_password, encoded)
+
+
+def hash_password(raw_password):
+    """Hash a password on the pool with the preferred hasher"""
+    return get_hash_pool().run(make_password, raw_password)
@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher, BCryptSHA256PasswordHasher
+
+
+class BCryptSHA256Hasher(BCryptSHA256PasswordHasher):
+    """bcrypt over a SHA-256 digest, with the cost factor from ``PASSWORD_BCRYPT_ROUNDS``.
+
+    Each step of the cost doubles the time to hash and verify. Hashes of
+    another cost still verify and are rehashed at the next login.
+    """
+
+    @property
+    def rounds(self):
+        return settings.PASSWORD_BCRYPT_ROUNDS
+
+
+class Argon2Hasher(Argon2PasswordHasher):
+    """Argon2id with the costs from the ``PASSWORD_ARGON2_*`` settings; needs ``argon2-cffi``"""
+
+    @property
+    def time_cost(self):
+        return settings.PASSWORD_ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self):
+        return settings.PASSWORD_ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_ARGON2_PARALLELISM
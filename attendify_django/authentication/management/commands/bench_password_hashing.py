@@ -0,0 +1,61 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand
+
+from authentication.hashers import Argon2Hasher, BCryptSHA256Hasher
+
+
+class Command(BaseCommand):
+    help = 'Measure password hashes per second per core at each bcrypt and Argon2 cost'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--bcrypt-rounds', type=int, nargs='*', default=[10, 11, 12, 13], help='bcrypt costs')
+        parser.add_argument('--argon2-time-costs', type=int, nargs='*', default=[1, 2, 3], help='Argon2 time costs')
+        parser.add_argument('--argon2-memory-cost', type=int, default=102400, help='Argon2 memory cost in KiB')
+        parser.add_argument('--argon2-parallelism', type=int, default=8, help='Argon2 lanes')
+        parser.add_argument('--seconds', type=float, default=2.0, help='Minimum time spent on each cost')
+        parser.add_argument('--cores', type=int, default=os.cpu_count(), help='Cores serving logins')
+
+    def handle(self, *args, **options):
+        self.options = options
+        self.stdout.write(
+            f'One login verifies one hash; capacity assumes {options["cores"]} core(s) doing nothing else'
+        )
+        for rounds in options['bcrypt_rounds']:
+            hasher = type('Hasher', (BCryptSHA256Hasher,), {'rounds': rounds})()
+            self.measure(f'bcrypt rounds={rounds}', hasher)
+
+        for time_cost in options['argon2_time_costs']:
+            hasher = type('Hasher', (Argon2Hasher,), {
+                'time_cost': time_cost,
+                'memory_cost': options['argon2_memory_cost'],
+                'parallelism': options['argon2_parallelism'],
+            })()
+            try:
+                hasher._load_library()
+            except ValueError:
+                self.stdout.write(self.style.WARNING('argon2: argon2-cffi is not installed, skipped'))
+                break
+            self.measure(
+                f'argon2 t={time_cost} m={options["argon2_memory_cost"]} p={options["argon2_parallelism"]}',
+                hasher,
+            )
+
+    def measure(self, label, hasher):
+        # Verifying costs the same as hashing: time verifications, as logins do
+        encoded = hasher.encode('bench-password', hasher.salt())
+        count = 0
+        start = time.process_time()
+        while True:
+            hasher.verify('bench-password', encoded)
+            count += 1
+            # CPU time, so Argon2 lanes on other cores count against the rate
+            elapsed = time.process_time() - start
+            if elapsed >= self.options['seconds']:
+                break
+        per_core = count / elapsed
+        self.stdout.write(
+            f'{label}: {elapsed / count * 1000:.1f} ms CPU per hash, {per_core:.1f} hashes/s per core, '
+            f'~{per_core * self.options["cores"] * 60:,.0f} logins/min on {self.options["cores"]} core(s)'
+        )
@@ -0,0 +1,80 @@
+import hashlib
+import random
+import secrets
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Benchmark password reset token lookup against a growing number of outstanding tokens'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tokens', type=int, default=10000, help='Outstanding tokens at the largest step')
+        parser.add_argument('--steps', type=int, default=3, help='Number of measurement steps (powers of ten)')
+        parser.add_argument('--lookups', type=int, default=200, help='Lookups measured per step')
+
+    def handle(self, *args, **options):
+        total = options['tokens']
+        lookups = options['lookups']
+        sizes = sorted({max(1, total // 10 ** i) for i in range(options['steps'])})
+
+        # Everything runs inside a transaction that is rolled back at the end,
+        # so the benchmark never leaves synthetic users behind.
+        with transaction.atomic():
+            tokens = []
+            for size in sizes:
+                tokens.extend(self.seed_tokens(len(tokens), size - len(tokens)))
+                timings = self.measure(random.sample(tokens, min(lookups, len(tokens))))
+                self.stdout.write(
+                    f'{size:>8} outstanding tokens: '
+                    f'median {statistics.median(timings):.3f} ms, '
+                    f'p95 {self.percentile(timings, 95):.3f} ms, '
+                    f'max {max(timings):.3f} ms'
+                )
+            transaction.set_rollback(True)
+
+        self.stdout.write(self.style.SUCCESS('Benchmark finished, synthetic users rolled back.'))
+
+    def seed_tokens(self, offset, count):
+        """Create users with outstanding reset tokens and return the raw tokens"""
+        expires = timezone.now() + timedelta(minutes=10)
+        users = []
+        tokens = []
+        for i in range(offset, offset + count):
+            selector = secrets.token_hex(8)
+            verifier = secrets.token_hex(32)
+            users.append(User(
+                email=f'bench-reset-{i}@attendify.invalid',
+                fullName=f'Benchmark User {i}',
+                passwordResetSelector=selector,
+                passwordResetToken=hashlib.sha256(verifier.encode('utf-8')).hexdigest(),
+                passwordResetTokenExpires=expires,
+            ))
+            tokens.append(f'{selector}.{verifier}')
+        User.objects.bulk_create(users, batch_size=1000)
+        return tokens
+
+    def measure(self, tokens):
+        """Time ``User.get_by_reset_token`` for each token, in milliseconds"""
+        timings = []
+        for token in tokens:
+            start = time.perf_counter()
+            user = User.get_by_reset_token(token)
+            timings.append((time.perf_counter() - start) * 1000)
+            if user is None:
+                raise RuntimeError('Reset token lookup failed during benchmark')
+        return timings
+
+    @staticmethod
+    def percentile(values, percent):
+        ordered = sorted(values)
+        index = min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))
+        return ordered[index]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentication", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="passwordResetSelector",
+            field=models.CharField(blank=True, max_length=32, null=True, unique=True),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.4 on 2026-10-18 16:05
+
+from django.db import migrations
+from django.db.models import Value
+from django.db.models.functions import Concat, Substr
+
+PREFIX = "bcrypt$"
+
+
+def prefix_bcrypt_hashes(apps, schema_editor):
+    """Mark raw bcrypt hashes ("$2b$...") with Django's bcrypt hasher prefix"""
+    User = apps.get_model("authentication", "User")
+    User.objects.filter(password__startswith="$2").update(
+        password=Concat(Value(PREFIX), "password")
+    )
+
+
+def strip_bcrypt_prefix(apps, schema_editor):
+    # Passwords already rehashed at login stay in their new format
+    User = apps.get_model("authentication", "User")
+    User.objects.filter(password__startswith=PREFIX + "$2").update(
+        password=Substr("password", len(PREFIX) + 1)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentication", "0003_query_pattern_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(prefix_bcrypt_hashes, strip_bcrypt_prefix),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 16:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentication", "0004_prefix_bcrypt_hashes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="tokenVersion",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
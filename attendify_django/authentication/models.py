@@ -1,11 +1,15 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 from django.core.validators import validate_email
-import bcrypt
 from django.conf import settings
+from django.utils import timezone
+import hashlib
+import hmac
 import secrets
 from datetime import datetime, timedelta
 
+from .hash_pool import hash_password, verify_password
+
 
 class User(AbstractUser):
     """Custom User model based on the Node.js userType interface"""
@@ -35,13 +39,18 @@ class User(AbstractUser):
     emailVerificationCode = models.IntegerField(null=True, blank=True)
     emailVerificationCodeExpires = models.DateTimeField(null=True, blank=True)
     
-    # Password reset fields
+    # Password reset fields: the selector is a non-secret lookup key, the token
+    # holds the SHA-256 digest of the secret verifier half
+    passwordResetSelector = models.CharField(max_length=32, null=True, blank=True, unique=True)
     passwordResetToken = models.CharField(max_length=255, null=True, blank=True)
     passwordResetTokenExpires = models.DateTimeField(null=True, blank=True)
     
     # User status
     active = models.BooleanField(default=True)
     
+    # Carried in every token as "ver"; bumping it revokes all of the user's sessions
+    tokenVersion = models.PositiveIntegerField(default=0)
+    
     # Use email as the username field
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['fullName']
@@ -50,39 +59,39 @@ class User(AbstractUser):
         db_table = 'authentication_user'
         verbose_name = 'User'
         verbose_name_plural = 'Users'
+        indexes = [
+            # Lecturer approval queue and the admin change list
+            models.Index(fields=['role', 'access', '-date_joined'], name='user_role_access_idx'),
+            models.Index(fields=['-date_joined'], name='user_joined_idx'),
+        ]
     
     def __str__(self):
         return self.email
     
-    def save(self, *args, **kwargs):
-        """Override save method to hash password using bcrypt"""
-        if self.password and not self.password.startswith('$2b$'):
-            # Hash the password using bcrypt
-            salt = bcrypt.gensalt()
-            self.password = bcrypt.hashpw(self.password.encode('utf-8'), salt).decode('utf-8')
-        super().save(*args, **kwargs)
+    def set_password(self, raw_password):
+        """Hash on the bounded hashing pool; raises ``HashingBusy`` when it is saturated"""
+        self.password = hash_password(raw_password)
+        self._password = raw_password
     
     def check_password(self, raw_password):
-        """Check if the provided password matches the stored password"""
-        if not self.password:
-            return False
-        return bcrypt.checkpw(raw_password.encode('utf-8'), self.password.encode('utf-8'))
-    
-    def set_password(self, raw_password):
-        """Set password using bcrypt"""
-        if raw_password:
-            salt = bcrypt.gensalt()
-            self.password = bcrypt.hashpw(raw_password.encode('utf-8'), salt).decode('utf-8')
+        """Verify on the bounded hashing pool, saving a rehash when the hasher settings changed"""
+        valid, upgraded = verify_password(raw_password, self.password)
+        if upgraded:
+            self.password = upgraded
+            self._password = None
+            self.save(update_fields=['password'])
+        return valid
     
     def create_reset_password_token(self):
-        """Create password reset token"""
-        reset_token = secrets.token_hex(32)
-        # Hash the token before storing
-        salt = bcrypt.gensalt()
-        self.passwordResetToken = bcrypt.hashpw(reset_token.encode('utf-8'), salt).decode('utf-8')
-        self.passwordResetTokenExpires = datetime.now() + timedelta(minutes=10)
+        """Create password reset token of the form ``<selector>.<verifier>``"""
+        selector = secrets.token_hex(8)
+        verifier = secrets.token_hex(32)
+        # Only the digest of the verifier is stored; the selector is used for lookup
+        self.passwordResetSelector = selector
+        self.passwordResetToken = hashlib.sha256(verifier.encode('utf-8')).hexdigest()
+        self.passwordResetTokenExpires = timezone.now() + timedelta(minutes=10)
         self.save()
-        return reset_token
+        return f"{selector}.{verifier}"
     
     def verify_reset_token(self, token):
         """Verify password reset token"""
@@ -90,11 +99,34 @@ class User(AbstractUser):
             return False
         
         # Check if token has expired
-        if datetime.now() > self.passwordResetTokenExpires:
+        if timezone.now() > self.passwordResetTokenExpires:
+            return False
+        
+        selector, _, verifier = token.partition('.')
+        if not verifier or selector != self.passwordResetSelector:
             return False
         
-        # Verify token
-        return bcrypt.checkpw(token.encode('utf-8'), self.passwordResetToken.encode('utf-8'))
+        # Verify token in constant time
+        digest = hashlib.sha256(verifier.encode('utf-8')).hexdigest()
+        return hmac.compare_digest(digest, self.passwordResetToken)
+    
+    def clear_reset_password_token(self):
+        """Invalidate any outstanding password reset token"""
+        self.passwordResetSelector = None
+        self.passwordResetToken = None
+        self.passwordResetTokenExpires = None
+    
+    @classmethod
+    def get_by_reset_token(cls, token):
+        """Find the user owning a reset token with a single indexed lookup"""
+        selector, _, verifier = token.partition('.')
+        if not selector or not verifier:
+            return None
+        
+        user = cls.objects.filter(passwordResetSelector=selector).first()
+        if user is None or not user.verify_reset_token(token):
+            return None
+        return user
     
     def generate_email_verification_code(self):
         """Generate email verification code"""
@@ -0,0 +1,22 @@
+from utils.query_audit import canonical_query
+from .models import User
+
+
+@canonical_query('authentication.login')
+def login():
+    return User.objects.filter(email='user@example.com')
+
+
+@canonical_query('authentication.reset_selector')
+def reset_selector():
+    return User.objects.filter(passwordResetSelector='0123456789abcdef')
+
+
+@canonical_query('authentication.lecturers_by_access')
+def lecturers_by_access():
+    return User.objects.filter(role='lecturer', access='pending').order_by('-date_joined')
+
+
+@canonical_query('authentication.admin_recent')
+def admin_recent():
+    return User.objects.order_by('-date_joined')[:100]
@@ -0,0 +1,112 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+DEFAULTS = {
+    # Django cache carrying revocations to the other worker processes
+    'CACHE_ALIAS': 'default',
+    # Seconds between pulls of the shared list; a revocation reaches every process within this
+    'SYNC_INTERVAL': 5.0,
+}
+
+CACHE_KEY = 'auth:revocations'
+
+
+class RevocationList:
+    """Lowest token version still accepted per user, held in process and synced through a cache.
+
+    Revoking a user's sessions bumps ``User.tokenVersion``. Refresh compares
+    the token's ``ver`` claim with the database; access tokens are checked
+    here with a dict lookup, so the request path never reads the ``User``
+    table. An entry only has to outlive the access tokens issued before it,
+    so the list stays as small as the revocations of the last
+    ``JWT_ACCESS_EXPIRES_IN``.
+
+    Two processes revoking at the same instant may overwrite each other in
+    the shared list; the revocation still holds in the process that made it
+    and on refresh, so such a token lives at most until its expiry.
+    """
+
+    def __init__(self, **options):
+        self.options = {**DEFAULTS, **options}
+        # user id -> (lowest accepted version, unix time the entry can be dropped)
+        self._versions = {}
+        self._lock = threading.Lock()
+        self._pulled_at = None
+
+    @property
+    def cache(self):
+        return caches[self.options['CACHE_ALIAS']]
+
+    def is_revoked(self, user_id, version):
+        entry = self._versions.get(user_id)
+        return entry is not None and version < entry[0]
+
+    def revoke(self, versions):
+        """Reject tokens older than ``versions[user_id]`` for each user, here and in the shared list"""
+        lifetime = settings.JWT_ACCESS_EXPIRES_IN.total_seconds()
+        expires = time.time() + lifetime
+        entries = {user_id: (version, expires) for user_id, version in versions.items()}
+        self._merge(entries)
+        shared = _merged(self.cache.get(CACHE_KEY) or {}, entries)
+        self.cache.set(CACHE_KEY, shared, lifetime)
+
+    def pull(self):
+        """Merge in revocations made by other processes, at most once per ``SYNC_INTERVAL``"""
+        if self._claim_pull():
+            self._merge(self.cache.get(CACHE_KEY) or {})
+
+    async def apull(self):
+        if self._claim_pull():
+            self._merge(await self.cache.aget(CACHE_KEY) or {})
+
+    def _claim_pull(self):
+        # One thread pulls; the others keep checking against the current list meanwhile
+        now = time.monotonic()
+        with self._lock:
+            if self._pulled_at is not None and now - self._pulled_at < self.options['SYNC_INTERVAL']:
+                return False
+            self._pulled_at = now
+            return True
+
+    def _merge(self, entries):
+        with self._lock:
+            # Swapped in whole so lookups never see a dict being resized
+            self._versions = _merged(self._versions, entries)
+
+
+def _merged(current, entries):
+    """Union of two revocation maps keeping the higher version, without expired entries"""
+    now = time.time()
+    merged = {user_id: entry for user_id, entry in current.items() if entry[1] > now}
+    for user_id, (version, expires) in entries.items():
+        if expires <= now:
+            continue
+        existing = merged.get(user_id)
+        if existing is None or existing[0] < version:
+            merged[user_id] = (version, expires)
+        elif existing[0] == version:
+            merged[user_id] = (version, max(existing[1], expires))
+    return merged
+
+
+_revocation_list = None
+
+
+def get_revocation_list():
+    """Return the process-wide list configured by ``settings.TOKEN_REVOCATION``"""
+    global _revocation_list
+    if _revocation_list is None:
+        _revocation_list = RevocationList(**getattr(settings, 'TOKEN_REVOCATION', {}))
+    return _revocation_list
+
+
+@receiver(setting_changed)
+def reset_revocation_list(setting, **kwargs):
+    global _revocation_list
+    if setting == 'TOKEN_REVOCATION':
+        _revocation_list = None
@@ -41,7 +41,10 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         """Create new user"""
         validated_data.pop('confirmPassword')  # Remove confirmPassword
-        user = User.objects.create(**validated_data)
+        password = validated_data.pop('password')
+        user = User(**validated_data)
+        user.set_password(password)
+        user.save()
         return user
 
 
@@ -134,3 +137,14 @@ class EmailVerificationSerializer(serializers.Serializer):
     """Serializer for email verification"""
     
     code = serializers.IntegerField()
+
+
+class BulkAccessSerializer(serializers.Serializer):
+    """Serializer for approving or denying many lecturers at once"""
+    
+    userIds = serializers.ListField(
+        child=serializers.IntegerField(),
+        allow_empty=False,
+        max_length=5000
+    )
+    access = serializers.ChoiceField(choices=['approved', 'denied'])
@@ -0,0 +1,92 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F
+
+from activities.models import Activity
+from utils.email_utils import send_access_emails
+from .revocation import get_revocation_list
+from .user_cache import invalidate_users
+
+User = get_user_model()
+
+# Access decisions and the activity recorded for each
+ACCESS_ACTIVITIES = {
+    'approved': 'user_approved',
+    'denied': 'user_denied',
+}
+
+
+def set_users_access(user_ids, access, actor=None, notify=True):
+    """Approve or deny many lecturer accounts at once.
+
+    Users already holding ``access`` are skipped, so repeating a request is a
+    no-op. The change is one ``UPDATE``, the matching ``Activity`` rows one
+    insert, and the notification emails are sent together over a single mail
+    connection (or queued in one insert), so the round-trips do not grow
+    with the batch. Returns the list of users whose access changed.
+    """
+    if access not in ACCESS_ACTIVITIES:
+        raise ValueError(f'Invalid access "{access}"')
+
+    with transaction.atomic():
+        users = list(
+            User.objects.select_for_update()
+            .filter(id__in=set(user_ids), role='lecturer')
+            .exclude(access=access)
+            .only('id', 'email', 'fullName', 'access')
+        )
+        if not users:
+            return []
+
+        changed_ids = [user.id for user in users]
+        User.objects.filter(id__in=changed_ids).update(access=access)
+        # QuerySet.update() sends no signals, so drop cached users explicitly
+        invalidate_users(changed_ids)
+
+        activity_type = ACCESS_ACTIVITIES[access]
+        Activity.objects.bulk_create([
+            Activity(
+                user_id=actor.pk if actor is not None else None,
+                activity_type=activity_type,
+                description=f"{user.fullName} ({user.email}) {access}",
+                metadata={'userId': user.id, 'email': user.email, 'previousAccess': user.access},
+            )
+            for user in users
+        ])
+
+        for user in users:
+            user.access = access
+        if notify:
+            # Only notify once the decision is committed
+            transaction.on_commit(lambda: send_access_emails(users, access))
+
+    return users
+
+
+def revoke_sessions(user_ids, actor=None):
+    """Sign users out everywhere by invalidating every token issued to them so far.
+
+    ``tokenVersion`` is bumped in one ``UPDATE``: refresh tokens are checked
+    against it, and the new versions go to the revocation list so existing
+    access tokens are rejected on the next request without a query.
+    Returns the new version of each user.
+    """
+    user_ids = set(user_ids)
+    with transaction.atomic():
+        User.objects.filter(id__in=user_ids).update(tokenVersion=F('tokenVersion') + 1)
+        versions = dict(User.objects.filter(id__in=user_ids).values_list('id', 'tokenVersion'))
+        if not versions:
+            return {}
+
+        Activity.objects.bulk_create([
+            Activity(
+                user_id=user_id,
+                activity_type='sessions_revoked',
+                description="All sessions revoked",
+                metadata={'revokedBy': actor.pk if actor is not None else None},
+            )
+            for user_id in versions
+        ])
+        transaction.on_commit(lambda: get_revocation_list().revoke(versions))
+
+    return versions
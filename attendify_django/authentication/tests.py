@@ -1,3 +1,648 @@
-from django.test import TestCase
+import datetime
+import threading
+import time
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+import bcrypt
+import jwt
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core import mail
+from django.core.cache import cache
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import AsyncRequestFactory, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+
+from activities.models import Activity
+from utils.async_views import async_api_view
+
+from .authentication import create_jwt_token, create_refresh_token
+from .hash_pool import HashingBusy, get_hash_pool
+from .revocation import get_revocation_list
+from .throttling import DjangoCacheWindowStore, _window_wait
+from .models import User
+from .user_cache import get_cached_user, get_user_cache
+from .services import revoke_sessions, set_users_access
+
+PASSWORD = 'correct-horse-battery'
+
+
+@override_settings(
+    PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'],
+    ACTIVITY_LOG={'ALWAYS_FLUSH': True},
+)
+class AuthTestCase(TestCase):
+
+    def setUp(self):
+        # Fresh revocation list and throttle counters for every test
+        cache.clear()
+        self.enterContext(self.settings(TOKEN_REVOCATION={'SYNC_INTERVAL': 0}, AUTH_THROTTLE={}))
+        self.user = User(email='lecturer@example.com', fullName='Ada Lecturer', access='approved')
+        self.user.set_password(PASSWORD)
+        self.user.save()
+
+    def login(self, client=None):
+        client = client or APIClient()
+        response = client.post(
+            '/api/v1/auth/login/', {'email': self.user.email, 'password': PASSWORD}, format='json'
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        return client
+
+    def bearer(self, token):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        return client
+
+    def revoke(self, client):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.post('/api/v1/auth/sessions/revoke/')
+        self.assertEqual(response.status_code, 200, response.content)
+
+
+class TokenTests(AuthTestCase):
+
+    def test_login_sets_access_and_refresh_cookies(self):
+        client = self.login()
+
+        access, refresh = client.cookies['jwt'], client.cookies[settings.JWT_REFRESH_COOKIE]
+        self.assertEqual(int(access['max-age']), settings.JWT_ACCESS_EXPIRES_IN.total_seconds())
+        self.assertEqual(int(refresh['max-age']), settings.JWT_EXPIRES_IN.total_seconds())
+        self.assertEqual(refresh['path'], settings.JWT_REFRESH_COOKIE_PATH)
+        self.assertEqual(client.get('/api/v1/auth/me/').status_code, 200)
+
+    def test_refresh_token_is_not_an_access_token(self):
+        response = self.bearer(create_refresh_token(self.user)).get('/api/v1/auth/me/')
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_access_token_cannot_refresh(self):
+        client = APIClient()
+        client.cookies[settings.JWT_REFRESH_COOKIE] = create_jwt_token(self.user)
+
+        self.assertEqual(client.post('/api/v1/auth/refresh/').status_code, 401)
+
+    def test_refresh_issues_access_token(self):
+        client = self.login()
+        del client.cookies['jwt']
+
+        response = client.post('/api/v1/auth/refresh/')
+
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertIn('jwt', response.cookies)
+        self.assertEqual(client.get('/api/v1/auth/me/').status_code, 200)
+
+    def test_expired_access_token_is_rejected(self):
+        token = jwt.encode(
+            {
+                'id': self.user.id, 'type': 'access', 'ver': 0,
+                'exp': datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(seconds=1),
+            },
+            settings.JWT_SECRET, algorithm='HS256',
+        )
+
+        self.assertEqual(self.bearer(token).get('/api/v1/auth/me/').status_code, 403)
+
+
+class RevocationTests(AuthTestCase):
+
+    def test_revoked_access_token_is_rejected(self):
+        client, other_device = self.login(), self.login()
+
+        self.revoke(client)
+
+        response = other_device.get('/api/v1/auth/me/')
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.json()['detail'], 'Token has been revoked')
+
+    def test_refresh_rejects_bumped_token_version(self):
+        other_device = self.login()
+        with self.captureOnCommitCallbacks(execute=True):
+            revoke_sessions([self.user.id])
+
+        response = other_device.post('/api/v1/auth/refresh/')
+
+        self.assertEqual(response.status_code, 401)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.tokenVersion, 1)
+
+    def test_tokens_without_type_are_rejected(self):
+        # Issued before access and refresh tokens were split, valid for 20 days
+        legacy = jwt.encode(
+            {'id': self.user.id, 'exp': datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(days=20)},
+            settings.JWT_SECRET, algorithm='HS256',
+        )
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {legacy}')
+
+        self.assertEqual(client.get('/api/v1/auth/me/').status_code, 403)
+
+    def test_revoked_token_stays_rejected_after_revocation_entry_expires(self):
+        now = datetime.datetime.now(datetime.timezone.utc)
+        # An access token outliving JWT_ACCESS_EXPIRES_IN, e.g. issued under a longer setting
+        long_lived = jwt.encode(
+            {'id': self.user.id, 'type': 'access', 'ver': 0, 'iat': now, 'exp': now + datetime.timedelta(days=1)},
+            settings.JWT_SECRET, algorithm='HS256',
+        )
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {long_lived}')
+        with self.captureOnCommitCallbacks(execute=True):
+            revoke_sessions([self.user.id])
+
+        later = time.time() + settings.JWT_ACCESS_EXPIRES_IN.total_seconds() + 60
+        clock = SimpleNamespace(time=lambda: later, monotonic=time.monotonic)
+        with mock.patch('authentication.revocation.time', clock):
+            response = client.get('/api/v1/auth/me/')
+        # The entry has expired and was dropped by the pull; the token's lifetime rejects it
+        self.assertFalse(get_revocation_list().is_revoked(self.user.id, 0))
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.json()['detail'], 'Invalid token')
+
+    def test_login_works_with_revoked_cookie(self):
+        client, other_device = self.login(), self.login()
+        self.revoke(client)
+
+        # The other device still sends its revoked jwt cookie
+        self.login(other_device)
+
+        self.assertEqual(other_device.get('/api/v1/auth/me/').status_code, 200)
+
+    def test_only_admins_revoke_other_users(self):
+        admin = User.objects.create(email='admin@example.com', fullName='Admin', role='admin', access='approved')
+        client = self.login()
+
+        response = client.post('/api/v1/auth/sessions/revoke/', {'userId': admin.id}, format='json')
+
+        self.assertEqual(response.status_code, 403)
+        admin.refresh_from_db()
+        self.assertEqual(admin.tokenVersion, 0)
+
+
+class ThrottleTests(AuthTestCase):
+
+    def test_login_flood_is_rejected_before_hashing(self):
+        client = APIClient()
+        hashed = get_hash_pool().snapshot()['completed']
+        statuses = []
+        for _ in range(8):
+            response = client.post(
+                '/api/v1/auth/login/', {'email': self.user.email, 'password': 'wrong'}, format='json'
+            )
+            statuses.append(response.status_code)
+        hashed = get_hash_pool().snapshot()['completed'] - hashed
+
+        self.assertEqual(statuses, [400] * 5 + [429] * 3)
+        self.assertIn('Retry-After', response)
+        # Only the five admitted attempts were verified
+        self.assertEqual(hashed, 5)
+
+    def flood_with_rotating_forwarded_for(self):
+        client = APIClient()
+        statuses = []
+        for number in range(31):
+            # Unknown accounts, so only the per-IP limit (30/min) can apply
+            response = client.post(
+                '/api/v1/auth/login/', {'email': f'user{number}@example.com', 'password': 'wrong'},
+                format='json', HTTP_X_FORWARDED_FOR=f'203.0.113.{number}',
+            )
+            statuses.append(response.status_code)
+        return statuses
+
+    def test_spoofed_forwarded_for_is_still_throttled(self):
+        self.assertEqual(self.flood_with_rotating_forwarded_for(), [400] * 30 + [429])
+
+    def test_forwarded_for_is_trusted_behind_configured_proxies(self):
+        with self.settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'NUM_PROXIES': 1}):
+            self.assertEqual(self.flood_with_rotating_forwarded_for(), [400] * 31)
+
+
+class PasswordResetTokenTests(AuthTestCase):
+
+    def reset(self, token, password='new-horse-battery'):
+        with self.captureOnCommitCallbacks(execute=True):
+            return APIClient().patch('/api/v1/auth/reset-password/', {
+                'token': token, 'newPassword': password, 'confirmNewPassword': password,
+            }, format='json')
+
+    def test_token_is_found_by_selector_and_stored_as_digest(self):
+        token = self.user.create_reset_password_token()
+        selector, verifier = token.split('.')
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.passwordResetSelector, selector)
+        self.assertNotIn(verifier, self.user.passwordResetToken)
+        with self.assertNumQueries(1):
+            self.assertEqual(User.get_by_reset_token(token), self.user)
+
+    def test_wrong_verifier_or_selector_is_rejected(self):
+        token = self.user.create_reset_password_token()
+        selector, verifier = token.split('.')
+        other_selector = 'f' * 16 if selector != 'f' * 16 else 'e' * 16
+
+        for candidate in [
+            f'{selector}.{"0" * 64}', f'{selector}.{verifier[:-1]}', f'{other_selector}.{verifier}',
+            selector, f'{selector}.', f'.{verifier}', '',
+        ]:
+            with self.subTest(candidate=candidate):
+                self.assertIsNone(User.get_by_reset_token(candidate))
+
+    def test_expired_token_is_rejected(self):
+        token = self.user.create_reset_password_token()
+        User.objects.filter(pk=self.user.pk).update(
+            passwordResetTokenExpires=timezone.now() - datetime.timedelta(seconds=1)
+        )
+
+        self.assertIsNone(User.get_by_reset_token(token))
+        self.assertEqual(self.reset(token).status_code, 400)
+
+    def test_reset_changes_password_once(self):
+        token = self.user.create_reset_password_token()
+
+        self.assertEqual(self.reset(token).status_code, 200)
+
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password('new-horse-battery'))
+        self.assertIsNone(self.user.passwordResetSelector)
+        # The token is single-use
+        response = self.reset(token, 'third-horse-battery')
+        self.assertEqual((response.status_code, response.json()['message']), (400, 'Invalid or expired reset token'))
+
+
+class UserCacheTests(AuthTestCase):
+    """Runs against the per-process LRU; the subclass below repeats it on Django's cache"""
+
+    def setUp(self):
+        super().setUp()
+        get_user_cache().clear()
+
+    def courses(self):
+        client = APIClient()
+        client.cookies['jwt'] = create_jwt_token(self.user)
+        return client.get('/api/v1/courses/').status_code
+
+    def test_user_is_served_from_cache(self):
+        get_cached_user(self.user.pk)
+
+        with self.assertNumQueries(0):
+            user = get_cached_user(self.user.pk)
+        self.assertEqual((user.pk, user.role, user.access, user.active), (self.user.pk, 'lecturer', 'approved', True))
+
+    def test_save_invalidates(self):
+        self.assertEqual(self.courses(), 200)
+
+        self.user.access = 'denied'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+
+        self.assertIsNone(get_user_cache().get(self.user.pk))
+        self.assertEqual(get_cached_user(self.user.pk).access, 'denied')
+        self.assertEqual(self.courses(), 403)
+
+    def test_bulk_access_change_invalidates(self):
+        self.assertEqual(self.courses(), 200)
+        stale = get_user_cache().get(self.user.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            set_users_access([self.user.pk], 'denied', notify=False)
+            # A request that re-cached the old row before the commit
+            get_user_cache().set(self.user.pk, stale)
+
+        self.assertIsNone(get_user_cache().get(self.user.pk))
+        self.assertEqual(self.courses(), 403)
+
+
+@override_settings(AUTH_USER_CACHE={'BACKEND': 'authentication.user_cache.DjangoCacheUserCache'})
+class DjangoCacheUserCacheTests(UserCacheTests):
+    pass
+
+
+@override_settings(EMAIL_QUEUE_ENABLED=False)
+class BulkAccessTests(AuthTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.admin = User.objects.create(
+            email='admin@example.com', fullName='Grace Admin', role='admin', access='approved'
+        )
+        self.pending = [
+            User.objects.create(email=f'pending{number}@example.com', fullName=f'Pending {number}')
+            for number in range(2)
+        ]
+
+    def update(self, user_ids, access='approved', actor=None):
+        client = APIClient()
+        client.force_authenticate(actor or self.admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            return client.patch('/api/v1/auth/users/access/', {'userIds': user_ids, 'access': access}, format='json')
+
+    def test_skips_users_already_holding_access_and_non_lecturers(self):
+        first, second = (user.pk for user in self.pending)
+        missing = User.objects.order_by('-pk').first().pk + 1
+
+        response = self.update([first, self.user.pk, self.admin.pk, missing, second, first])
+
+        self.assertEqual(response.status_code, 200, response.content)
+        data = response.json()['data']
+        self.assertEqual(sorted(data['updated']), [first, second])
+        # In request order, without repeats
+        self.assertEqual(data['skipped'], [self.user.pk, self.admin.pk, missing])
+        self.assertEqual(
+            dict(User.objects.filter(pk__in=[first, second, self.admin.pk]).values_list('pk', 'access')),
+            {first: 'approved', second: 'approved', self.admin.pk: 'approved'},
+        )
+        self.assertEqual(
+            sorted(message.to[0] for message in mail.outbox), ['pending0@example.com', 'pending1@example.com']
+        )
+
+    def test_activities_are_attributed_to_the_actor(self):
+        self.update([user.pk for user in self.pending], 'denied')
+
+        activities = Activity.objects.filter(activity_type='user_denied').order_by('metadata__userId')
+        self.assertEqual(
+            [
+                (activity.user_id, activity.metadata['userId'], activity.metadata['previousAccess'])
+                for activity in activities
+            ],
+            [(self.admin.pk, user.pk, 'pending') for user in self.pending],
+        )
+        self.assertEqual(activities[0].description, 'Pending 0 (pending0@example.com) denied')
+
+    def test_repeating_a_decision_changes_nothing(self):
+        user_ids = [user.pk for user in self.pending]
+        self.update(user_ids)
+
+        response = self.update(user_ids)
+
+        self.assertEqual(response.json()['data'], {'access': 'approved', 'updated': [], 'skipped': user_ids})
+        self.assertEqual(Activity.objects.filter(activity_type='user_approved').count(), 2)
+        self.assertEqual(len(mail.outbox), 2)
+
+    def test_requires_admin(self):
+        response = self.update([self.pending[0].pk], actor=self.user)
+
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(User.objects.get(pk=self.pending[0].pk).access, 'pending')
+
+
+@async_api_view(['POST'], authenticated=False)
+async def echo_data(request):
+    # Form bodies arrive as a QueryDict
+    data = request.data.dict() if hasattr(request.data, 'dict') else request.data
+    return Response({'type': type(request.data).__name__, 'data': data})
+
+
+class AsyncApiViewTests(AuthTestCase):
+
+    def test_invalid_or_missing_credentials_are_rejected(self):
+        inactive = User.objects.create(email='inactive@example.com', fullName='Inactive', active=False)
+        for label, client, detail in [
+            ('missing', APIClient(), 'Authentication credentials were not provided.'),
+            ('malformed', self.bearer('not-a-token'), None),
+            ('refresh token', self.bearer(create_refresh_token(self.user)), None),
+            ('inactive user', self.bearer(create_jwt_token(inactive)), 'User account is deactivated'),
+        ]:
+            with self.subTest(label):
+                response = client.get('/api/v1/auth/me/')
+                self.assertEqual(response.status_code, 403)
+                self.assertIn('detail', response.json())
+                if detail:
+                    self.assertEqual(response.json()['detail'], detail)
+
+    def test_token_in_cookie_or_header_authenticates(self):
+        cookie = APIClient()
+        cookie.cookies['jwt'] = create_jwt_token(self.user)
+
+        for client in (cookie, self.bearer(create_jwt_token(self.user))):
+            response = client.get('/api/v1/auth/me/')
+            self.assertEqual(response.status_code, 200, response.content)
+            self.assertEqual(response.json()['data']['email'], self.user.email)
+
+    def test_admin_session_is_accepted_on_safe_methods_only(self):
+        admin = User.objects.create(
+            email='admin@example.com', fullName='Admin', role='admin', access='approved', is_staff=True
+        )
+        client = APIClient()
+        client.force_login(admin)
+
+        self.assertEqual(client.get('/api/v1/auth/me/').json()['data']['email'], admin.email)
+        # No CSRF check is made, so a session cannot write
+        response = client.post('/api/v1/attendance/bulk/', {}, format='json')
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.json()['detail'], 'Authentication credentials were not provided.')
+
+    def test_unlisted_method_is_not_allowed(self):
+        response = self.bearer(create_jwt_token(self.user)).post('/api/v1/auth/me/')
+
+        self.assertEqual(response.status_code, 405)
+        self.assertEqual(response['Allow'], 'GET')
+
+    def test_request_data_is_parsed_from_json_or_form(self):
+        factory = AsyncRequestFactory()
+        for label, request, expected in [
+            ('json', factory.post('/', {'name': 'Ada', 'level': 400}, content_type='application/json'),
+             {'name': 'Ada', 'level': 400}),
+            ('empty json', factory.post('/', '', content_type='application/json'), {}),
+            ('urlencoded', factory.post('/', 'name=Ada&level=400', content_type='application/x-www-form-urlencoded'),
+             {'name': 'Ada', 'level': '400'}),
+            ('multipart', factory.post('/', {'name': 'Ada', 'level': '400'}), {'name': 'Ada', 'level': '400'}),
+            ('other', factory.post('/', 'name=Ada', content_type='text/plain'), {}),
+        ]:
+            with self.subTest(label):
+                response = async_to_sync(echo_data)(request)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.data['data'], expected)
+
+        response = async_to_sync(echo_data)(factory.post('/', '{"name": ', content_type='application/json'))
+        self.assertEqual(response.status_code, 400)
+        self.assertTrue(response.data['detail'].startswith('JSON parse error'))
+
+
+class HashPoolTests(AuthTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.enterContext(self.settings(PASSWORD_HASH_POOL={'WORKERS': 1, 'MAX_QUEUE': 0}))
+        self.pool = get_hash_pool()
+        # Hold the only worker until the test lets go
+        started, self.release = threading.Event(), threading.Event()
+
+        def hold():
+            started.set()
+            self.release.wait(10)
+
+        holder = threading.Thread(target=self.pool.run, args=(hold,))
+        holder.start()
+        self.addCleanup(holder.join)
+        self.addCleanup(self.release.set)
+        self.assertTrue(started.wait(10))
+
+    def test_saturated_pool_fails_fast(self):
+        with self.assertRaises(HashingBusy) as raised:
+            self.pool.run(str.upper, 'password')
+
+        self.assertGreaterEqual(raised.exception.retry_after, 1)
+        snapshot = self.pool.snapshot()
+        self.assertEqual((snapshot['running'], snapshot['queued'], snapshot['rejected']), (1, 0, 1))
+
+    def test_login_gets_503_with_retry_after(self):
+        response = APIClient().post(
+            '/api/v1/auth/login/', {'email': self.user.email, 'password': PASSWORD}, format='json'
+        )
+
+        self.assertEqual(response.status_code, 503)
+        self.assertGreaterEqual(int(response['Retry-After']), 1)
+        self.assertEqual(response.json()['message'], 'Too many sign-ins right now. Please try again shortly.')
+        self.assertEqual(self.pool.snapshot()['rejected'], 1)
+
+    def test_pool_accepts_work_again_once_drained(self):
+        self.release.set()
+        deadline = time.monotonic() + 10
+        while self.pool.snapshot()['running'] and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        self.assertEqual(self.pool.run(str.upper, 'password'), 'PASSWORD')
+        self.assertEqual(self.pool.snapshot()['rejected'], 0)
+
+
+class SlidingWindowTests(TestCase):
+
+    def test_window_wait(self):
+        # (previous, current, elapsed) in a 60 s window of 5 requests -> seconds to wait
+        cases = [
+            ((0, 0, 0), 0),
+            ((0, 4, 59), 0),
+            # Half the previous window still counts: 10 * 0.5 + 0 + 1 > 5
+            ((10, 0, 30), 6),
+            # Full on its own: the next window, then 12 s until 4 of the 5 slide out
+            ((0, 5, 15), 57),
+            ((5, 5, 0), 60 + 12),
+        ]
+        for args, expected in cases:
+            with self.subTest(args=args):
+                self.assertAlmostEqual(_window_wait(*args, num_requests=5, duration=60), expected)
+
+    def test_window_wait_is_exactly_long_enough(self):
+        def fits(previous, current, elapsed):
+            if elapsed >= 60:
+                previous, current, elapsed = current, 0, elapsed - 60
+            return previous * (1 - elapsed / 60) + current + 1 <= 5 + 1e-9
+
+        for previous in range(0, 12):
+            for current in range(0, 6):
+                for elapsed in range(0, 60, 7):
+                    wait = _window_wait(previous, current, elapsed, 5, 60)
+                    with self.subTest(previous=previous, current=current, elapsed=elapsed):
+                        self.assertTrue(fits(previous, current, elapsed + wait))
+                        if wait > 1e-6:
+                            self.assertFalse(fits(previous, current, elapsed + wait - 1e-3))
+
+
+class DjangoCacheWindowStoreTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.now = 600.0
+        clock = SimpleNamespace(time=lambda: self.now)
+        patcher = mock.patch('authentication.throttling.time', clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_limit_is_shared_between_stores(self):
+        workers = [DjangoCacheWindowStore(), DjangoCacheWindowStore()]
+
+        waits = [workers[n % 2].hit('key', 5, 60) for n in range(6)]
+
+        self.assertEqual(waits[:5], [0] * 5)
+        self.assertAlmostEqual(waits[5], 60 + 12)
+        self.assertEqual(workers[0].hit('other', 5, 60), 0)
+
+    def test_window_slides(self):
+        store = DjangoCacheWindowStore()
+        for _ in range(5):
+            store.hit('key', 5, 60)
+
+        # 30 s into the next window half of the previous count remains
+        self.now += 90
+        waits = [store.hit('key', 5, 60) for _ in range(3)]
+        self.assertEqual(waits[:2], [0, 0])
+        self.assertGreater(waits[2], 0)
+
+        # Two windows later nothing remains
+        self.now += 120
+        self.assertEqual(store.hit('key', 5, 60), 0)
+
+    def test_counter_evicted_between_add_and_incr(self):
+        store = DjangoCacheWindowStore()
+        with mock.patch.object(store.cache, 'incr', side_effect=ValueError):
+            self.assertEqual(store.hit('key', 5, 60), 0)
+
+        self.assertEqual(store.cache.get('throttle:key:10'), 1)
+
+
+@override_settings(
+    PASSWORD_HASHERS=[
+        'authentication.hashers.BCryptSHA256Hasher', 'django.contrib.auth.hashers.BCryptPasswordHasher',
+    ],
+    PASSWORD_BCRYPT_ROUNDS=4,
+)
+class LegacyBcryptTests(TransactionTestCase):
+    """Raw bcrypt hashes from the Node.js backend (0004_prefix_bcrypt_hashes)"""
+
+    BEFORE = [('authentication', '0003_query_pattern_indexes')]
+
+    def setUp(self):
+        self.migrate(self.BEFORE)
+        self.addCleanup(self.migrate, None)
+        HistoricalUser = self.applied_apps().get_model('authentication', 'User')
+        # What bcryptjs stored: no algorithm prefix
+        self.legacy = bcrypt.hashpw(PASSWORD.encode(), bcrypt.gensalt(4)).decode()
+        self.user_id = HistoricalUser.objects.create(
+            email='lecturer@example.com', fullName='Ada Lecturer', password=self.legacy
+        ).pk
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.migrate(targets or executor.loader.graph.leaf_nodes())
+
+    def applied_apps(self):
+        loader = MigrationExecutor(connection).loader
+        return loader.project_state(list(loader.applied_migrations)).apps
+
+    def test_prefixed_hash_still_verifies(self):
+        self.migrate(None)
+
+        user = User.objects.get(pk=self.user_id)
+        self.assertEqual(user.password, f'bcrypt${self.legacy}')
+        self.assertTrue(user.check_password(PASSWORD))
+
+    def test_successful_login_rehashes_with_preferred_hasher(self):
+        self.migrate(None)
+
+        self.assertTrue(User.objects.get(pk=self.user_id).check_password(PASSWORD))
+
+        user = User.objects.get(pk=self.user_id)
+        self.assertTrue(user.password.startswith('bcrypt_sha256$'))
+        self.assertTrue(user.check_password(PASSWORD))
+
+    def test_failed_login_leaves_hash_unchanged(self):
+        self.migrate(None)
+
+        self.assertFalse(User.objects.get(pk=self.user_id).check_password('wrong password'))
+
+        self.assertEqual(User.objects.get(pk=self.user_id).password, f'bcrypt${self.legacy}')
+
+    def test_backwards_strips_prefix_from_hashes_not_yet_rehashed(self):
+        self.migrate(None)
+        rehashed = User.objects.create(email='admin@example.com', fullName='Admin')
+        rehashed.set_password(PASSWORD)
+        rehashed.save()
+
+        self.migrate(self.BEFORE)
+
+        passwords = dict(self.applied_apps().get_model('authentication', 'User').objects.values_list('pk', 'password'))
+        self.assertEqual(passwords[self.user_id], self.legacy)
+        self.assertTrue(passwords[rehashed.pk].startswith('bcrypt_sha256$'))
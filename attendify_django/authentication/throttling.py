@@ -0,0 +1,182 @@
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+from rest_framework.throttling import SimpleRateThrottle
+
+
+def _window_wait(previous, current, elapsed, num_requests, duration):
+    """Seconds until a request fits the sliding window, or 0 when it fits now.
+
+    The window is estimated from two fixed-window counters: the previous
+    window's count weighted by the share of it still inside the sliding
+    window, plus the current window's count.
+    """
+    fraction = elapsed / duration
+    if previous * (1 - fraction) + current + 1 <= num_requests:
+        return 0
+    if current + 1 <= num_requests:
+        # Wait for enough of the previous window to slide out
+        return (1 - (num_requests - current - 1) / previous - fraction) * duration
+    # Full on its own: wait for the next window, then for this one to slide out
+    return (1 - fraction) * duration + max(0, 1 - (num_requests - 1) / current) * duration
+
+
+class LocMemWindowStore:
+    """Sliding-window counters in a bounded LRU dict, local to the current process.
+
+    Each key holds two counters, so memory per key is constant and the
+    total is capped at ``max_entries`` keys. Limits apply per worker
+    process; use ``DjangoCacheWindowStore`` to share them.
+    """
+
+    def __init__(self, max_entries=100000, **options):
+        self.max_entries = max_entries
+        # key -> (window index, previous window count, current window count)
+        self._windows = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key, num_requests, duration):
+        """Count a request against ``key``; returns 0, or the seconds to wait if it is over the limit"""
+        now = time.time()
+        index, elapsed = divmod(now, duration)
+        with self._lock:
+            window, previous, current = self._windows.get(key, (index, 0, 0))
+            if window != index:
+                previous = current if window == index - 1 else 0
+                current = 0
+            wait = _window_wait(previous, current, elapsed, num_requests, duration)
+            if not wait:
+                current += 1
+            self._windows[key] = (index, previous, current)
+            self._windows.move_to_end(key)
+            while len(self._windows) > self.max_entries:
+                self._windows.popitem(last=False)
+        return wait
+
+    def clear(self):
+        with self._lock:
+            self._windows.clear()
+
+
+class DjangoCacheWindowStore:
+    """Sliding-window counters in one of Django's configured caches, shared by all workers.
+
+    A key is two counters, one per fixed window, incremented atomically by
+    the cache and expiring on their own. Concurrent requests may overshoot
+    the limit by the few that read the counters at the same moment.
+    """
+
+    def __init__(self, cache_alias='default', key_prefix='throttle', **options):
+        self.cache_alias = cache_alias
+        self.key_prefix = key_prefix
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def hit(self, key, num_requests, duration):
+        index, elapsed = divmod(time.time(), duration)
+        previous_key = f'{self.key_prefix}:{key}:{int(index) - 1}'
+        current_key = f'{self.key_prefix}:{key}:{int(index)}'
+        counts = self.cache.get_many([previous_key, current_key])
+        wait = _window_wait(
+            counts.get(previous_key, 0), counts.get(current_key, 0), elapsed, num_requests, duration
+        )
+        if not wait:
+            # Kept for the next window too, where it becomes the previous count
+            self.cache.add(current_key, 0, 2 * duration)
+            try:
+                self.cache.incr(current_key)
+            except ValueError:
+                # Evicted since the add
+                self.cache.set(current_key, 1, 2 * duration)
+        return wait
+
+    def clear(self):
+        # Counters expire on their own; never flush a cache other code may share
+        pass
+
+
+_window_store = None
+
+
+def get_window_store():
+    """Return the counter store configured by ``settings.AUTH_THROTTLE``"""
+    global _window_store
+    if _window_store is None:
+        options = {key.lower(): value for key, value in getattr(settings, 'AUTH_THROTTLE', {}).items()}
+        backend = options.pop('backend', 'authentication.throttling.LocMemWindowStore')
+        _window_store = import_string(backend)(**options)
+    return _window_store
+
+
+@receiver(setting_changed)
+def reset_window_store(setting, **kwargs):
+    global _window_store
+    if setting == 'AUTH_THROTTLE':
+        _window_store = None
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """``SimpleRateThrottle`` with a sliding-window counter instead of a request history.
+
+    DRF's throttles keep a timestamp per request in the window and rewrite
+    the whole list on every hit; this keeps two counters per key, so a
+    flood costs the same constant work and memory however large it grows.
+    Throttles run before the view, so rejected requests never reach the
+    password hasher.
+    """
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        key = self.get_cache_key(request, view)
+        if key is None:
+            return True
+
+        self._wait = get_window_store().hit(key, self.num_requests, self.duration)
+        return not self._wait
+
+    def wait(self):
+        return math.ceil(self._wait)
+
+
+class AuthIPThrottle(SlidingWindowThrottle):
+    """Limit sign-in, password reset and email verification attempts per client IP"""
+
+    scope = 'auth_ip'
+
+    def get_cache_key(self, request, view):
+        return f'{self.scope}:{self.get_ident(request)}'
+
+
+class AuthAccountThrottle(SlidingWindowThrottle):
+    """Limit the same attempts per targeted account, whichever IPs they come from.
+
+    The account is the submitted email, the selector half of a reset token,
+    or the signed-in user for email verification.
+    """
+
+    scope = 'auth_account'
+
+    def get_cache_key(self, request, view):
+        data = request.data if isinstance(request.data, dict) else {}
+        account = data.get('email')
+        if not account and isinstance(data.get('token'), str):
+            account = data['token'].partition('.')[0]
+        if not account and request.user.is_authenticated:
+            account = f'user:{request.user.pk}'
+        if not isinstance(account, str) or not account:
+            return None
+        # Hashed so any submitted value makes a valid, fixed-length cache key
+        digest = hashlib.sha256(account.strip().lower().encode('utf-8')).hexdigest()
+        return f'{self.scope}:{digest}'
@@ -4,7 +4,9 @@ from . import views
 urlpatterns = [
     path('register/', views.register_user, name='register_user'),
     path('login/', views.login_user, name='login_user'),
+    path('refresh/', views.refresh_access_token, name='refresh_access_token'),
     path('logout/', views.logout_user, name='logout_user'),
+    path('sessions/revoke/', views.revoke_user_sessions, name='revoke_user_sessions'),
     path('me/', views.fetch_me, name='fetch_me'),
     path('update-me/', views.update_me, name='update_me'),
     path('change-password/', views.change_user_password, name='change_password'),
@@ -13,4 +15,6 @@ urlpatterns = [
     path('send-verification-code/', views.send_verification_code, name='send_verification_code'),
     path('verify-email/', views.verify_user_email, name='verify_email'),
     path('make-admin/', views.make_user_admin, name='make_admin'),
+    path('users/access/', views.bulk_update_access, name='bulk_update_access'),
+    path('metrics/hashing/', views.hashing_metrics, name='hashing_metrics'),
 ]
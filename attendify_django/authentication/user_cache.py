@@ -0,0 +1,198 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.dispatch import receiver
+from django.utils.functional import SimpleLazyObject, empty
+from django.utils.module_loading import import_string
+
+# Fields needed to authenticate and authorize a request without loading the full row
+CACHED_USER_FIELDS = ('id', 'active', 'role', 'access')
+
+
+class LocMemUserCache:
+    """Bounded LRU cache with a TTL, local to the current process.
+
+    Invalidation only reaches the process that saved the user, so with several
+    worker processes use ``DjangoCacheUserCache`` backed by a shared cache.
+    """
+
+    def __init__(self, timeout=60, max_entries=10000, **options):
+        self.timeout = timeout
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires, data = entry
+            if expires <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return data
+
+    def set(self, user_id, data):
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.timeout, data)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def aget(self, user_id):
+        return self.get(user_id)
+
+    async def aset(self, user_id, data):
+        self.set(user_id, data)
+
+    def delete_many(self, user_ids):
+        with self._lock:
+            for user_id in user_ids:
+                self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class DjangoCacheUserCache:
+    """User cache stored in one of Django's configured caches, shared by all workers"""
+
+    def __init__(self, timeout=60, cache_alias='default', key_prefix='auth:user', **options):
+        self.timeout = timeout
+        self.cache_alias = cache_alias
+        self.key_prefix = key_prefix
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def make_key(self, user_id):
+        return f'{self.key_prefix}:{user_id}'
+
+    def get(self, user_id):
+        return self.cache.get(self.make_key(user_id))
+
+    def set(self, user_id, data):
+        self.cache.set(self.make_key(user_id), data, self.timeout)
+
+    async def aget(self, user_id):
+        return await self.cache.aget(self.make_key(user_id))
+
+    async def aset(self, user_id, data):
+        await self.cache.aset(self.make_key(user_id), data, self.timeout)
+
+    def delete_many(self, user_ids):
+        self.cache.delete_many([self.make_key(user_id) for user_id in user_ids])
+
+    def clear(self):
+        # Entries expire on their own; never flush a cache other code may share
+        pass
+
+
+class CachedUser(SimpleLazyObject):
+    """User proxy answering the cached fields without a query.
+
+    Any other attribute access (serialization, ``save()``, ``check_password()``)
+    loads the full ``User`` row once and is forwarded to it.
+    """
+
+    def __init__(self, data):
+        self.__dict__['_cached_fields'] = data
+        super().__init__(lambda: get_user_model().objects.get(id=data['id']))
+
+    def _cached(name):
+        def getter(self):
+            if self._wrapped is empty:
+                return self._cached_fields[name]
+            return getattr(self._wrapped, name)
+        return property(getter)
+
+    id = _cached('id')
+    pk = _cached('id')
+    active = _cached('active')
+    role = _cached('role')
+    access = _cached('access')
+
+    del _cached
+
+    is_authenticated = True
+    is_anonymous = False
+
+    def __copy__(self):
+        if self._wrapped is empty:
+            return type(self)(self._cached_fields)
+        return super().__copy__()
+
+    def __deepcopy__(self, memo):
+        if self._wrapped is empty:
+            result = type(self)(dict(self._cached_fields))
+            memo[id(self)] = result
+            return result
+        return super().__deepcopy__(memo)
+
+
+_user_cache = None
+
+
+def get_user_cache():
+    """Return the cache backend configured by ``settings.AUTH_USER_CACHE``"""
+    global _user_cache
+    if _user_cache is None:
+        options = {key.lower(): value for key, value in getattr(settings, 'AUTH_USER_CACHE', {}).items()}
+        backend = options.pop('backend', 'authentication.user_cache.LocMemUserCache')
+        _user_cache = import_string(backend)(**options)
+    return _user_cache
+
+
+@receiver(setting_changed)
+def reset_user_cache(setting, **kwargs):
+    global _user_cache
+    if setting == 'AUTH_USER_CACHE':
+        _user_cache = None
+
+
+def get_cached_user(user_id):
+    """Return a ``CachedUser`` for ``user_id``, or None if the user does not exist"""
+    cache = get_user_cache()
+    data = cache.get(user_id)
+    if data is None:
+        data = get_user_model().objects.filter(id=user_id).values(*CACHED_USER_FIELDS).first()
+        if data is None:
+            return None
+        cache.set(user_id, data)
+    return CachedUser(data)
+
+
+async def aget_cached_user(user_id):
+    """``get_cached_user`` for async code, using the async ORM on a miss"""
+    cache = get_user_cache()
+    data = await cache.aget(user_id)
+    if data is None:
+        data = await get_user_model().objects.filter(id=user_id).values(*CACHED_USER_FIELDS).afirst()
+        if data is None:
+            return None
+        await cache.aset(user_id, data)
+    return CachedUser(data)
+
+
+def invalidate_users(user_ids):
+    """Drop cached entries now and again once the surrounding transaction commits.
+
+    The second delete covers a concurrent request that re-cached the old row
+    between the write and the commit.
+    """
+    user_ids = list(user_ids)
+    if not user_ids:
+        return
+    cache = get_user_cache()
+    cache.delete_many(user_ids)
+    transaction.on_commit(lambda: cache.delete_many(user_ids))
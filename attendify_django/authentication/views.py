@@ -1,9 +1,8 @@
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, authentication_classes, permission_classes, throttle_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from rest_framework import status
+from rest_framework import exceptions, status
 from django.contrib.auth import get_user_model
 from django.conf import settings
-from datetime import datetime, timedelta
 
 from .serializers import (
     UserRegistrationSerializer, 
@@ -13,9 +12,15 @@ from .serializers import (
     ChangePasswordSerializer,
     ForgotPasswordSerializer,
     ResetPasswordSerializer,
-    EmailVerificationSerializer
+    EmailVerificationSerializer,
+    BulkAccessSerializer
 )
-from .authentication import create_jwt_token, verify_token_and_get_user
+from .authentication import create_jwt_token, create_refresh_token, decode_token, verify_token_and_get_user
+from .hash_pool import HashingBusy, get_hash_pool
+from .services import revoke_sessions, set_users_access
+from .throttling import AuthAccountThrottle, AuthIPThrottle
+from activities.buffer import log_activity
+from utils.async_views import async_api_view
 from utils.responses import success_response, error_response, AppError
 from utils.email_utils import send_verification_email, send_password_reset_email
 from utils.verification_code import generate_email_verification_code
@@ -23,6 +28,40 @@ from utils.verification_code import generate_email_verification_code
 User = get_user_model()
 
 
+def hashing_busy_response(error):
+    """503 with Retry-After for a request the password hashing pool had no room for"""
+    response = error_response(str(error), status.HTTP_503_SERVICE_UNAVAILABLE)
+    response['Retry-After'] = str(error.retry_after)
+    return response
+
+
+def set_auth_cookies(response, user, refresh=True):
+    """Set the access token cookie and, on sign-in, the refresh token cookie"""
+    response.set_cookie(
+        'jwt',
+        create_jwt_token(user),
+        max_age=int(settings.JWT_ACCESS_EXPIRES_IN.total_seconds()),
+        httponly=True,
+        samesite='None',
+        secure=True
+    )
+    if refresh:
+        response.set_cookie(
+            settings.JWT_REFRESH_COOKIE,
+            create_refresh_token(user),
+            max_age=int(settings.JWT_EXPIRES_IN.total_seconds()),
+            path=settings.JWT_REFRESH_COOKIE_PATH,
+            httponly=True,
+            samesite='None',
+            secure=True
+        )
+
+
+def clear_auth_cookies(response):
+    response.delete_cookie('jwt')
+    response.delete_cookie(settings.JWT_REFRESH_COOKIE, path=settings.JWT_REFRESH_COOKIE_PATH)
+
+
 @api_view(['POST'])
 @permission_classes([AllowAny])
 def register_user(request):
@@ -37,18 +76,23 @@ def register_user(request):
             )
         
         user = serializer.save()
+        log_activity('register', user, f"{user.fullName} registered")
         
         return success_response(
             "Registration successful! Your account is under review. Once approved, we will send you an email with instructions to access your dashboard.",
             status_code=status.HTTP_201_CREATED
         )
         
+    except HashingBusy as e:
+        return hashing_busy_response(e)
     except Exception as e:
         return error_response(str(e), status.HTTP_400_BAD_REQUEST)
 
 
 @api_view(['POST'])
+@authentication_classes([])
 @permission_classes([AllowAny])
+@throttle_classes([AuthIPThrottle, AuthAccountThrottle])
 def login_user(request):
     """Login user"""
     try:
@@ -83,8 +127,7 @@ def login_user(request):
                 status.HTTP_400_BAD_REQUEST
             )
         
-        # Create JWT token
-        token = create_jwt_token(user)
+        log_activity('login', user, f"{user.fullName} logged in", {'ip': request.META.get('REMOTE_ADDR')})
         
         # Create response
         response = success_response(
@@ -92,29 +135,22 @@ def login_user(request):
             data={'user': UserSerializer(user).data}
         )
         
-        # Set JWT cookie
-        cookie_expires = datetime.now() + timedelta(days=settings.JWT_COOKIE_EXPIRES)
-        response.set_cookie(
-            'jwt',
-            token,
-            expires=cookie_expires,
-            httponly=True,
-            samesite='None',
-            secure=True
-        )
+        # Set access and refresh token cookies
+        set_auth_cookies(response, user)
         
         return response
         
+    except HashingBusy as e:
+        return hashing_busy_response(e)
     except Exception as e:
         return error_response(str(e), status.HTTP_400_BAD_REQUEST)
 
 
-@api_view(['GET'])
-@permission_classes([IsAuthenticated])
-def fetch_me(request):
+@async_api_view(['GET'])
+async def fetch_me(request):
     """Fetch authenticated user information"""
     try:
-        user = request.user
+        user = await User.objects.aget(id=request.user.id)
         serializer = UserSerializer(user)
         
         return success_response(
@@ -127,12 +163,81 @@ def fetch_me(request):
 
 
 @api_view(['POST'])
+@authentication_classes([])
+@permission_classes([AllowAny])
+def refresh_access_token(request):
+    """Issue a new access token cookie from the refresh token cookie"""
+    try:
+        try:
+            payload = decode_token(request.COOKIES.get(settings.JWT_REFRESH_COOKIE, ''), 'refresh')
+        except exceptions.AuthenticationFailed:
+            return error_response(
+                "You are not logged in. Kindly login again",
+                status.HTTP_401_UNAUTHORIZED
+            )
+        
+        # Off the hot path, so the refresh is checked against the user row itself
+        user = User.objects.filter(id=payload['id']).first()
+        if (
+            user is None
+            or not user.active
+            or user.access != "approved"
+            or payload.get('ver', 0) != user.tokenVersion
+        ):
+            return error_response(
+                "Your session has ended. Kindly login again",
+                status.HTTP_401_UNAUTHORIZED
+            )
+        
+        response = success_response("Token refreshed successfully")
+        set_auth_cookies(response, user, refresh=False)
+        return response
+        
+    except Exception as e:
+        return error_response(str(e), status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(['POST'])
+@authentication_classes([])
 @permission_classes([AllowAny])
 def logout_user(request):
-    """Logout user"""
+    """Logout user, even once the access token has expired"""
     try:
         response = success_response("Logged out successfully")
-        response.delete_cookie('jwt')
+        try:
+            payload = decode_token(request.COOKIES.get(settings.JWT_REFRESH_COOKIE, ''), 'refresh')
+            log_activity('logout', payload['id'], "User logged out")
+        except exceptions.AuthenticationFailed:
+            pass
+        clear_auth_cookies(response)
+        return response
+        
+    except Exception as e:
+        return error_response(str(e), status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def revoke_user_sessions(request):
+    """Sign a user out of every session: yourself, or any user by ``userId`` (admin only)"""
+    try:
+        user_id = int(request.data.get('userId', request.user.id))
+        
+        if user_id != request.user.id and request.user.role != 'admin':
+            return error_response(
+                "You are not authorized to perform this action",
+                status.HTTP_403_FORBIDDEN
+            )
+        
+        if not revoke_sessions([user_id], actor=request.user):
+            return error_response(
+                "User not found",
+                status.HTTP_404_NOT_FOUND
+            )
+        
+        response = success_response("All sessions revoked successfully")
+        if user_id == request.user.id:
+            clear_auth_cookies(response)
         return response
         
     except Exception as e:
@@ -198,15 +303,20 @@ def change_user_password(request):
         
         user.set_password(new_password)
         user.save()
+        log_activity('password_changed', user, "Password changed")
         
         return success_response("Password changed successfully")
         
+    except HashingBusy as e:
+        return hashing_busy_response(e)
     except Exception as e:
         return error_response(str(e), status.HTTP_400_BAD_REQUEST)
 
 
 @api_view(['POST'])
+@authentication_classes([])
 @permission_classes([AllowAny])
+@throttle_classes([AuthIPThrottle, AuthAccountThrottle])
 def forgot_password(request):
     """Forgot password"""
     try:
@@ -242,7 +352,9 @@ def forgot_password(request):
 
 
 @api_view(['PATCH'])
+@authentication_classes([])
 @permission_classes([AllowAny])
+@throttle_classes([AuthIPThrottle, AuthAccountThrottle])
 def reset_password(request):
     """Reset password"""
     try:
@@ -258,13 +370,7 @@ def reset_password(request):
         new_password = serializer.validated_data['newPassword']
         
         # Find user with this token
-        users = User.objects.filter(passwordResetToken__isnull=False)
-        user = None
-        
-        for u in users:
-            if u.verify_reset_token(token):
-                user = u
-                break
+        user = User.get_by_reset_token(token)
         
         if not user:
             return error_response(
@@ -274,12 +380,16 @@ def reset_password(request):
         
         # Reset password
         user.set_password(new_password)
-        user.passwordResetToken = None
-        user.passwordResetTokenExpires = None
+        user.clear_reset_password_token()
         user.save()
+        log_activity('password_changed', user, "Password reset with emailed token")
+        # Whoever knew the old password may still be signed in
+        revoke_sessions([user.id])
         
         return success_response("Password reset successfully")
         
+    except HashingBusy as e:
+        return hashing_busy_response(e)
     except Exception as e:
         return error_response(str(e), status.HTTP_400_BAD_REQUEST)
 
@@ -308,6 +418,7 @@ def send_verification_code(request):
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@throttle_classes([AuthIPThrottle, AuthAccountThrottle])
 def verify_user_email(request):
     """Verify user email"""
     try:
@@ -327,6 +438,7 @@ def verify_user_email(request):
             user.emailVerificationCode = None
             user.emailVerificationCodeExpires = None
             user.save()
+            log_activity('email_verified', user, "Email verified")
             
             return success_response("Email verified successfully")
         else:
@@ -377,3 +489,61 @@ def make_user_admin(request):
         
     except Exception as e:
         return error_response(str(e), status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(['PATCH'])
+@permission_classes([IsAuthenticated])
+def bulk_update_access(request):
+    """Approve or deny many lecturer accounts (admin only)"""
+    try:
+        if request.user.role != 'admin':
+            return error_response(
+                "You are not authorized to perform this action",
+                status.HTTP_403_FORBIDDEN
+            )
+        
+        serializer = BulkAccessSerializer(data=request.data)
+        if not serializer.is_valid():
+            return error_response(
+                "Invalid data provided",
+                status.HTTP_400_BAD_REQUEST
+            )
+        
+        user_ids = serializer.validated_data['userIds']
+        access = serializer.validated_data['access']
+        changed = set_users_access(user_ids, access, actor=request.user)
+        changed_ids = [user.id for user in changed]
+        changed_set = set(changed_ids)
+        skipped_ids = [user_id for user_id in dict.fromkeys(user_ids) if user_id not in changed_set]
+        
+        return success_response(
+            f"{len(changed_ids)} user(s) {access}",
+            data={
+                'access': access,
+                'updated': changed_ids,
+                'skipped': skipped_ids,
+            }
+        )
+        
+    except Exception as e:
+        return error_response(str(e), status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def hashing_metrics(request):
+    """Password hashing pool metrics of the process serving the request (admin only)"""
+    try:
+        if request.user.role != 'admin':
+            return error_response(
+                "You are not authorized to perform this action",
+                status.HTTP_403_FORBIDDEN
+            )
+        
+        return success_response(
+            "Hashing metrics fetched successfully",
+            data=get_hash_pool().snapshot()
+        )
+        
+    except Exception as e:
+        return error_response(str(e), status.HTTP_400_BAD_REQUEST)
@@ -6,14 +6,14 @@ from .models import Course
 class CourseAdmin(admin.ModelAdmin):
     """Admin interface for Course model"""
     
-    list_display = ['courseTitle', 'courseCode', 'semester', 'level', 'created_at']
-    list_filter = ['semester', 'level', 'created_at']
+    list_display = ['courseTitle', 'courseCode', 'semester', 'level', 'active', 'created_at']
+    list_filter = ['active', 'semester', 'level', 'created_at']
     search_fields = ['courseTitle', 'courseCode']
     ordering = ['-created_at']
     
     fieldsets = (
         ('Course Information', {
-            'fields': ('courseTitle', 'courseCode', 'semester', 'level')
+            'fields': ('courseTitle', 'courseCode', 'semester', 'level', 'active')
         }),
         ('Timestamps', {
             'fields': ('created_at', 'updated_at'),
@@ -0,0 +1,155 @@
+from django.db import transaction
+from django.utils import timezone
+
+from academic_sessions.models import Semester
+from academic_sessions.resolver import get_active_session
+from utils.spreadsheets import SPREADSHEET_READERS, SpreadsheetError, header_columns, row_values
+from .models import Course
+
+# Normalized header -> Course field
+HEADER_ALIASES = {
+    'coursecode': 'courseCode',
+    'code': 'courseCode',
+    'coursetitle': 'courseTitle',
+    'title': 'courseTitle',
+    'level': 'level',
+    'semester': 'semester',
+}
+REQUIRED_COLUMNS = ['courseCode', 'courseTitle', 'level']
+
+# Fields compared against the stored course; equal rows are left untouched
+SYNC_FIELDS = ['courseTitle', 'level', 'semester_id', 'active']
+
+MAX_LENGTHS = {
+    name: Course._meta.get_field(name).max_length
+    for name in ['courseCode', 'courseTitle', 'level']
+}
+
+
+def _read_catalogue(rows, semester_ids, result):
+    """Valid catalogue entries keyed by upper-cased course code, the listed codes and the synced fields"""
+    rows = iter(rows)
+    header = next(rows, None)
+    if header is None:
+        raise SpreadsheetError('The file is empty')
+    columns = header_columns(header, HEADER_ALIASES, REQUIRED_COLUMNS)
+    # Without a semester column the stored semesters are kept
+    fields = [field for field in SYNC_FIELDS if field != 'semester_id' or 'semester' in columns]
+
+    entries = {}
+    listed = set()
+    # Row 1 is the header
+    for number, row in enumerate(rows, start=2):
+        if not any(str(value).strip() for value in row):
+            continue
+        result['rows'] += 1
+        values = row_values(row, columns)
+        code = values['courseCode']
+        key = code.upper()
+        listed.add(key)
+        errors = []
+
+        for field in REQUIRED_COLUMNS:
+            if not values[field]:
+                errors.append(f'{field} is required')
+            elif len(values[field]) > MAX_LENGTHS[field]:
+                errors.append(f'{field} must be at most {MAX_LENGTHS[field]} characters')
+        if key in entries:
+            errors.append(f"courseCode repeats row {entries[key]['row']}")
+
+        semester_id = None
+        semester = values.get('semester', '')
+        if semester:
+            semester_id = semester_ids.get(semester.lower())
+            if semester_id is None:
+                errors.append(f'Unknown semester "{semester}"')
+
+        if errors:
+            result['rejected'] += 1
+            result['errors'].append({'row': number, 'courseCode': code, 'errors': errors})
+            continue
+
+        entries[key] = {
+            'row': number,
+            'courseCode': code,
+            'courseTitle': values['courseTitle'],
+            'level': values['level'],
+            'semester_id': semester_id,
+            'active': True,
+        }
+    return entries, listed, fields
+
+
+def sync_catalogue(rows, session=None, deactivate_missing=False, dry_run=False):
+    """Bring the course table in line with a full catalogue.
+
+    Existing courses are read in one query and compared field by field, so
+    only new and changed courses are written: inserts with an upsert on
+    ``courseCode`` and changes with one ``bulk_update``. Re-running an
+    identical catalogue writes nothing. Semester names are resolved within
+    ``session`` (default: the active session). With ``deactivate_missing``,
+    active courses missing from the file are marked inactive; codes on
+    rejected rows count as listed.
+    """
+    session = session or get_active_session()
+    semester_ids = {}
+    if session is not None:
+        for semester_id, name in Semester.objects.filter(session=session).values_list('id', 'name'):
+            semester_ids[name.lower()] = semester_id
+
+    result = {
+        'rows': 0, 'inserted': 0, 'updated': 0, 'unchanged': 0,
+        'deactivated': 0, 'rejected': 0, 'errors': [],
+    }
+    entries, listed, fields = _read_catalogue(rows, semester_ids, result)
+
+    existing = {
+        course.courseCode.upper(): course
+        for course in Course.objects.only('id', 'courseCode', *fields)
+    }
+    now = timezone.now()
+    inserts, updates = [], []
+    for key, entry in entries.items():
+        course = existing.get(key)
+        if course is None:
+            inserts.append(Course(**{field: entry[field] for field in ['courseCode', *fields]}))
+        elif any(getattr(course, field) != entry[field] for field in fields):
+            for field in fields:
+                setattr(course, field, entry[field])
+            course.updated_at = now
+            updates.append(course)
+    missing = [
+        course.pk for key, course in existing.items()
+        if key not in listed and course.active
+    ] if deactivate_missing else []
+
+    result['inserted'] = len(inserts)
+    result['updated'] = len(updates)
+    result['unchanged'] = len(entries) - len(inserts) - len(updates)
+    result['deactivated'] = len(missing)
+    if dry_run or not (inserts or updates or missing):
+        return result
+
+    with transaction.atomic():
+        if inserts:
+            # A course added meanwhile under the same code is updated, not duplicated
+            Course.objects.bulk_create(
+                inserts,
+                batch_size=500,
+                update_conflicts=True,
+                unique_fields=['courseCode'],
+                update_fields=[*fields, 'updated_at'],
+            )
+        if updates:
+            Course.objects.bulk_update(updates, [*fields, 'updated_at'], batch_size=500)
+        if missing:
+            Course.objects.filter(pk__in=missing).update(active=False, updated_at=now)
+    return result
+
+
+def sync_catalogue_file(file, file_type, **options):
+    """Sync the catalogue from a CSV or XLSX file object; see ``sync_catalogue``"""
+    reader = SPREADSHEET_READERS.get(file_type)
+    if reader is None:
+        raise SpreadsheetError(f"Unsupported file type. Use one of: {', '.join(SPREADSHEET_READERS)}")
+    return sync_catalogue(reader(file), **options)
@@ -0,0 +1,50 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from academic_sessions.models import AcademicSession
+from courses.catalogue import sync_catalogue_file
+from utils.spreadsheets import SPREADSHEET_READERS, SpreadsheetError
+
+
+class Command(BaseCommand):
+    help = 'Sync the course table with a full catalogue file (CSV or XLSX) keyed on courseCode'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or XLSX file with a header row')
+        parser.add_argument('--type', choices=list(SPREADSHEET_READERS), help='File type (default: from the extension)')
+        parser.add_argument('--session', type=int, help='Academic session the semester names belong to (default: active)')
+        parser.add_argument('--deactivate-missing', action='store_true', help='Deactivate courses not in the file')
+        parser.add_argument('--dry-run', action='store_true', help='Report the changes without writing')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_type = options['type'] or os.path.splitext(path)[1].lstrip('.').lower()
+
+        session = None
+        if options['session'] is not None:
+            try:
+                session = AcademicSession.objects.get(id=options['session'])
+            except AcademicSession.DoesNotExist:
+                raise CommandError(f"Academic session {options['session']} not found")
+
+        try:
+            with open(path, 'rb') as file:
+                result = sync_catalogue_file(
+                    file,
+                    file_type,
+                    session=session,
+                    deactivate_missing=options['deactivate_missing'],
+                    dry_run=options['dry_run'],
+                )
+        except (OSError, SpreadsheetError) as e:
+            raise CommandError(str(e))
+
+        for error in result['errors']:
+            self.stdout.write(f"Row {error['row']} ({error['courseCode'] or 'no courseCode'}): {'; '.join(error['errors'])}")
+
+        prefix = 'Dry run: ' if options['dry_run'] else ''
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}{result['inserted']} inserted, {result['updated']} updated, {result['unchanged']} unchanged, "
+            f"{result['deactivated']} deactivated, {result['rejected']} rejected."
+        ))
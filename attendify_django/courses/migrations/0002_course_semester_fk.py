@@ -0,0 +1,91 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def link_semesters(apps, schema_editor):
+    """Point each course at the semester of the same name in the current session.
+
+    The current session is the active one, else the most recently started.
+    Missing semesters are created in that session; with no sessions at all
+    courses are left without a semester.
+    """
+    AcademicSession = apps.get_model("academic_sessions", "AcademicSession")
+    Semester = apps.get_model("academic_sessions", "Semester")
+    Course = apps.get_model("courses", "Course")
+
+    session = AcademicSession.objects.order_by("-active", "-start", "-id").first()
+    if session is None:
+        return
+    names = Course.objects.values_list("semester", flat=True).distinct().order_by()
+    for raw in names.iterator():
+        name = (raw or "").strip()[:20]
+        if not name:
+            continue
+        semester = Semester.objects.filter(session=session, name__iexact=name).first()
+        if semester is None:
+            semester = Semester.objects.create(session=session, name=name)
+        Course.objects.filter(semester=raw).update(semester_ref=semester)
+
+
+def unlink_semesters(apps, schema_editor):
+    Course = apps.get_model("courses", "Course")
+    Semester = apps.get_model("academic_sessions", "Semester")
+
+    for semester_id, name in (
+        Semester.objects.filter(courses_ref__isnull=False)
+        .distinct()
+        .values_list("id", "name")
+    ):
+        Course.objects.filter(semester_ref_id=semester_id).update(semester=name)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("academic_sessions", "0003_semester"),
+        ("courses", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="course",
+            name="semester_ref",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="courses_ref",
+                to="academic_sessions.semester",
+            ),
+        ),
+        migrations.RunPython(link_semesters, unlink_semesters),
+        # A default lets the string column be re-added when migrating backwards
+        migrations.AlterField(
+            model_name="course",
+            name="semester",
+            field=models.CharField(default="", help_text="Semester", max_length=20),
+        ),
+        migrations.RemoveField(
+            model_name="course",
+            name="semester",
+        ),
+        migrations.RenameField(
+            model_name="course",
+            old_name="semester_ref",
+            new_name="semester",
+        ),
+        migrations.AlterField(
+            model_name="course",
+            name="semester",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Semester the course is offered in",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="courses",
+                to="academic_sessions.semester",
+            ),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0002_course_semester_fk"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="course",
+            name="active",
+            field=models.BooleanField(
+                default=True, help_text="Listed in the current catalogue"
+            ),
+        ),
+    ]
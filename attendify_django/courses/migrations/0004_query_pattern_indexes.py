@@ -0,0 +1,24 @@
+# Generated by Django 5.2.4 on 2026-10-18 15:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("academic_sessions", "0003_semester"),
+        ("courses", "0003_course_active"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="course",
+            index=models.Index(
+                fields=["level", "courseCode"], name="course_level_code_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="course",
+            index=models.Index(fields=["-created_at"], name="course_created_idx"),
+        ),
+    ]
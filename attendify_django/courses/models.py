@@ -1,13 +1,23 @@
 from django.db import models
 
+from academic_sessions.models import Semester
+
 
 class Course(models.Model):
     """Course model based on the Node.js courseType interface"""
     
     courseTitle = models.CharField(max_length=255, help_text="Course title")
     courseCode = models.CharField(max_length=20, unique=True, help_text="Course code")
-    semester = models.CharField(max_length=20, help_text="Semester")
+    semester = models.ForeignKey(
+        Semester,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='courses',
+        help_text="Semester the course is offered in"
+    )
     level = models.CharField(max_length=20, help_text="Academic level")
+    active = models.BooleanField(default=True, help_text="Listed in the current catalogue")
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -17,6 +27,12 @@ class Course(models.Model):
         verbose_name = 'Course'
         verbose_name_plural = 'Courses'
         ordering = ['courseCode']
+        indexes = [
+            # The level filter pages by courseCode
+            models.Index(fields=['level', 'courseCode'], name='course_level_code_idx'),
+            # Admin change list
+            models.Index(fields=['-created_at'], name='course_created_idx'),
+        ]
     
     def __str__(self):
         return f"{self.courseCode} - {self.courseTitle}"
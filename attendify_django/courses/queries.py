@@ -0,0 +1,27 @@
+from utils.pagination import KeysetPagination
+from utils.query_audit import canonical_query
+from .models import Course
+
+
+def _page(queryset):
+    return KeysetPagination().page_queryset(queryset, ['CSC101'])
+
+
+@canonical_query('courses.list')
+def course_list():
+    return _page(Course.objects.all())
+
+
+@canonical_query('courses.list_by_level')
+def courses_by_level():
+    return _page(Course.objects.filter(level='100'))
+
+
+@canonical_query('courses.list_by_semester')
+def courses_by_semester():
+    return _page(Course.objects.filter(semester_id=1))
+
+
+@canonical_query('courses.admin_recent')
+def admin_recent():
+    return Course.objects.order_by('-created_at')[:100]
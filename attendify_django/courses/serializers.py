@@ -0,0 +1,21 @@
+from rest_framework import serializers
+
+from utils.serializers import SpreadsheetUploadSerializer
+from .models import Course
+
+
+class CourseSerializer(serializers.ModelSerializer):
+    """Serializer for course data"""
+    
+    semesterName = serializers.CharField(source='semester.name', read_only=True, default=None)
+    
+    class Meta:
+        model = Course
+        fields = ['id', 'courseTitle', 'courseCode', 'semester', 'semesterName', 'level', 'active']
+
+
+class CatalogueSyncSerializer(SpreadsheetUploadSerializer):
+    """Serializer for a full course catalogue file"""
+    
+    sessionId = serializers.IntegerField(required=False)
+    deactivateMissing = serializers.BooleanField(default=False)
@@ -1,3 +1,133 @@
-from django.test import TestCase
+import datetime
 
-# Create your tests here.
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from academic_sessions.models import AcademicSession, Semester
+from activities.models import Activity
+from authentication.models import User
+from utils.spreadsheets import stream_csv
+from .catalogue import sync_catalogue
+from .models import Course
+
+HEADER = ['Course Code', 'Course Title', 'Level', 'Semester']
+
+
+class ListCoursesTests(TestCase):
+
+    def test_requires_approved_staff(self):
+        client = APIClient()
+        for role, access, expected in [
+            ('lecturer', 'approved', 200), ('lecturer', 'pending', 403), ('user', 'approved', 403),
+        ]:
+            user = User.objects.create(email=f'{role}-{access}@example.com', fullName='User', role=role, access=access)
+            client.force_authenticate(user)
+            with self.subTest(role=role, access=access):
+                self.assertEqual(client.get('/api/v1/courses/').status_code, expected)
+
+
+class CatalogueSyncTests(TestCase):
+
+    def setUp(self):
+        self.session = AcademicSession.objects.create(
+            name='2024/2025', start=datetime.date(2024, 9, 1), end=datetime.date(2025, 8, 31), active=True
+        )
+        self.first = Semester.objects.create(session=self.session, name='First')
+        self.second = Semester.objects.create(session=self.session, name='Second')
+        self.compilers = Course.objects.create(
+            courseTitle='Compilers', courseCode='CSC401', level='400', semester=self.first
+        )
+        self.networks = Course.objects.create(
+            courseTitle='Networks', courseCode='CSC403', level='400', semester=self.first
+        )
+
+    def sync(self, rows, **options):
+        return sync_catalogue([HEADER, *rows], session=self.session, **options)
+
+    def counts(self, result):
+        return {key: value for key, value in result.items() if key != 'errors'}
+
+    def test_inserts_and_updates(self):
+        result = self.sync([
+            ['CSC101', 'Programming', '100', 'first'],
+            # Matched to CSC401 whatever the case
+            ['csc401', 'Compiler Construction', '400', 'Second'],
+            ['CSC403', 'Networks', '400', 'First'],
+        ])
+
+        self.assertEqual(self.counts(result), {
+            'rows': 3, 'inserted': 1, 'updated': 1, 'unchanged': 1, 'deactivated': 0, 'rejected': 0,
+        })
+        created = Course.objects.get(courseCode='CSC101')
+        self.assertEqual((created.courseTitle, created.semester, created.active), ('Programming', self.first, True))
+        self.compilers.refresh_from_db()
+        self.assertEqual(
+            (self.compilers.courseCode, self.compilers.courseTitle, self.compilers.semester),
+            ('CSC401', 'Compiler Construction', self.second),
+        )
+        self.assertEqual(Course.objects.count(), 3)
+
+    def test_unchanged_catalogue_writes_nothing(self):
+        rows = [['CSC401', 'Compilers', '400', 'First'], ['CSC403', 'Networks', '400', 'First']]
+        stamps = dict(Course.objects.values_list('courseCode', 'updated_at'))
+
+        # Only the semester and course reads
+        with self.assertNumQueries(2):
+            result = self.sync(rows, deactivate_missing=True)
+
+        self.assertEqual((result['unchanged'], result['inserted'], result['updated']), (2, 0, 0))
+        self.assertEqual(dict(Course.objects.values_list('courseCode', 'updated_at')), stamps)
+
+    def test_dry_run_reports_without_writing(self):
+        result = self.sync(
+            [['CSC101', 'Programming', '100', 'First'], ['CSC401', 'Renamed', '400', 'First']],
+            deactivate_missing=True, dry_run=True,
+        )
+
+        self.assertEqual((result['inserted'], result['updated'], result['deactivated']), (1, 1, 1))
+        self.assertFalse(Course.objects.filter(courseCode='CSC101').exists())
+        self.assertEqual(Course.objects.get(pk=self.compilers.pk).courseTitle, 'Compilers')
+        self.assertTrue(Course.objects.get(pk=self.networks.pk).active)
+
+    def test_deactivates_missing_courses(self):
+        result = self.sync([['CSC401', 'Compilers', '400', 'First']], deactivate_missing=True)
+
+        self.assertEqual(result['deactivated'], 1)
+        self.assertFalse(Course.objects.get(pk=self.networks.pk).active)
+        self.assertTrue(Course.objects.get(pk=self.compilers.pk).active)
+
+    def test_rejected_rows(self):
+        result = self.sync([
+            ['CSC101', 'Programming', '100', 'First'],
+            ['csc101', 'Programming again', '100', 'First'],
+            ['CSC102', '', '100', 'Rain'],
+            # Rejected rows still count as listed, so CSC403 is not deactivated
+            ['CSC403', 'Networks', '400', 'Third'],
+        ], deactivate_missing=True)
+
+        self.assertEqual(result['errors'], [
+            {'row': 3, 'courseCode': 'csc101', 'errors': ['courseCode repeats row 2']},
+            {'row': 4, 'courseCode': 'CSC102', 'errors': ['courseTitle is required', 'Unknown semester "Rain"']},
+            {'row': 5, 'courseCode': 'CSC403', 'errors': ['Unknown semester "Third"']},
+        ])
+        self.assertEqual((result['inserted'], result['rejected'], result['deactivated']), (1, 3, 1))
+        self.assertEqual(Course.objects.get(courseCode='CSC101').courseTitle, 'Programming')
+        self.assertTrue(Course.objects.get(pk=self.networks.pk).active)
+        self.assertFalse(Course.objects.get(pk=self.compilers.pk).active)
+
+    @override_settings(ACTIVITY_LOG={'ALWAYS_FLUSH': True})
+    def test_endpoint_logs_sync(self):
+        admin = User.objects.create(email='admin@example.com', fullName='Admin', role='admin', access='approved')
+        client = APIClient()
+        client.force_authenticate(admin)
+        content = ''.join(stream_csv(HEADER, [['CSC101', 'Programming', '100', 'First']])).encode('utf-8')
+
+        response = client.post('/api/v1/courses/sync/', {
+            'file': SimpleUploadedFile('catalogue.csv', content, content_type='text/csv'),
+        })
+
+        self.assertEqual(response.status_code, 200, response.content)
+        activity = Activity.objects.get(activity_type='catalogue_synced')
+        self.assertEqual(activity.get_activity_type_display(), 'Catalogue Synced')
+        self.assertEqual(activity.metadata['inserted'], 1)
@@ -0,0 +1,7 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('', views.list_courses, name='list_courses'),
+    path('sync/', views.sync_course_catalogue, name='sync_course_catalogue'),
+]
@@ -1,3 +1,106 @@
-from django.shortcuts import render
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework import status
 
-# Create your views here.
+from academic_sessions.models import AcademicSession
+from activities.buffer import log_activity
+from utils.pagination import paginate
+from utils.replicas import use_replica
+from utils.responses import success_response, error_response
+from utils.spreadsheets import SpreadsheetError
+from .catalogue import sync_catalogue_file
+from .models import Course
+from .serializers import CourseSerializer, CatalogueSyncSerializer
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@use_replica
+def list_courses(request):
+    """List courses by course code, one keyset page at a time"""
+    try:
+        if request.user.role not in ['admin', 'lecturer'] or request.user.access != 'approved':
+            return error_response(
+                "You are not authorized to perform this action",
+                status.HTTP_403_FORBIDDEN
+            )
+        
+        courses = Course.objects.select_related('semester')
+        
+        level = request.query_params.get('level')
+        if level:
+            courses = courses.filter(level=level)
+        
+        active = request.query_params.get('active')
+        if active:
+            courses = courses.filter(active=active.lower() in ['true', '1'])
+        
+        semester = request.query_params.get('semester')
+        if semester:
+            if not semester.isdigit():
+                return error_response(
+                    "Invalid 'semester' id",
+                    status.HTTP_400_BAD_REQUEST
+                )
+            courses = courses.filter(semester_id=semester)
+        
+        return paginate(request, courses, CourseSerializer, "Courses fetched successfully")
+        
+    except Exception as e:
+        return error_response(str(e), status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def sync_course_catalogue(request):
+    """Insert, update and optionally deactivate courses from a full catalogue file (admin only)"""
+    try:
+        if request.user.role != 'admin':
+            return error_response(
+                "You are not authorized to perform this action",
+                status.HTTP_403_FORBIDDEN
+            )
+        
+        serializer = CatalogueSyncSerializer(data=request.data)
+        
+        if not serializer.is_valid():
+            return error_response(
+                "Please upload a CSV or XLSX file",
+                status.HTTP_400_BAD_REQUEST
+            )
+        
+        data = serializer.validated_data
+        
+        session = None
+        if data.get('sessionId') is not None:
+            try:
+                session = AcademicSession.objects.get(id=data['sessionId'])
+            except AcademicSession.DoesNotExist:
+                return error_response("Academic session not found", status.HTTP_404_NOT_FOUND)
+        
+        try:
+            result = sync_catalogue_file(
+                data['file'],
+                data['type'],
+                session=session,
+                deactivate_missing=data['deactivateMissing'],
+                dry_run=data['dryRun'],
+            )
+        except SpreadsheetError as e:
+            return error_response(str(e), status.HTTP_400_BAD_REQUEST)
+        
+        if not data['dryRun']:
+            log_activity(
+                'catalogue_synced',
+                request.user,
+                f"Synced the course catalogue from {data['file'].name}",
+                {key: value for key, value in result.items() if key != 'errors'}
+            )
+        
+        return success_response(
+            "Catalogue validated successfully" if data['dryRun'] else "Catalogue synced successfully",
+            data=result
+        )
+        
+    except Exception as e:
+        return error_response(str(e), status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,41 @@
+from django.contrib import admin
+from django.utils import timezone
+from .models import OutboundEmail
+
+
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    """Admin interface for the outbound email queue"""
+    
+    list_display = ['subject', 'recipient_list', 'status', 'attempts', 'next_attempt_at', 'created_at', 'sent_at']
+    list_filter = ['status', 'created_at']
+    search_fields = ['subject', 'recipients']
+    ordering = ['-created_at']
+    readonly_fields = ['attempts', 'last_error', 'created_at', 'sent_at']
+    actions = ['retry_now']
+    
+    @admin.display(description='Recipients')
+    def recipient_list(self, obj):
+        return ', '.join(obj.recipients)
+    
+    @admin.action(description='Retry selected emails now')
+    def retry_now(self, request, queryset):
+        # A fresh set of attempts, or a message that already gave up fails again on its first error
+        updated = queryset.exclude(status='sent').update(
+            status='queued', attempts=0, last_error='', next_attempt_at=timezone.now()
+        )
+        self.message_user(request, f"{updated} email(s) queued for delivery.")
+    
+    def changelist_view(self, request, extra_context=None):
+        extra_context = extra_context or {}
+        extra_context['title'] = f"Outbound emails (queue depth: {OutboundEmail.objects.depth()})"
+        return super().changelist_view(request, extra_context=extra_context)
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return request.user.is_superuser or request.user.role == 'admin'
+    
+    def has_delete_permission(self, request, obj=None):
+        return request.user.is_superuser or request.user.role == 'admin'
@@ -0,0 +1,71 @@
+import time
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from notifications.models import OutboundEmail
+from notifications.queue import deliver_batch, purge_emails, queue_depth
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued emails over a persistent mail connection'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Drain the due messages once and exit')
+        parser.add_argument('--stats', action='store_true', help='Print queue depth and exit')
+        parser.add_argument('--batch-size', type=int, default=settings.EMAIL_QUEUE_BATCH_SIZE)
+        parser.add_argument('--interval', type=float, default=settings.EMAIL_QUEUE_POLL_INTERVAL,
+                            help='Seconds to sleep when no message is due')
+
+    def handle(self, *args, **options):
+        if options['stats']:
+            self.print_stats()
+            return
+
+        connection = get_connection()
+        purged_at = None
+        try:
+            while True:
+                close_old_connections()
+                if purged_at is None or time.monotonic() - purged_at >= settings.EMAIL_QUEUE_PURGE_INTERVAL:
+                    purged_at = time.monotonic()
+                    self.purge()
+                try:
+                    sent, failed = deliver_batch(connection, options['batch_size'])
+                except Exception as e:
+                    # Mail server or database unavailable; leased messages retry after the lease
+                    self.stderr.write(f'Email queue error: {e}')
+                    connection.close()
+                    sent = failed = 0
+                    if options['once']:
+                        raise
+
+                if sent or failed:
+                    self.stdout.write(f'Sent {sent}, failed {failed}, queue depth {queue_depth()}')
+                    continue
+
+                if options['once']:
+                    break
+                # Idle: release the SMTP connection instead of letting the server time it out
+                connection.close()
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            connection.close()
+
+    def purge(self):
+        try:
+            purged = purge_emails()
+        except Exception as e:
+            self.stderr.write(f'Email purge error: {e}')
+            return
+        if purged:
+            self.stdout.write(f'Purged {purged} delivered email(s)')
+
+    def print_stats(self):
+        for status, _ in OutboundEmail.STATUS_CHOICES:
+            self.stdout.write(f'{status}: {OutboundEmail.objects.filter(status=status).count()}')
+        self.stdout.write(f'due now: {OutboundEmail.objects.due().count()}')
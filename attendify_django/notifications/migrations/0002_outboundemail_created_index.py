@@ -0,0 +1,19 @@
+# Generated by Django 5.2.4 on 2026-10-18 15:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifications", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="outboundemail",
+            index=models.Index(
+                fields=["-created_at"], name="outbound_email_created_idx"
+            ),
+        ),
+    ]
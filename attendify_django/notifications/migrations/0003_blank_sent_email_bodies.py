@@ -0,0 +1,22 @@
+# Generated by Django 5.2.4 on 2026-10-18 18:10
+
+from django.db import migrations
+
+
+def blank_sent_bodies(apps, schema_editor):
+    """Drop the bodies of messages already sent; they may hold reset links or codes"""
+    OutboundEmail = apps.get_model("notifications", "OutboundEmail")
+    OutboundEmail.objects.filter(status="sent").exclude(body="", html_body="").update(
+        body="", html_body=""
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifications", "0002_outboundemail_created_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(blank_sent_bodies, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,67 @@
+from django.core.mail import EmailMultiAlternatives
+from django.db import models
+from django.utils import timezone
+
+
+class OutboundEmailQuerySet(models.QuerySet):
+    
+    def due(self):
+        """Queued messages whose next attempt time has come"""
+        return self.filter(status='queued', next_attempt_at__lte=timezone.now())
+    
+    def depth(self):
+        """Number of messages still waiting to be delivered"""
+        return self.filter(status='queued').count()
+
+
+class OutboundEmail(models.Model):
+    """Email waiting to be delivered by the ``process_email_queue`` worker"""
+    
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+    
+    subject = models.CharField(max_length=255)
+    body = models.TextField(help_text="Plain text body")
+    html_body = models.TextField(blank=True, default='', help_text="Optional HTML alternative")
+    from_email = models.CharField(max_length=255)
+    recipients = models.JSONField(default=list, help_text="List of recipient addresses")
+    
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now, help_text="Earliest time of the next delivery attempt")
+    last_error = models.TextField(blank=True, default='')
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    
+    objects = OutboundEmailQuerySet.as_manager()
+    
+    class Meta:
+        db_table = 'notifications_outboundemail'
+        verbose_name = 'Outbound Email'
+        verbose_name_plural = 'Outbound Emails'
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='outbound_email_due_idx'),
+            # Admin change list
+            models.Index(fields=['-created_at'], name='outbound_email_created_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.recipients)} ({self.status})"
+    
+    def to_message(self, connection=None):
+        """Build the Django email message for this row"""
+        message = EmailMultiAlternatives(
+            subject=self.subject,
+            body=self.body,
+            from_email=self.from_email,
+            to=self.recipients,
+            connection=connection,
+        )
+        if self.html_body:
+            message.attach_alternative(self.html_body, 'text/html')
+        return message
@@ -0,0 +1,12 @@
+from utils.query_audit import canonical_query
+from .models import OutboundEmail
+
+
+@canonical_query('notifications.due_batch')
+def due_batch():
+    return OutboundEmail.objects.due().order_by('next_attempt_at', 'id')[:50]
+
+
+@canonical_query('notifications.admin_recent')
+def admin_recent():
+    return OutboundEmail.objects.order_by('-created_at')[:100]
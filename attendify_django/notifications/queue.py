@@ -0,0 +1,138 @@
+import logging
+from collections import deque
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.db import connection as db_connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_email(subject, recipient_list, message, html_message=None, from_email=None):
+    """Queue one email for the worker and return the stored row"""
+    return OutboundEmail.objects.create(
+        subject=subject,
+        body=message or '',
+        html_body=html_message or '',
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        recipients=list(recipient_list),
+    )
+
+
+def enqueue_emails(emails):
+    """Queue many ``OutboundEmail`` instances with a single insert"""
+    for email in emails:
+        email.from_email = email.from_email or settings.DEFAULT_FROM_EMAIL
+    return OutboundEmail.objects.bulk_create(emails, batch_size=500)
+
+
+def claim_batch(batch_size, lease_seconds):
+    """Lease a batch of due messages to this worker.
+
+    Claimed rows stay ``queued`` but their next attempt is pushed past the
+    lease, so a crashed worker's messages become due again on their own.
+    ``skip_locked`` lets several workers drain the queue on databases that
+    support it.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        queryset = OutboundEmail.objects.due().order_by('next_attempt_at', 'id')
+        if db_connection.features.has_select_for_update_skip_locked:
+            queryset = queryset.select_for_update(skip_locked=True)
+        batch = list(queryset[:batch_size])
+        if batch:
+            OutboundEmail.objects.filter(id__in=[email.id for email in batch]).update(
+                next_attempt_at=now + timedelta(seconds=lease_seconds)
+            )
+    return batch
+
+
+def retry_delay(attempts):
+    """Exponential backoff, capped at ``EMAIL_QUEUE_MAX_RETRY_DELAY``"""
+    delay = settings.EMAIL_QUEUE_RETRY_DELAY * 2 ** max(0, attempts - 1)
+    return timedelta(seconds=min(delay, settings.EMAIL_QUEUE_MAX_RETRY_DELAY))
+
+
+def deliver_batch(connection=None, batch_size=None):
+    """Send one batch of due messages over a single mail connection.
+
+    Returns ``(sent, failed)``; ``failed`` counts messages scheduled for a
+    retry, those that gave up after ``EMAIL_QUEUE_MAX_ATTEMPTS`` and those
+    left unsent because the mail server could not be reached. Whatever was
+    sent is recorded even if the batch is interrupted, so nothing is sent
+    twice. Sent messages are stored without their bodies.
+    """
+    batch = claim_batch(batch_size or settings.EMAIL_QUEUE_BATCH_SIZE, settings.EMAIL_QUEUE_LEASE)
+    if not batch:
+        return 0, 0
+
+    connection = connection or get_connection()
+    sent, failed = [], []
+    pending = deque(batch)
+    try:
+        connection.open()
+        while pending:
+            email = pending.popleft()
+            email.attempts += 1
+            try:
+                connection.send_messages([email.to_message(connection)])
+            except Exception as e:
+                logger.warning('Delivery of email %s failed (attempt %s): %s', email.id, email.attempts, e)
+                email.last_error = str(e)
+                if email.attempts >= settings.EMAIL_QUEUE_MAX_ATTEMPTS:
+                    email.status = 'failed'
+                else:
+                    email.next_attempt_at = timezone.now() + retry_delay(email.attempts)
+                failed.append(email)
+                # The connection may be unusable after an SMTP error; reopen it
+                connection.close()
+                connection.open()
+            else:
+                email.status = 'sent'
+                email.sent_at = timezone.now()
+                email.last_error = ''
+                # Bodies carry reset links and verification codes; keep them no longer than needed
+                email.body = email.html_body = ''
+                sent.append(email)
+    except Exception as e:
+        # Opening the connection failed: the rest of the batch was never tried, so it
+        # is retried later without counting an attempt against it
+        logger.warning('Mail connection failed; %s email(s) left for retry: %s', len(pending), e)
+        retry_at = timezone.now() + retry_delay(1)
+        for email in pending:
+            email.last_error = str(e)
+            email.next_attempt_at = retry_at
+        failed.extend(pending)
+    finally:
+        OutboundEmail.objects.bulk_update(
+            sent + failed,
+            ['status', 'attempts', 'next_attempt_at', 'last_error', 'sent_at', 'body', 'html_body'],
+        )
+    return len(sent), len(failed)
+
+
+def purge_emails(batch_size=1000):
+    """Delete sent and failed messages older than ``EMAIL_QUEUE_RETENTION_DAYS``.
+
+    Deletes in batches of primary keys so each statement holds its locks
+    briefly. Returns the number of rows deleted.
+    """
+    cutoff = timezone.now() - timedelta(days=settings.EMAIL_QUEUE_RETENTION_DAYS)
+    expired = OutboundEmail.objects.filter(
+        Q(status='sent', sent_at__lt=cutoff) | Q(status='failed', created_at__lt=cutoff)
+    )
+    deleted = 0
+    while True:
+        ids = list(expired.order_by('id').values_list('id', flat=True)[:batch_size])
+        if not ids:
+            return deleted
+        deleted += OutboundEmail.objects.filter(id__in=ids).delete()[0]
+
+
+def queue_depth():
+    return OutboundEmail.objects.depth()
@@ -0,0 +1,154 @@
+import datetime
+import smtplib
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from authentication.models import User
+from utils.email_utils import send_password_reset_email
+
+from .models import OutboundEmail
+from .queue import deliver_batch, enqueue_email, purge_emails
+
+
+class FlakyConnection:
+    """Mail connection whose sends and (re)opens fail on request"""
+
+    def __init__(self, fail_sends=(), fail_opens=()):
+        self.fail_sends = set(fail_sends)
+        self.fail_opens = set(fail_opens)
+        self.opens = 0
+        self.outbox = []
+
+    def open(self):
+        self.opens += 1
+        if self.opens in self.fail_opens:
+            raise smtplib.SMTPServerDisconnected('Connection refused')
+
+    def close(self):
+        pass
+
+    def send_messages(self, messages):
+        for message in messages:
+            if message.subject in self.fail_sends:
+                raise smtplib.SMTPDataError(451, 'Try again later')
+            self.outbox.append(message)
+        return len(messages)
+
+
+@override_settings(EMAIL_QUEUE_MAX_ATTEMPTS=5)
+class DeliverBatchTests(TestCase):
+
+    def setUp(self):
+        for subject in ('one', 'two', 'three', 'four'):
+            enqueue_email(subject, ['lecturer@example.com'], 'Body')
+
+    def statuses(self):
+        return {
+            email.subject: (email.status, email.attempts)
+            for email in OutboundEmail.objects.all()
+        }
+
+    def test_sends_batch(self):
+        connection = FlakyConnection()
+
+        self.assertEqual(deliver_batch(connection), (4, 0))
+        self.assertEqual({status for status, _ in self.statuses().values()}, {'sent'})
+
+    def test_failed_reopen_keeps_sent_messages_and_defers_the_rest(self):
+        # "two" fails and reopening the connection afterwards fails too
+        connection = FlakyConnection(fail_sends={'two'}, fail_opens={2})
+
+        self.assertEqual(deliver_batch(connection), (1, 3))
+        self.assertEqual(self.statuses(), {
+            'one': ('sent', 1),
+            'two': ('queued', 1),
+            # Never tried, so no attempt is counted
+            'three': ('queued', 0),
+            'four': ('queued', 0),
+        })
+        for email in OutboundEmail.objects.filter(status='queued'):
+            self.assertIn('Connection refused' if email.attempts == 0 else 'Try again later', email.last_error)
+
+        # Nothing is due again until the retry delay, so "one" is never sent twice
+        self.assertEqual(deliver_batch(FlakyConnection()), (0, 0))
+        self.assertEqual(len(connection.outbox), 1)
+
+    def test_admin_retry_starts_a_fresh_set_of_attempts(self):
+        admin = User.objects.create(
+            email='admin@example.com', fullName='Admin', role='admin', is_staff=True, is_superuser=True
+        )
+        self.client.force_login(admin)
+        OutboundEmail.objects.filter(subject='one').update(status='failed', attempts=5, last_error='Mailbox full')
+        OutboundEmail.objects.filter(subject='two').update(status='sent', attempts=1)
+
+        response = self.client.post('/admin/notifications/outboundemail/', {
+            'action': 'retry_now', '_selected_action': list(OutboundEmail.objects.values_list('pk', flat=True)),
+        })
+
+        self.assertEqual(response.status_code, 302)
+        email = OutboundEmail.objects.get(subject='one')
+        self.assertEqual((email.status, email.attempts, email.last_error), ('queued', 0, ''))
+        self.assertEqual(OutboundEmail.objects.get(subject='two').status, 'sent')
+
+        # One more failure is retried rather than failing the message outright
+        deliver_batch(FlakyConnection(fail_sends={'one'}))
+        self.assertEqual(self.statuses()['one'], ('queued', 1))
+
+    def test_unreachable_server_defers_whole_batch(self):
+        connection = FlakyConnection(fail_opens={1})
+
+        self.assertEqual(deliver_batch(connection), (0, 4))
+        self.assertEqual({status for status, _ in self.statuses().values()}, {'queued'})
+        self.assertEqual(OutboundEmail.objects.due().count(), 0)
+
+
+@override_settings(EMAIL_QUEUE_ENABLED=True, EMAIL_QUEUE_RETENTION_DAYS=7)
+class RetentionTests(TestCase):
+
+    def test_sent_reset_email_leaves_no_token_in_database(self):
+        user = User.objects.create(email='lecturer@example.com', fullName='Ada Lecturer')
+        token = user.create_reset_password_token()
+        send_password_reset_email(user, token)
+        connection = FlakyConnection()
+
+        self.assertEqual(deliver_batch(connection), (1, 0))
+
+        self.assertIn(token, connection.outbox[0].body)
+        email = OutboundEmail.objects.get()
+        self.assertEqual(email.status, 'sent')
+        self.assertEqual((email.body, email.html_body), ('', ''))
+        self.assertFalse(
+            OutboundEmail.objects.filter(body__contains=token.partition('.')[2]).exists()
+        )
+
+    def test_purge_deletes_expired_messages_only(self):
+        old = timezone.now() - datetime.timedelta(days=8)
+        kept = {
+            'queued': enqueue_email('queued', ['a@example.com'], 'Body'),
+            'recent': enqueue_email('recent', ['a@example.com'], 'Body'),
+        }
+        OutboundEmail.objects.filter(pk=kept['queued'].pk).update(created_at=old)
+        OutboundEmail.objects.filter(pk=kept['recent'].pk).update(status='sent', sent_at=timezone.now())
+        for subject, status in [('sent', 'sent'), ('failed', 'failed')]:
+            email = enqueue_email(subject, ['a@example.com'], 'Body')
+            OutboundEmail.objects.filter(pk=email.pk).update(status=status, sent_at=old, created_at=old)
+
+        self.assertEqual(purge_emails(batch_size=1), 2)
+        self.assertEqual(
+            set(OutboundEmail.objects.values_list('subject', flat=True)), {'queued', 'recent'}
+        )
+
+    def test_worker_purges_on_start(self):
+        email = enqueue_email('sent', ['a@example.com'], 'Body')
+        OutboundEmail.objects.filter(pk=email.pk).update(
+            status='sent', sent_at=timezone.now() - datetime.timedelta(days=8)
+        )
+        stdout = StringIO()
+
+        call_command('process_email_queue', once=True, stdout=stdout)
+
+        self.assertFalse(OutboundEmail.objects.exists())
+        self.assertIn('Purged 1', stdout.getvalue())
@@ -23,6 +23,11 @@ python manage.py create_admin --email admin@attendify.com --password admin123 --
 echo "Collecting static files..."
 python manage.py collectstatic --noinput
 
+# Start the email delivery worker
+echo "Starting email queue worker..."
+python manage.py process_email_queue &
+trap "kill $! 2>/dev/null" EXIT
+
 # Start the development server
 echo "Starting Django development server..."
 echo "Server will be available at: http://localhost:8000"
@@ -1,24 +1,72 @@
+from django import forms
 from django.contrib import admin
-from .models import Student
+from .fingerprint import decode_template, InvalidTemplate
+from .models import Enrollment, Student, StudentBiometric
+
+
+class StudentAdminForm(forms.ModelForm):
+    """Student form accepting a scanned fingerprint template"""
+    
+    fingerPrint = forms.CharField(
+        required=False,
+        widget=forms.Textarea,
+        help_text="Paste a scanned template (JSON array or base64 float32) to replace the stored one"
+    )
+    
+    class Meta:
+        model = Student
+        fields = '__all__'
+    
+    def clean_fingerPrint(self):
+        data = self.cleaned_data.get('fingerPrint')
+        if data:
+            try:
+                decode_template(data)
+            except InvalidTemplate as e:
+                raise forms.ValidationError(str(e))
+        return data
+
+
+class StudentBiometricInline(admin.StackedInline):
+    """Read-only summary of the stored fingerprint template"""
+    
+    model = StudentBiometric
+    fields = ['version', 'template_size', 'updated_at']
+    readonly_fields = ['version', 'template_size', 'updated_at']
+    can_delete = True
+    extra = 0
+    max_num = 0
+    
+    @admin.display(description='Template size')
+    def template_size(self, obj):
+        return f"{len(obj.template)} bytes"
+
+
+class EnrollmentInline(admin.TabularInline):
+    """Courses the student is enrolled in"""
+    
+    model = Enrollment
+    fields = ['course', 'session', 'enrolled_at']
+    readonly_fields = ['enrolled_at']
+    autocomplete_fields = ['course']
+    extra = 0
 
 
 @admin.register(Student)
 class StudentAdmin(admin.ModelAdmin):
     """Admin interface for Student model"""
     
+    form = StudentAdminForm
+    inlines = [EnrollmentInline, StudentBiometricInline]
     list_display = ['name', 'regNo', 'level', 'email', 'addmissionYear', 'created_at']
     list_filter = ['level', 'addmissionYear', 'created_at']
     search_fields = ['name', 'regNo', 'email']
     ordering = ['-created_at']
-    filter_horizontal = ['course']  # For many-to-many relationship
     
     fieldsets = (
         ('Student Information', {
             'fields': ('name', 'regNo', 'email', 'level', 'addmissionYear')
         }),
-        ('Courses', {
-            'fields': ('course',)
-        }),
         ('Biometric', {
             'fields': ('fingerPrint',),
             'classes': ('collapse',)
@@ -34,6 +82,11 @@ class StudentAdmin(admin.ModelAdmin):
     def get_queryset(self, request):
         return super().get_queryset(request)
     
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if form.cleaned_data.get('fingerPrint'):
+            obj.set_fingerprint(form.cleaned_data['fingerPrint'])
+    
     def has_add_permission(self, request):
         return request.user.is_superuser or request.user.role in ['admin', 'lecturer']
     
@@ -0,0 +1,290 @@
+import base64
+import binascii
+import json
+import logging
+import struct
+import threading
+import time
+
+import numpy as np
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+# Stored templates use a fixed layout: magic, encoding version, dtype code,
+# feature count and a reserved field, followed by little-endian float32 features
+TEMPLATE_HEADER = struct.Struct('<2sBBHH')
+TEMPLATE_MAGIC = b'AF'
+TEMPLATE_VERSION = 1
+DTYPE_FLOAT32 = 1
+
+
+class InvalidTemplate(ValueError):
+    """Raised when fingerprint data cannot be decoded into a feature vector"""
+
+
+def decode_template(data):
+    """Decode a stored or scanned fingerprint template into a unit-length vector.
+
+    Templates are either a JSON array of numbers or base64 of little-endian
+    float32 features, as sent by the scanner clients.
+    """
+    if isinstance(data, (list, tuple)):
+        values = data
+    elif isinstance(data, str) and data.lstrip().startswith('['):
+        try:
+            values = json.loads(data)
+        except ValueError as e:
+            raise InvalidTemplate(f'Invalid template JSON: {e}')
+    elif isinstance(data, str) and data:
+        try:
+            raw = base64.b64decode(data, validate=True)
+        except (binascii.Error, ValueError) as e:
+            raise InvalidTemplate(f'Invalid template encoding: {e}')
+        if not raw or len(raw) % 4:
+            raise InvalidTemplate('Template length is not a whole number of features')
+        values = np.frombuffer(raw, dtype='<f4')
+    else:
+        raise InvalidTemplate('Empty template')
+
+    try:
+        vector = np.asarray(values, dtype=np.float32).ravel()
+    except (TypeError, ValueError) as e:
+        raise InvalidTemplate(f'Template features must be numbers: {e}')
+    norm = np.linalg.norm(vector)
+    if not vector.size or not np.isfinite(norm) or norm == 0:
+        raise InvalidTemplate('Template has no usable features')
+    return vector / norm
+
+
+def pack_template(vector):
+    """Encode a unit-length feature vector in the stored binary layout"""
+    vector = np.asarray(vector, dtype='<f4').ravel()
+    if not 0 < vector.size <= 0xFFFF:
+        raise InvalidTemplate('Template must have between 1 and 65535 features')
+    header = TEMPLATE_HEADER.pack(TEMPLATE_MAGIC, TEMPLATE_VERSION, DTYPE_FLOAT32, vector.size, 0)
+    return header + vector.tobytes()
+
+
+def unpack_template(blob):
+    """Decode a stored binary template into a float32 vector"""
+    blob = bytes(blob)
+    if len(blob) < TEMPLATE_HEADER.size:
+        raise InvalidTemplate('Template is shorter than its header')
+    magic, version, dtype, dim, _ = TEMPLATE_HEADER.unpack_from(blob)
+    if magic != TEMPLATE_MAGIC:
+        raise InvalidTemplate('Not a fingerprint template')
+    if version != TEMPLATE_VERSION or dtype != DTYPE_FLOAT32:
+        raise InvalidTemplate(f'Unsupported template encoding v{version}/{dtype}')
+    if len(blob) != TEMPLATE_HEADER.size + dim * 4:
+        raise InvalidTemplate('Template length does not match its header')
+    return np.frombuffer(blob, dtype='<f4', offset=TEMPLATE_HEADER.size)
+
+
+class FingerprintIndex:
+    """In-memory matrix of unit-length templates for one course or level.
+
+    Rows live in a preallocated buffer that doubles when full, and removals
+    move the last row into the freed slot, so incremental updates never copy
+    the whole matrix. Matching is one matrix-vector product.
+    """
+
+    def __init__(self, dim=None, capacity=64):
+        self.dim = dim
+        self._capacity = capacity
+        self._matrix = None
+        self._ids = np.empty(capacity, dtype=np.int64)
+        self._row_by_id = {}
+        self._count = 0
+        self._lock = threading.Lock()
+        self.built_at = time.monotonic()
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, student_id):
+        return student_id in self._row_by_id
+
+    def add(self, student_id, vector):
+        """Insert or replace the template of a student"""
+        with self._lock:
+            if self.dim is None:
+                self.dim = vector.shape[0]
+            if vector.shape[0] != self.dim:
+                raise InvalidTemplate(f'Template has {vector.shape[0]} features, index expects {self.dim}')
+            if self._matrix is None:
+                self._matrix = np.empty((self._capacity, self.dim), dtype=np.float32)
+
+            row = self._row_by_id.get(student_id)
+            if row is None:
+                if self._count == self._capacity:
+                    self._grow()
+                row = self._count
+                self._count += 1
+                self._ids[row] = student_id
+                self._row_by_id[student_id] = row
+            self._matrix[row] = vector
+
+    def remove(self, student_id):
+        with self._lock:
+            row = self._row_by_id.pop(student_id, None)
+            if row is None:
+                return
+            last = self._count - 1
+            if row != last:
+                moved_id = int(self._ids[last])
+                self._matrix[row] = self._matrix[last]
+                self._ids[row] = moved_id
+                self._row_by_id[moved_id] = row
+            self._count = last
+
+    def _grow(self):
+        self._capacity *= 2
+        matrix = np.empty((self._capacity, self.dim), dtype=np.float32)
+        matrix[:self._count] = self._matrix[:self._count]
+        self._matrix = matrix
+        ids = np.empty(self._capacity, dtype=np.int64)
+        ids[:self._count] = self._ids[:self._count]
+        self._ids = ids
+
+    def identify(self, probe, max_distance=None):
+        """Return ``(student_id, distance)`` of the closest template, or None.
+
+        For unit vectors the squared Euclidean distance is ``2 - 2 * a.b``, so
+        a single matrix-vector product scores every enrolled template.
+        """
+        if max_distance is None:
+            max_distance = settings.FINGERPRINT_MATCH_MAX_DISTANCE
+        with self._lock:
+            if not self._count or probe.shape[0] != self.dim:
+                return None
+            scores = self._matrix[:self._count] @ probe
+            best = int(np.argmax(scores))
+            student_id = int(self._ids[best])
+            score = float(scores[best])
+        distance = float(np.sqrt(max(0.0, 2.0 - 2.0 * score)))
+        if distance > max_distance:
+            return None
+        return student_id, distance
+
+
+class FingerprintIndexRegistry:
+    """Process-wide indexes keyed by ``('course', id)`` or ``('level', level)``.
+
+    Indexes are built on first use and kept current by the ``Student`` signals
+    in this process. Other processes pick changes up when their copy is older
+    than ``FINGERPRINT_INDEX_TTL`` seconds.
+    """
+
+    def __init__(self):
+        self._indexes = {}
+        self._lock = threading.Lock()
+
+    def get(self, course_id=None, level=None):
+        if course_id is not None:
+            key = ('course', int(course_id))
+        elif level is not None:
+            key = ('level', str(level))
+        else:
+            raise ValueError('course_id or level is required')
+
+        index = self._indexes.get(key)
+        if index is None or time.monotonic() - index.built_at > settings.FINGERPRINT_INDEX_TTL:
+            index = self._build(key)
+            with self._lock:
+                self._indexes[key] = index
+        return index
+
+    def _build(self, key):
+        from .models import StudentBiometric
+
+        kind, value = key
+        biometrics = StudentBiometric.objects.all()
+        if kind == 'course':
+            biometrics = biometrics.filter(student__course__id=value)
+        else:
+            biometrics = biometrics.filter(student__level=value)
+
+        index = FingerprintIndex()
+        for student_id, template in biometrics.values_list('student_id', 'template').iterator(chunk_size=1000):
+            self._add(index, student_id, template)
+        return index
+
+    @staticmethod
+    def _add(index, student_id, template):
+        try:
+            index.add(student_id, unpack_template(template))
+        except InvalidTemplate as e:
+            logger.warning('Skipping fingerprint of student %s: %s', student_id, e)
+            index.remove(student_id)
+
+    @staticmethod
+    def _templates(student_ids):
+        from .models import StudentBiometric
+
+        return StudentBiometric.objects.filter(student_id__in=student_ids).values_list('student_id', 'template')
+
+    def loaded_keys(self):
+        with self._lock:
+            return list(self._indexes)
+
+    def update_student(self, student_id):
+        """Add, move or drop a student in every loaded index"""
+        keys = self.loaded_keys()
+        if not keys:
+            return
+
+        from .models import Student
+
+        level = Student.objects.filter(pk=student_id).values_list('level', flat=True).first()
+        template = dict(self._templates([student_id])).get(student_id)
+        course_ids = None
+        for key in keys:
+            kind, value = key
+            index = self._indexes.get(key)
+            if index is None:
+                continue
+            if level is None or template is None:
+                member = False
+            elif kind == 'level':
+                member = level == value
+            else:
+                if course_ids is None:
+                    course_ids = set(Student.course.through.objects.filter(
+                        student_id=student_id
+                    ).values_list('course_id', flat=True))
+                member = value in course_ids
+            if member:
+                self._add(index, student_id, template)
+            else:
+                index.remove(student_id)
+
+    def add_to_course(self, course_id, student_ids):
+        index = self._indexes.get(('course', course_id))
+        if index is not None:
+            for student_id, template in self._templates(student_ids):
+                self._add(index, student_id, template)
+
+    def remove_from_course(self, course_id, student_ids):
+        index = self._indexes.get(('course', course_id))
+        if index is not None:
+            for student_id in student_ids:
+                index.remove(student_id)
+
+    def remove_student(self, student_id, kind=None):
+        for key in self.loaded_keys():
+            index = self._indexes.get(key)
+            if index is not None and kind in (None, key[0]):
+                index.remove(student_id)
+
+    def discard(self, key):
+        with self._lock:
+            self._indexes.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._indexes.clear()
+
+
+fingerprint_indexes = FingerprintIndexRegistry()
@@ -0,0 +1,159 @@
+import re
+
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+
+from academic_sessions.resolver import get_active_session
+from courses.models import Course
+from utils.spreadsheets import SPREADSHEET_READERS, SpreadsheetError, header_columns, row_values
+from .models import Enrollment, Student
+from .rosters import invalidate_rosters
+
+# Normalized header -> Student field
+HEADER_ALIASES = {
+    'name': 'name',
+    'fullname': 'name',
+    'studentname': 'name',
+    'regno': 'regNo',
+    'registrationnumber': 'regNo',
+    'matricno': 'regNo',
+    'level': 'level',
+    'addmissionyear': 'addmissionYear',
+    'admissionyear': 'addmissionYear',
+    'email': 'email',
+    'courses': 'courses',
+    'course': 'courses',
+    'coursecodes': 'courses',
+}
+REQUIRED_COLUMNS = ['name', 'regNo', 'level', 'addmissionYear', 'email']
+COURSE_SEPARATOR = re.compile(r'[;,\s]+')
+
+MAX_LENGTHS = {
+    name: Student._meta.get_field(name).max_length
+    for name in ['name', 'regNo', 'level', 'addmissionYear', 'email']
+}
+
+
+class StudentImporter:
+    """Validate spreadsheet rows and create students with their enrollments in chunks.
+
+    Existing registration numbers and course codes are loaded once, so a
+    row is checked with set and dict lookups only. Valid rows are written
+    with ``bulk_create`` every ``chunk_size`` rows; invalid rows are skipped
+    and reported with their row number.
+    """
+
+    def __init__(self, chunk_size=1000, dry_run=False):
+        self.chunk_size = chunk_size
+        self.dry_run = dry_run
+        self.session = get_active_session()
+        self.reg_nos = set(Student.objects.values_list('regNo', flat=True))
+        # regNo -> row number of rows accepted from this file
+        self.imported = {}
+        self.course_ids = {}
+        for course_id, code in Course.objects.values_list('id', 'courseCode'):
+            self.course_ids.setdefault(code.upper(), course_id)
+        self.pending = []
+        self.result = {'rows': 0, 'created': 0, 'enrollments': 0, 'rejected': 0, 'errors': []}
+
+    def run(self, rows):
+        rows = iter(rows)
+        header = next(rows, None)
+        if header is None:
+            raise SpreadsheetError('The file is empty')
+        columns = header_columns(header, HEADER_ALIASES, REQUIRED_COLUMNS)
+
+        with transaction.atomic():
+            # Row 1 is the header
+            for number, row in enumerate(rows, start=2):
+                if not any(str(value).strip() for value in row):
+                    continue
+                self.result['rows'] += 1
+                self.add_row(number, row, columns)
+                if len(self.pending) >= self.chunk_size:
+                    self.write()
+            self.write()
+
+        if self.result['enrollments']:
+            invalidate_rosters()
+        return self.result
+
+    def add_row(self, number, row, columns):
+        values = row_values(row, columns)
+        errors = []
+
+        for field in REQUIRED_COLUMNS:
+            if not values[field]:
+                errors.append(f'{field} is required')
+            elif len(values[field]) > MAX_LENGTHS[field]:
+                errors.append(f'{field} must be at most {MAX_LENGTHS[field]} characters')
+        if values['email']:
+            try:
+                validate_email(values['email'])
+            except ValidationError:
+                errors.append('email is invalid')
+
+        reg_no = values['regNo']
+        if reg_no in self.imported:
+            errors.append(f'regNo repeats row {self.imported[reg_no]}')
+        elif reg_no in self.reg_nos:
+            errors.append('regNo already exists')
+
+        course_ids = []
+        for code in COURSE_SEPARATOR.split(values.get('courses', '')):
+            if not code:
+                continue
+            course_id = self.course_ids.get(code.upper())
+            if course_id is None:
+                errors.append(f'Unknown course code "{code}"')
+            elif course_id not in course_ids:
+                course_ids.append(course_id)
+
+        if errors:
+            self.result['rejected'] += 1
+            self.result['errors'].append({'row': number, 'regNo': reg_no, 'errors': errors})
+            return
+
+        self.imported[reg_no] = number
+        student = Student(
+            name=values['name'],
+            regNo=reg_no,
+            level=values['level'],
+            addmissionYear=values['addmissionYear'],
+            email=values['email'],
+        )
+        self.pending.append((student, course_ids))
+
+    def write(self):
+        if not self.pending:
+            return
+        students = [student for student, _ in self.pending]
+        if not self.dry_run:
+            Student.objects.bulk_create(students, batch_size=self.chunk_size)
+            enrollments = Enrollment.objects.bulk_create(
+                [
+                    Enrollment(student=student, course_id=course_id, session=self.session)
+                    for student, course_ids in self.pending
+                    for course_id in course_ids
+                ],
+                batch_size=self.chunk_size,
+            )
+            self.result['enrollments'] += len(enrollments)
+        else:
+            self.result['enrollments'] += sum(len(course_ids) for _, course_ids in self.pending)
+        self.result['created'] += len(students)
+        self.pending = []
+
+
+def import_students(file, file_type, chunk_size=1000, dry_run=False):
+    """Import students from a CSV or XLSX file object; returns counts and row errors.
+
+    Columns are ``name``, ``regNo``, ``level``, ``addmissionYear``, ``email``
+    and optionally ``courses`` (course codes separated by ``;``, ``,`` or
+    spaces). The whole import runs in one transaction.
+    """
+    reader = SPREADSHEET_READERS.get(file_type)
+    if reader is None:
+        raise SpreadsheetError(f"Unsupported file type. Use one of: {', '.join(SPREADSHEET_READERS)}")
+    return StudentImporter(chunk_size=chunk_size, dry_run=dry_run).run(reader(file))
@@ -0,0 +1,50 @@
+import statistics
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from students.fingerprint import FingerprintIndex
+
+
+class Command(BaseCommand):
+    help = 'Benchmark 1:N fingerprint identification against an in-memory index'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=5000, help='Templates in the index')
+        parser.add_argument('--dim', type=int, default=256, help='Features per template')
+        parser.add_argument('--probes', type=int, default=1000, help='Identifications to time')
+        parser.add_argument('--noise', type=float, default=0.05, help='Scan noise added to probes')
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(0)
+        count, dim = options['students'], options['dim']
+
+        templates = rng.standard_normal((count, dim)).astype(np.float32)
+        templates /= np.linalg.norm(templates, axis=1, keepdims=True)
+
+        start = time.perf_counter()
+        index = FingerprintIndex()
+        for student_id, vector in enumerate(templates, start=1):
+            index.add(student_id, vector)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        timings = []
+        correct = 0
+        for _ in range(options['probes']):
+            target = int(rng.integers(count))
+            probe = templates[target] + rng.standard_normal(dim).astype(np.float32) * options['noise']
+            probe /= np.linalg.norm(probe)
+
+            start = time.perf_counter()
+            match = index.identify(probe, max_distance=2.0)
+            timings.append((time.perf_counter() - start) * 1000)
+            correct += match is not None and match[0] == target + 1
+
+        ordered = sorted(timings)
+        self.stdout.write(f'Index of {count} x {dim} built in {build_ms:.1f} ms')
+        self.stdout.write(
+            f'identify: median {statistics.median(ordered):.3f} ms, '
+            f'p99 {ordered[int(0.99 * (len(ordered) - 1))]:.3f} ms, '
+            f'accuracy {correct / len(ordered):.1%}'
+        )
@@ -0,0 +1,65 @@
+import csv
+import io
+import resource
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from courses.models import Course
+from students.imports import import_students
+from utils.spreadsheets import stream_xlsx
+
+
+class Command(BaseCommand):
+    help = 'Import a synthetic student file and report throughput and peak RSS'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000, help='Students in the file')
+        parser.add_argument('--courses', type=int, default=5, help='Courses each student enrolls in')
+        parser.add_argument('--type', choices=['csv', 'xlsx'], default='csv', help='File format')
+
+    def handle(self, *args, **options):
+        rows, courses = options['rows'], options['courses']
+
+        # Synthetic data lives only inside this transaction and is rolled back
+        with transaction.atomic(), tempfile.TemporaryFile() as file:
+            codes = [f'BENCH-IMP{i}' for i in range(courses)]
+            Course.objects.bulk_create([
+                Course(courseTitle=f'Benchmark {code}', courseCode=code, level='100') for code in codes
+            ])
+            self.write_file(file, options['type'], rows, ';'.join(codes))
+            file.seek(0)
+
+            peak_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+            start = time.perf_counter()
+            result = import_students(file, options['type'])
+            elapsed = time.perf_counter() - start
+
+            self.stdout.write(
+                f"Imported {result['created']} students and {result['enrollments']} enrollments "
+                f"from {options['type']} in {elapsed:.2f} s ({result['created'] / elapsed:,.0f} rows/s)"
+            )
+            self.stdout.write(
+                f'Peak RSS {peak_before:.1f} -> '
+                f'{resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MiB'
+            )
+            transaction.set_rollback(True)
+
+    def write_file(self, file, file_type, rows, courses):
+        header = ['name', 'regNo', 'level', 'addmissionYear', 'email', 'courses']
+        records = (
+            [f'Student {i}', f'BENCH/IMP/{i:06d}', '100', '2024', f'bench-import-{i}@attendify.invalid', courses]
+            for i in range(rows)
+        )
+        if file_type == 'xlsx':
+            for chunk in stream_xlsx(header, records):
+                file.write(chunk)
+            return
+        text = io.TextIOWrapper(file, encoding='utf-8', newline='')
+        writer = csv.writer(text)
+        writer.writerow(header)
+        writer.writerows(records)
+        text.flush()
+        text.detach()
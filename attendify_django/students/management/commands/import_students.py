@@ -0,0 +1,48 @@
+import csv
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from students.imports import import_students
+from utils.spreadsheets import SPREADSHEET_READERS, SpreadsheetError
+
+
+class Command(BaseCommand):
+    help = 'Create students and their course enrollments from a CSV or XLSX file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or XLSX file with a header row')
+        parser.add_argument('--type', choices=list(SPREADSHEET_READERS), help='File type (default: from the extension)')
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Students written per insert')
+        parser.add_argument('--dry-run', action='store_true', help='Validate without writing')
+        parser.add_argument('--report', help='Write rejected rows to this CSV file')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_type = options['type'] or os.path.splitext(path)[1].lstrip('.').lower()
+
+        try:
+            with open(path, 'rb') as file:
+                result = import_students(
+                    file, file_type, chunk_size=options['chunk_size'], dry_run=options['dry_run']
+                )
+        except (OSError, SpreadsheetError) as e:
+            raise CommandError(str(e))
+
+        if options['report']:
+            with open(options['report'], 'w', newline='', encoding='utf-8') as report:
+                writer = csv.writer(report)
+                writer.writerow(['row', 'regNo', 'error'])
+                for error in result['errors']:
+                    writer.writerow([error['row'], error['regNo'], '; '.join(error['errors'])])
+        else:
+            for error in result['errors'][:20]:
+                self.stdout.write(f"Row {error['row']} ({error['regNo'] or 'no regNo'}): {'; '.join(error['errors'])}")
+            if len(result['errors']) > 20:
+                self.stdout.write(f"... {len(result['errors']) - 20} more; use --report to write them all")
+
+        verb = 'Validated' if options['dry_run'] else 'Imported'
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {result['created']} of {result['rows']} students "
+            f"({result['enrollments']} enrollments, {result['rejected']} rejected)."
+        ))
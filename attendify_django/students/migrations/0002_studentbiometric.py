@@ -0,0 +1,46 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("students", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StudentBiometric",
+            fields=[
+                (
+                    "student",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="biometric",
+                        serialize=False,
+                        to="students.student",
+                    ),
+                ),
+                (
+                    "template",
+                    models.BinaryField(help_text="Encoded fingerprint template"),
+                ),
+                (
+                    "version",
+                    models.PositiveSmallIntegerField(
+                        default=1, help_text="Template encoding version"
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Student Biometric",
+                "verbose_name_plural": "Student Biometrics",
+                "db_table": "students_studentbiometric",
+            },
+        ),
+    ]
@@ -0,0 +1,122 @@
+import base64
+import json
+import logging
+import math
+import struct
+import sys
+from array import array
+
+from django.db import migrations
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+
+# Version 1 layout: magic, version, dtype code (1 = float32), feature count,
+# reserved; followed by little-endian float32 features
+HEADER = struct.Struct("<2sBBHH")
+
+
+def text_to_features(text):
+    """Decode a legacy JSON array or base64 float32 template"""
+    text = text.strip()
+    if text.startswith("["):
+        features = array("f", (float(value) for value in json.loads(text)))
+    else:
+        features = array("f")
+        features.frombytes(base64.b64decode(text, validate=True))
+        if sys.byteorder == "big":
+            features.byteswap()
+    norm = math.sqrt(sum(value * value for value in features))
+    if not features or not 0 < norm < math.inf or len(features) > 0xFFFF:
+        raise ValueError("unusable template")
+    return array("f", (value / norm for value in features))
+
+
+def pack(features):
+    if sys.byteorder == "big":
+        features = array("f", features)
+        features.byteswap()
+    return HEADER.pack(b"AF", 1, 1, len(features), 0) + features.tobytes()
+
+
+def unpack(blob):
+    blob = bytes(blob)
+    _, _, _, dim, _ = HEADER.unpack_from(blob)
+    features = array("f")
+    features.frombytes(blob[HEADER.size : HEADER.size + dim * 4])
+    if sys.byteorder == "big":
+        features.byteswap()
+    return features
+
+
+def copy_fingerprints(apps, schema_editor):
+    """Stream text templates into StudentBiometric rows in batches"""
+    Student = apps.get_model("students", "Student")
+    StudentBiometric = apps.get_model("students", "StudentBiometric")
+
+    templates = (
+        Student.objects.exclude(fingerPrint="")
+        .order_by("pk")
+        .values_list("pk", "fingerPrint")
+        .iterator(chunk_size=BATCH_SIZE)
+    )
+    batch = []
+    skipped = 0
+    for student_id, text in templates:
+        try:
+            template = pack(text_to_features(text))
+        except (ValueError, TypeError, struct.error) as e:
+            # Kept in Student.fingerPrint; 0004 won't drop the column until it is dealt with
+            logger.warning("Fingerprint of student %s not converted: %s", student_id, e)
+            skipped += 1
+            continue
+        batch.append(
+            StudentBiometric(student_id=student_id, template=template, version=1)
+        )
+        if len(batch) >= BATCH_SIZE:
+            StudentBiometric.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    if batch:
+        StudentBiometric.objects.bulk_create(batch, ignore_conflicts=True)
+    if skipped:
+        logger.warning(
+            "%s fingerprint template(s) could not be converted and remain in "
+            "Student.fingerPrint",
+            skipped,
+        )
+
+
+def restore_fingerprints(apps, schema_editor):
+    """Write templates back to the text column as base64 float32"""
+    Student = apps.get_model("students", "Student")
+    StudentBiometric = apps.get_model("students", "StudentBiometric")
+
+    templates = (
+        StudentBiometric.objects.order_by("pk")
+        .values_list("student_id", "template")
+        .iterator(chunk_size=BATCH_SIZE)
+    )
+    batch = []
+    for student_id, blob in templates:
+        features = unpack(blob)
+        if sys.byteorder == "big":
+            features.byteswap()
+        text = base64.b64encode(features.tobytes()).decode("ascii")
+        batch.append(Student(pk=student_id, fingerPrint=text))
+        if len(batch) >= BATCH_SIZE:
+            Student.objects.bulk_update(batch, ["fingerPrint"])
+            batch = []
+    if batch:
+        Student.objects.bulk_update(batch, ["fingerPrint"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("students", "0002_studentbiometric"),
+    ]
+
+    operations = [
+        migrations.RunPython(copy_fingerprints, restore_fingerprints),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:15
+
+from django.db import migrations, models
+
+# Student ids listed in the error when templates are left unconverted
+LISTED = 20
+
+
+def check_converted(apps, schema_editor):
+    """Refuse to drop the text column while it holds templates with no biometric row"""
+    Student = apps.get_model("students", "Student")
+    unconverted = (
+        Student.objects.exclude(fingerPrint="")
+        .filter(biometric__isnull=True)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+    count = unconverted.count()
+    if count:
+        listed = ", ".join(map(str, unconverted[:LISTED]))
+        raise RuntimeError(
+            f"{count} student fingerprint template(s) could not be converted "
+            f"(students {listed}{', ...' if count > LISTED else ''}). Re-enroll them with "
+            "Student.set_fingerprint() or clear Student.fingerPrint, then migrate again; "
+            "dropping the column would lose them."
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("students", "0003_copy_fingerprints_to_biometric"),
+    ]
+
+    operations = [
+        migrations.RunPython(check_converted, migrations.RunPython.noop),
+        # A default lets the column be re-added when migrating backwards
+        migrations.AlterField(
+            model_name="student",
+            name="fingerPrint",
+            field=models.TextField(
+                blank=True, default="", help_text="Fingerprint data"
+            ),
+        ),
+        migrations.RemoveField(
+            model_name="student",
+            name="fingerPrint",
+        ),
+    ]
@@ -0,0 +1,100 @@
+# Generated by Django 5.2.4 on 2026-10-18 11:05
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("academic_sessions", "0003_semester"),
+        ("courses", "0002_course_semester_fk"),
+        ("students", "0004_remove_student_fingerprint"),
+    ]
+
+    operations = [
+        # Adopt the auto-created many-to-many table as-is: no rows are copied
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name="Enrollment",
+                    fields=[
+                        (
+                            "id",
+                            models.BigAutoField(
+                                auto_created=True,
+                                primary_key=True,
+                                serialize=False,
+                                verbose_name="ID",
+                            ),
+                        ),
+                        (
+                            "course",
+                            models.ForeignKey(
+                                on_delete=django.db.models.deletion.CASCADE,
+                                related_name="enrollments",
+                                to="courses.course",
+                            ),
+                        ),
+                        (
+                            "student",
+                            models.ForeignKey(
+                                on_delete=django.db.models.deletion.CASCADE,
+                                related_name="enrollments",
+                                to="students.student",
+                            ),
+                        ),
+                    ],
+                    options={
+                        "verbose_name": "Enrollment",
+                        "verbose_name_plural": "Enrollments",
+                        "db_table": "students_student_course",
+                        "unique_together": {("student", "course")},
+                    },
+                ),
+                migrations.AlterField(
+                    model_name="student",
+                    name="course",
+                    field=models.ManyToManyField(
+                        help_text="Enrolled courses",
+                        related_name="students",
+                        through="students.Enrollment",
+                        to="courses.course",
+                    ),
+                ),
+            ],
+            database_operations=[],
+        ),
+        migrations.AddField(
+            model_name="enrollment",
+            name="session",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Academic session the student enrolled in",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="enrollments",
+                to="academic_sessions.academicsession",
+            ),
+        ),
+        migrations.AddField(
+            model_name="enrollment",
+            name="enrolled_at",
+            field=models.DateTimeField(
+                auto_now_add=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+        # Lead the unique index with the course so rosters are read from it alone
+        migrations.AlterUniqueTogether(
+            name="enrollment",
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name="enrollment",
+            constraint=models.UniqueConstraint(
+                fields=("course", "student"), name="enrollment_course_student_uniq"
+            ),
+        ),
+    ]
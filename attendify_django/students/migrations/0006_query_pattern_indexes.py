@@ -0,0 +1,24 @@
+# Generated by Django 5.2.4 on 2026-10-18 15:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0004_query_pattern_indexes"),
+        ("students", "0005_enrollment"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="student",
+            index=models.Index(
+                fields=["level", "regNo"], name="student_level_regno_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="student",
+            index=models.Index(fields=["-created_at"], name="student_created_idx"),
+        ),
+    ]
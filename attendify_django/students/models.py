@@ -1,4 +1,5 @@
 from django.db import models
+from academic_sessions.models import AcademicSession
 from courses.models import Course
 
 
@@ -8,8 +9,12 @@ class Student(models.Model):
     name = models.CharField(max_length=255, help_text="Student name")
     regNo = models.CharField(max_length=50, unique=True, help_text="Registration number")
     level = models.CharField(max_length=20, help_text="Academic level")
-    course = models.ManyToManyField(Course, related_name='students', help_text="Enrolled courses")
-    fingerPrint = models.TextField(help_text="Fingerprint data")
+    course = models.ManyToManyField(
+        Course,
+        through='Enrollment',
+        related_name='students',
+        help_text="Enrolled courses"
+    )
     addmissionYear = models.CharField(max_length=10, help_text="Admission year")
     email = models.EmailField(help_text="Student email")
     
@@ -21,6 +26,85 @@ class Student(models.Model):
         verbose_name = 'Student'
         verbose_name_plural = 'Students'
         ordering = ['regNo']
+        indexes = [
+            # The level filter pages by regNo
+            models.Index(fields=['level', 'regNo'], name='student_level_regno_idx'),
+            # Admin change list
+            models.Index(fields=['-created_at'], name='student_created_idx'),
+        ]
     
     def __str__(self):
         return f"{self.regNo} - {self.name}"
+    
+    def set_fingerprint(self, data):
+        """Store a scanned template (JSON array or base64 float32) for this student"""
+        from .fingerprint import decode_template, pack_template, TEMPLATE_VERSION
+        
+        biometric, _ = StudentBiometric.objects.update_or_create(
+            student=self,
+            defaults={
+                'template': pack_template(decode_template(data)),
+                'version': TEMPLATE_VERSION,
+            }
+        )
+        return biometric
+
+
+class Enrollment(models.Model):
+    """A student's enrollment in a course; the through table of ``Student.course``.
+
+    The unique index leads with the course so a course roster is read from
+    the index alone.
+    """
+    
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='enrollments')
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='enrollments')
+    session = models.ForeignKey(
+        AcademicSession,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='enrollments',
+        help_text="Academic session the student enrolled in"
+    )
+    enrolled_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        # The table Django created for the plain many-to-many field
+        db_table = 'students_student_course'
+        verbose_name = 'Enrollment'
+        verbose_name_plural = 'Enrollments'
+        constraints = [
+            models.UniqueConstraint(fields=['course', 'student'], name='enrollment_course_student_uniq'),
+        ]
+    
+    def __str__(self):
+        return f"{self.student_id} in {self.course_id}"
+
+
+class StudentBiometric(models.Model):
+    """Fingerprint template of a student, kept out of the student row.
+
+    Student queries never load template bytes unless they join ``biometric``
+    explicitly (``select_related('biometric')``).
+    """
+    
+    student = models.OneToOneField(
+        Student,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='biometric'
+    )
+    template = models.BinaryField(help_text="Encoded fingerprint template")
+    version = models.PositiveSmallIntegerField(default=1, help_text="Template encoding version")
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'students_studentbiometric'
+        verbose_name = 'Student Biometric'
+        verbose_name_plural = 'Student Biometrics'
+    
+    def __str__(self):
+        return f"Fingerprint of student {self.student_id} (v{self.version})"
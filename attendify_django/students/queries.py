@@ -0,0 +1,37 @@
+from utils.pagination import KeysetPagination
+from utils.query_audit import canonical_query
+from .models import Enrollment, Student
+
+
+def _page(queryset):
+    return KeysetPagination().page_queryset(queryset, ['CSC/2024/001', 1])
+
+
+@canonical_query('students.list')
+def student_list():
+    return _page(Student.objects.all())
+
+
+@canonical_query('students.list_by_level')
+def students_by_level():
+    return _page(Student.objects.filter(level='100'))
+
+
+@canonical_query('students.list_by_course')
+def students_by_course():
+    return _page(Student.objects.filter(course__id=1))
+
+
+@canonical_query('students.roster')
+def roster():
+    return Enrollment.objects.filter(course_id=1).values_list('student_id', flat=True)
+
+
+@canonical_query('students.by_reg_no')
+def students_by_reg_no():
+    return Student.objects.filter(regNo__in=['CSC/2024/001', 'CSC/2024/002']).values_list('regNo', 'id')
+
+
+@canonical_query('students.admin_recent')
+def admin_recent():
+    return Student.objects.order_by('-created_at')[:100]
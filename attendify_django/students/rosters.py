@@ -0,0 +1,47 @@
+from django.conf import settings
+
+from utils.versioned_cache import VersionedLocalCache
+from .models import Enrollment
+
+roster_cache = VersionedLocalCache('students:rosters', timeout=settings.ROSTER_CACHE_TIMEOUT)
+
+
+def _load_roster(course_id):
+    return frozenset(
+        Enrollment.objects.filter(course_id=course_id).values_list('student_id', flat=True)
+    )
+
+
+def get_roster(course_id):
+    """Ids of the students enrolled in a course, loaded once per process.
+
+    Any enrollment change bumps the cache version, so every process reloads
+    its rosters on the next lookup.
+    """
+    return roster_cache.get_or_set(course_id, lambda: _load_roster(course_id))
+
+
+def enrolled_among(course_id, student_ids):
+    """The subset of ``student_ids`` enrolled in a course.
+
+    The cached roster answers the common case. Ids missing from it are
+    checked against ``Enrollment`` in one query before being treated as not
+    enrolled, since with a per-process cache another worker's enrollment
+    may not have reached this process yet.
+    """
+    student_ids = set(student_ids)
+    roster = get_roster(course_id)
+    missing = student_ids - roster
+    if not missing:
+        return student_ids
+    return (student_ids & roster) | set(
+        Enrollment.objects.filter(course_id=course_id, student_id__in=missing).values_list('student_id', flat=True)
+    )
+
+
+def is_enrolled(student_id, course_id):
+    return student_id in enrolled_among(course_id, [student_id])
+
+
+def invalidate_rosters():
+    roster_cache.bump()
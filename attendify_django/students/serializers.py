@@ -0,0 +1,31 @@
+from rest_framework import serializers
+
+from utils.serializers import SpreadsheetUploadSerializer
+from .models import Student
+
+
+class StudentSerializer(serializers.ModelSerializer):
+    """Serializer for student data"""
+    
+    class Meta:
+        model = Student
+        fields = ['id', 'name', 'regNo', 'level', 'email', 'addmissionYear']
+
+
+class FingerprintIdentifySerializer(serializers.Serializer):
+    """Serializer for identifying a student from a fingerprint scan"""
+    
+    fingerPrint = serializers.JSONField()
+    courseId = serializers.IntegerField(required=False)
+    level = serializers.CharField(max_length=20, required=False)
+    
+    def validate(self, attrs):
+        """Require the scope the scan should be matched against"""
+        if attrs.get('courseId') is None and not attrs.get('level'):
+            raise serializers.ValidationError("courseId or level is required")
+        
+        return attrs
+
+
+class StudentImportSerializer(SpreadsheetUploadSerializer):
+    """Serializer for a CSV or XLSX file of students to create"""
@@ -0,0 +1,66 @@
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from .fingerprint import fingerprint_indexes
+from .models import Enrollment, Student, StudentBiometric
+from .rosters import invalidate_rosters
+
+
+@receiver(post_save, sender=Student)
+@receiver(post_save, sender=StudentBiometric)
+@receiver(post_delete, sender=StudentBiometric)
+def update_fingerprint_index(sender, instance, **kwargs):
+    """Keep loaded fingerprint indexes in step with the saved student or template"""
+    fingerprint_indexes.update_student(instance.pk)
+
+
+@receiver(post_delete, sender=Student)
+def remove_from_fingerprint_index(sender, instance, **kwargs):
+    fingerprint_indexes.remove_student(instance.pk)
+
+
+@receiver(m2m_changed, sender=Student.course.through)
+def sync_course_fingerprint_index(sender, instance, action, reverse, pk_set, **kwargs):
+    """Apply enrollment changes to the per-course fingerprint indexes"""
+    if not reverse:
+        # instance is a Student, pk_set holds course ids
+        if action == 'post_add':
+            for course_id in pk_set:
+                fingerprint_indexes.add_to_course(course_id, [instance.pk])
+        elif action == 'post_remove':
+            for course_id in pk_set:
+                fingerprint_indexes.remove_from_course(course_id, [instance.pk])
+        elif action == 'pre_clear':
+            fingerprint_indexes.remove_student(instance.pk, kind='course')
+    else:
+        # instance is a Course, pk_set holds student ids
+        if action == 'post_add':
+            fingerprint_indexes.add_to_course(instance.pk, pk_set)
+        elif action == 'post_remove':
+            fingerprint_indexes.remove_from_course(instance.pk, pk_set)
+        elif action == 'pre_clear':
+            fingerprint_indexes.discard(('course', instance.pk))
+
+
+@receiver(post_save, sender=Enrollment)
+def sync_enrollment_fingerprint_index(sender, instance, created, **kwargs):
+    """Enrollment rows saved directly (admin inline, ORM) send no ``m2m_changed``"""
+    if created:
+        fingerprint_indexes.add_to_course(instance.course_id, [instance.student_id])
+    else:
+        # The course may have been changed; recheck every loaded index
+        fingerprint_indexes.update_student(instance.student_id)
+
+
+@receiver(post_delete, sender=Enrollment)
+def remove_enrollment_from_fingerprint_index(sender, instance, **kwargs):
+    fingerprint_indexes.remove_from_course(instance.course_id, [instance.student_id])
+
+
+@receiver(m2m_changed, sender=Student.course.through)
+@receiver(post_save, sender=Enrollment)
+@receiver(post_delete, sender=Enrollment)
+def invalidate_course_rosters(sender, action=None, **kwargs):
+    """Drop cached rosters when enrollments change, however they were written"""
+    if action is None or action.startswith('post_'):
+        invalidate_rosters()
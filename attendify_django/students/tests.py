@@ -1,3 +1,311 @@
-from django.test import TestCase
+import base64
+import datetime
+import io
 
-# Create your tests here.
+import numpy as np
+from django.db import IntegrityError, connection
+from django.db.migrations.executor import MigrationExecutor
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, TransactionTestCase, override_settings
+from rest_framework.test import APIClient
+
+from academic_sessions.models import AcademicSession, Semester
+from activities.models import Activity
+from authentication.authentication import create_jwt_token
+from authentication.models import User
+from courses.models import Course
+from utils.spreadsheets import SpreadsheetError, stream_csv, stream_xlsx
+from .fingerprint import fingerprint_indexes, unpack_template
+from .imports import import_students
+from .models import Enrollment, Student
+from .rosters import enrolled_among, get_roster, invalidate_rosters
+
+
+class EnrollmentTestCase(TestCase):
+
+    def setUp(self):
+        # Course ids are reused between tests; drop rosters cached by earlier ones
+        invalidate_rosters()
+        session = AcademicSession.objects.create(
+            name='2024/2025', start=datetime.date(2024, 9, 1), end=datetime.date(2025, 8, 31)
+        )
+        semester = Semester.objects.create(session=session, name='first')
+        self.course = Course.objects.create(
+            courseTitle='Compilers', courseCode='CSC 401', level='400', semester=semester
+        )
+        self.student = Student.objects.create(
+            name='Ada Student', regNo='2021/0001', level='400', addmissionYear='2021', email='ada@example.com'
+        )
+
+
+class EnrollmentFingerprintIndexTests(EnrollmentTestCase):
+
+    def setUp(self):
+        super().setUp()
+        fingerprint_indexes.clear()
+        self.addCleanup(fingerprint_indexes.clear)
+        self.template = np.random.default_rng(0).standard_normal(256).astype(np.float32)
+        self.student.set_fingerprint(self.template.tolist())
+
+    def probe(self):
+        return self.template / np.linalg.norm(self.template)
+
+    def test_enrollment_rows_update_loaded_course_index(self):
+        index = fingerprint_indexes.get(course_id=self.course.pk)
+        self.assertIsNone(index.identify(self.probe()))
+
+        # As the admin inline does: the row itself, no m2m_changed
+        enrollment = Enrollment.objects.create(student=self.student, course=self.course)
+        self.assertEqual(index.identify(self.probe())[0], self.student.pk)
+
+        enrollment.delete()
+        self.assertIsNone(index.identify(self.probe()))
+
+
+class IdentifyStudentTests(EnrollmentTestCase):
+
+    def setUp(self):
+        super().setUp()
+        fingerprint_indexes.clear()
+        self.addCleanup(fingerprint_indexes.clear)
+        self.template = np.random.default_rng(0).standard_normal(256).astype(np.float32)
+        self.student.set_fingerprint(self.template.tolist())
+
+    def identify(self, access='approved', role='lecturer'):
+        user = User.objects.create(email=f'{role}@example.com', fullName='Lecturer', role=role, access=access)
+        client = APIClient()
+        client.cookies['jwt'] = create_jwt_token(user)
+        return client.post(
+            '/api/v1/students/identify/',
+            {'fingerPrint': self.template.tolist(), 'courseId': self.course.pk},
+            format='json',
+        )
+
+    def test_identifies_enrolled_student(self):
+        Enrollment.objects.create(student=self.student, course=self.course)
+
+        response = self.identify()
+
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json()['data']['student']['regNo'], self.student.regNo)
+
+    def test_unknown_fingerprint_is_not_found(self):
+        self.assertEqual(self.identify().status_code, 404)
+
+    def test_unapproved_and_plain_user_accounts_are_refused(self):
+        Enrollment.objects.create(student=self.student, course=self.course)
+
+        self.assertEqual(self.identify(access='pending').status_code, 403)
+        self.assertEqual(self.identify(role='user').status_code, 403)
+
+
+class ListStudentsTests(EnrollmentTestCase):
+
+    def test_requires_approved_staff(self):
+        client = APIClient()
+        for role, access, expected in [
+            ('lecturer', 'approved', 200), ('lecturer', 'pending', 403), ('user', 'approved', 403),
+        ]:
+            user = User.objects.create(email=f'{role}-{access}@example.com', fullName='User', role=role, access=access)
+            client.force_authenticate(user)
+            with self.subTest(role=role, access=access):
+                self.assertEqual(client.get('/api/v1/students/').status_code, expected)
+
+
+class RosterTests(EnrollmentTestCase):
+
+    def test_missing_students_are_rechecked_in_the_database(self):
+        self.assertEqual(get_roster(self.course.pk), frozenset())
+
+        # bulk_create sends no signal: the cached roster is stale, as in another worker
+        Enrollment.objects.bulk_create([Enrollment(student=self.student, course=self.course)])
+
+        self.assertEqual(get_roster(self.course.pk), frozenset())
+        self.assertEqual(enrolled_among(self.course.pk, [self.student.pk, 999]), {self.student.pk})
+
+    def test_cached_roster_answers_without_a_query(self):
+        Enrollment.objects.create(student=self.student, course=self.course)
+        get_roster(self.course.pk)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(enrolled_among(self.course.pk, [self.student.pk]), {self.student.pk})
+
+
+@override_settings(ACTIVITY_LOG={'ALWAYS_FLUSH': True})
+class StudentImportTests(EnrollmentTestCase):
+
+    header = ['Full Name', 'Reg No', 'Level', 'Admission Year', 'Email', 'Courses']
+    rows = [
+        ['Grace Hopper', '2024/0001', '100', '2024', 'grace@example.com', 'csc402'],
+        ['', '', '', '', '', ''],
+        ['Alan Turing', '2024/0002', '100', '2024', 'alan@example.com', ''],
+        # Same regNo as row 2
+        ['Grace Again', '2024/0001', '100', '2024', 'again@example.com', ''],
+        # Already in the database
+        ['Ada Student', '2021/0001', '400', '2021', 'ada@example.com', ''],
+        ['', '2024/0003', '100', '2024', 'not-an-email', 'CSC999'],
+    ]
+
+    def setUp(self):
+        super().setUp()
+        self.course = Course.objects.create(courseTitle='Databases', courseCode='CSC402', level='100')
+
+    def csv_file(self):
+        return io.BytesIO(''.join(stream_csv(self.header, self.rows)).encode('utf-8'))
+
+    def assertImported(self, result):
+        self.assertEqual(
+            {key: result[key] for key in ['rows', 'created', 'enrollments', 'rejected']},
+            {'rows': 5, 'created': 2, 'enrollments': 1, 'rejected': 3},
+        )
+        self.assertEqual(result['errors'], [
+            {'row': 5, 'regNo': '2024/0001', 'errors': ['regNo repeats row 2']},
+            {'row': 6, 'regNo': '2021/0001', 'errors': ['regNo already exists']},
+            {'row': 7, 'regNo': '2024/0003', 'errors': [
+                'name is required', 'email is invalid', 'Unknown course code "CSC999"',
+            ]},
+        ])
+        grace = Student.objects.get(regNo='2024/0001')
+        self.assertEqual(grace.name, 'Grace Hopper')
+        self.assertEqual(list(grace.course.all()), [self.course])
+        self.assertEqual(enrolled_among(self.course.pk, [grace.pk]), {grace.pk})
+        self.assertTrue(Student.objects.filter(regNo='2024/0002').exists())
+        self.assertFalse(Student.objects.filter(regNo='2024/0003').exists())
+
+    def test_csv(self):
+        self.assertImported(import_students(self.csv_file(), 'csv', chunk_size=1))
+
+    def test_xlsx(self):
+        workbook = io.BytesIO(b''.join(stream_xlsx(self.header, self.rows)))
+
+        self.assertImported(import_students(workbook, 'xlsx'))
+
+    def test_dry_run_writes_nothing(self):
+        result = import_students(self.csv_file(), 'csv', dry_run=True)
+
+        self.assertEqual((result['created'], result['enrollments'], result['rejected']), (2, 1, 3))
+        self.assertEqual(Student.objects.count(), 1)
+
+    def test_missing_column_is_rejected(self):
+        with self.assertRaises(SpreadsheetError):
+            import_students(io.BytesIO(b'name,regNo\nGrace,2024/0001\n'), 'csv')
+
+    def test_endpoint_logs_import(self):
+        lecturer = User.objects.create(email='lecturer@example.com', fullName='Lecturer', access='approved')
+        client = APIClient()
+        client.force_authenticate(lecturer)
+        upload = SimpleUploadedFile('students.csv', self.csv_file().getvalue(), content_type='text/csv')
+
+        response = client.post('/api/v1/students/import/', {'file': upload})
+
+        self.assertEqual(response.status_code, 200, response.content)
+        activity = Activity.objects.get(activity_type='students_imported')
+        self.assertEqual(activity.get_activity_type_display(), 'Students Imported')
+        self.assertEqual(activity.metadata['created'], 2)
+
+
+class MigrationTestCase(TransactionTestCase):
+    """Starts each test with the database migrated back to ``before``"""
+
+    before = None
+
+    def setUp(self):
+        self.migrate(self.before)
+        self.addCleanup(self.migrate, None)
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.migrate(targets or executor.loader.graph.leaf_nodes())
+
+    def applied_apps(self):
+        loader = MigrationExecutor(connection).loader
+        return loader.project_state(list(loader.applied_migrations)).apps
+
+
+class FingerprintMigrationTests(MigrationTestCase):
+    """0003 copies text templates to StudentBiometric; 0004 drops the text column"""
+
+    before = [('students', '0002_studentbiometric')]
+
+    def setUp(self):
+        super().setUp()
+        Student = self.applied_apps().get_model('students', 'Student')
+        features = np.array([3, 4], dtype='<f4')
+        templates = {
+            'json': '[3, 4]',
+            'base64': base64.b64encode(features.tobytes()).decode('ascii'),
+            'words': '["a", "b"]',
+            'null': '[1, null]',
+            'garbage': 'not base64!',
+        }
+        self.students = {
+            name: Student.objects.create(
+                name=name, regNo=f'2021/{number:04}', level='400', addmissionYear='2021', fingerPrint=text
+            ).pk
+            for number, (name, text) in enumerate(templates.items())
+        }
+
+    def test_unconverted_templates_are_logged_and_kept(self):
+        with self.assertLogs('students.migrations', 'WARNING') as logs:
+            self.migrate([('students', '0003_copy_fingerprints_to_biometric')])
+
+        self.assertIn('3 fingerprint template(s) could not be converted', logs.output[-1])
+        for name in ['words', 'null', 'garbage']:
+            self.assertTrue(any(f'student {self.students[name]} not' in line for line in logs.output))
+
+        biometrics = self.applied_apps().get_model('students', 'StudentBiometric').objects
+        self.assertEqual(
+            set(biometrics.values_list('student_id', flat=True)),
+            {self.students['json'], self.students['base64']},
+        )
+        for biometric in biometrics.all():
+            np.testing.assert_allclose(unpack_template(biometric.template), [0.6, 0.8], rtol=1e-6)
+
+        # The column holding the three templates is not dropped
+        with self.assertRaisesMessage(RuntimeError, '3 student fingerprint template(s) could not be converted'):
+            self.migrate([('students', '0004_remove_student_fingerprint')])
+
+        Student = self.applied_apps().get_model('students', 'Student')
+        self.assertEqual(Student.objects.exclude(fingerPrint='').count(), 5)
+        Student.objects.filter(biometric__isnull=True).update(fingerPrint='')
+        self.migrate([('students', '0004_remove_student_fingerprint')])
+
+
+class EnrollmentMigrationTests(MigrationTestCase):
+    """0005_enrollment adopts the many-to-many table in place"""
+
+    before = [('students', '0004_remove_student_fingerprint')]
+
+    def setUp(self):
+        super().setUp()
+        apps = self.applied_apps()
+        Course = apps.get_model('courses', 'Course')
+        Student = apps.get_model('students', 'Student')
+        courses = [
+            Course.objects.create(courseTitle=title, courseCode=code, level='400')
+            for title, code in [('Compilers', 'CSC 401'), ('Networks', 'CSC 403')]
+        ]
+        self.pairs = set()
+        for number, enrolled in enumerate([courses, courses[1:]], start=1):
+            student = Student.objects.create(
+                name=f'Student {number}', regNo=f'2021/000{number}', level='400', addmissionYear='2021'
+            )
+            student.course.add(*enrolled)
+            self.pairs.update((student.pk, course.pk) for course in enrolled)
+        self.rows = set(Student.course.through.objects.values_list('id', 'student_id', 'course_id'))
+
+    def test_existing_rows_become_enrollments(self):
+        self.migrate(None)
+
+        self.assertEqual(set(Enrollment.objects.values_list('id', 'student_id', 'course_id')), self.rows)
+        self.assertFalse(Enrollment.objects.filter(enrolled_at__isnull=True).exists())
+        student_id, course_id = next(iter(self.pairs))
+        with self.assertRaises(IntegrityError):
+            Enrollment.objects.create(student_id=student_id, course_id=course_id)
+
+    def test_backwards_keeps_the_many_to_many_rows(self):
+        self.migrate(None)
+        self.migrate(self.before)
+
+        Student = self.applied_apps().get_model('students', 'Student')
+        self.assertEqual(set(Student.course.through.objects.values_list('id', 'student_id', 'course_id')), self.rows)
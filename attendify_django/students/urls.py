@@ -0,0 +1,8 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('', views.list_students, name='list_students'),
+    path('identify/', views.identify_student, name='identify_student'),
+    path('import/', views.import_students_file, name='import_students'),
+]
@@ -1,3 +1,137 @@
-from django.shortcuts import render
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework import status
+from asgiref.sync import sync_to_async
 
-# Create your views here.
+from activities.buffer import log_activity
+from utils.async_views import async_api_view
+from utils.pagination import paginate
+from utils.replicas import use_replica
+from utils.responses import success_response, error_response
+from utils.spreadsheets import SpreadsheetError
+from .fingerprint import fingerprint_indexes, decode_template, InvalidTemplate
+from .imports import import_students
+from .models import Student
+from .serializers import StudentSerializer, FingerprintIdentifySerializer, StudentImportSerializer
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@use_replica
+def list_students(request):
+    """List students by registration number, one keyset page at a time"""
+    try:
+        if request.user.role not in ['admin', 'lecturer'] or request.user.access != 'approved':
+            return error_response(
+                "You are not authorized to perform this action",
+                status.HTTP_403_FORBIDDEN
+            )
+        
+        students = Student.objects.all()
+        
+        course_id = request.query_params.get('course')
+        if course_id:
+            if not course_id.isdigit():
+                return error_response(
+                    "Invalid 'course' id",
+                    status.HTTP_400_BAD_REQUEST
+                )
+            students = students.filter(course__id=course_id)
+        
+        level = request.query_params.get('level')
+        if level:
+            students = students.filter(level=level)
+        
+        return paginate(request, students, StudentSerializer, "Students fetched successfully")
+        
+    except Exception as e:
+        return error_response(str(e), status.HTTP_400_BAD_REQUEST)
+
+
+@async_api_view(['POST'])
+async def identify_student(request):
+    """Identify a student from a fingerprint scan within a course or level"""
+    try:
+        if request.user.role not in ['admin', 'lecturer'] or request.user.access != 'approved':
+            return error_response(
+                "You are not authorized to perform this action",
+                status.HTTP_403_FORBIDDEN
+            )
+        
+        serializer = FingerprintIdentifySerializer(data=request.data)
+        
+        if not serializer.is_valid():
+            return error_response(
+                "Please provide a fingerprint and a courseId or level",
+                status.HTTP_400_BAD_REQUEST
+            )
+        
+        data = serializer.validated_data
+        
+        try:
+            probe = decode_template(data['fingerPrint'])
+        except InvalidTemplate as e:
+            return error_response(str(e), status.HTTP_400_BAD_REQUEST)
+        
+        index = await sync_to_async(fingerprint_indexes.get)(
+            course_id=data.get('courseId'), level=data.get('level')
+        )
+        # Matching is NumPy work; run it in a worker thread, off the event loop and the ORM's thread
+        match = await sync_to_async(index.identify, thread_sensitive=False)(probe)
+        
+        if match is None:
+            return error_response("No matching student found", status.HTTP_404_NOT_FOUND)
+        
+        student_id, distance = match
+        student = await Student.objects.aget(id=student_id)
+        
+        return success_response(
+            "Student identified successfully",
+            data={'student': StudentSerializer(student).data, 'distance': round(distance, 4)}
+        )
+        
+    except Exception as e:
+        return error_response(str(e), status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def import_students_file(request):
+    """Create students and their course enrollments from an uploaded CSV or XLSX file"""
+    try:
+        if request.user.role not in ['admin', 'lecturer'] or request.user.access != 'approved':
+            return error_response(
+                "You are not authorized to perform this action",
+                status.HTTP_403_FORBIDDEN
+            )
+        
+        serializer = StudentImportSerializer(data=request.data)
+        
+        if not serializer.is_valid():
+            return error_response(
+                "Please upload a CSV or XLSX file",
+                status.HTTP_400_BAD_REQUEST
+            )
+        
+        data = serializer.validated_data
+        
+        try:
+            result = import_students(data['file'], data['type'], dry_run=data['dryRun'])
+        except SpreadsheetError as e:
+            return error_response(str(e), status.HTTP_400_BAD_REQUEST)
+        
+        if not data['dryRun']:
+            log_activity(
+                'students_imported',
+                request.user,
+                f"Imported {result['created']} students from {data['file'].name}",
+                {key: result[key] for key in ['rows', 'created', 'enrollments', 'rejected']}
+            )
+        
+        return success_response(
+            "Students validated successfully" if data['dryRun'] else "Students imported successfully",
+            data=result
+        )
+        
+    except Exception as e:
+        return error_response(str(e), status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,7 @@
+from django.apps import AppConfig
+
+
+class UtilsConfig(AppConfig):
+    """Shared helpers; installed so their management commands are found"""
+
+    name = "utils"
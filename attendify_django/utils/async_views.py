@@ -0,0 +1,95 @@
+import functools
+import json
+
+from rest_framework import exceptions, status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from authentication.authentication import JWTAuthentication
+
+SAFE_METHODS = {'GET', 'HEAD', 'OPTIONS'}
+
+
+async def _authenticate(request):
+    """Set ``request.user``; return DRF's error response when the request isn't authenticated"""
+    try:
+        result = await JWTAuthentication().aauthenticate(request)
+    except exceptions.AuthenticationFailed as e:
+        return Response({'detail': e.detail}, status=status.HTTP_403_FORBIDDEN)
+
+    if result is not None:
+        request.user, request.auth = result
+        return None
+
+    # Admin sessions, on safe methods only since no CSRF check is made here
+    if request.method in SAFE_METHODS:
+        user = await request.auser()
+        if user.is_authenticated and user.is_active:
+            request.user, request.auth = user, None
+            return None
+    return Response(
+        {'detail': exceptions.NotAuthenticated.default_detail},
+        status=status.HTTP_403_FORBIDDEN,
+    )
+
+
+def _parse_body(request):
+    """The request body as ``request.data`` would hold it: JSON, form fields or nothing"""
+    if request.content_type == 'application/json':
+        if not request.body:
+            return {}
+        try:
+            return json.loads(request.body)
+        except ValueError as e:
+            raise exceptions.ParseError(f'JSON parse error - {e}')
+    if request.content_type in ('application/x-www-form-urlencoded', 'multipart/form-data'):
+        return request.POST
+    return {}
+
+
+def _render(response):
+    # Outside an APIView nobody negotiates a renderer; the API only speaks JSON
+    if isinstance(response, Response):
+        response.accepted_renderer = JSONRenderer()
+        response.accepted_media_type = response.accepted_renderer.media_type
+        response.renderer_context = {}
+    return response
+
+
+def async_api_view(methods, authenticated=True):
+    """Native async counterpart of ``@api_view`` + ``@permission_classes`` for high-volume endpoints.
+
+    The view is an ``async def`` served by the event loop under ASGI, so a
+    device connection waiting on the network or the database holds no
+    worker thread. It authenticates with the JWT (and, on safe methods, an
+    admin session) like ``IsAuthenticated``, exposes ``request.data`` and
+    may return the usual ``success_response``/``error_response``. Database
+    access must use the async ORM or ``sync_to_async``.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method not in methods:
+                response = Response(
+                    {'detail': exceptions.MethodNotAllowed(request.method).detail},
+                    status=status.HTTP_405_METHOD_NOT_ALLOWED,
+                    headers={'Allow': ', '.join(methods)},
+                )
+                return _render(response)
+
+            if authenticated:
+                response = await _authenticate(request)
+                if response is not None:
+                    return _render(response)
+
+            try:
+                request.data = _parse_body(request)
+            except exceptions.ParseError as e:
+                return _render(Response({'detail': e.detail}, status=status.HTTP_400_BAD_REQUEST))
+
+            return _render(await view(request, *args, **kwargs))
+
+        # Like every @api_view, authentication is by token rather than CSRF cookie
+        wrapper.csrf_exempt = True
+        return wrapper
+    return decorator
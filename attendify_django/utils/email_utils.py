@@ -1,11 +1,18 @@
-from django.core.mail import send_mail
+import logging
+
+from django.core.mail import EmailMessage, get_connection, send_mail
 from django.conf import settings
 from django.template.loader import render_to_string
 from django.utils.html import strip_tags
 
+from notifications.models import OutboundEmail
+from notifications.queue import enqueue_email, enqueue_emails
+
+logger = logging.getLogger(__name__)
+
 
 def send_email(subject, recipient_list, message=None, html_message=None):
-    """Send email using Django's email backend"""
+    """Queue email for the delivery worker, or send it at once if the queue is disabled"""
     try:
         if html_message:
             # If HTML message is provided, create plain text version
@@ -14,6 +21,10 @@ def send_email(subject, recipient_list, message=None, html_message=None):
             plain_message = message
             html_message = None
         
+        if settings.EMAIL_QUEUE_ENABLED:
+            enqueue_email(subject, recipient_list, plain_message, html_message)
+            return True
+        
         send_mail(
             subject=subject,
             message=plain_message,
@@ -23,8 +34,8 @@ def send_email(subject, recipient_list, message=None, html_message=None):
             fail_silently=False,
         )
         return True
-    except Exception as e:
-        print(f"Error sending email: {e}")
+    except Exception:
+        logger.exception('Error sending email to %s', ', '.join(recipient_list))
         return False
 
 
@@ -68,8 +79,8 @@ def send_password_reset_email(user, reset_token):
     return send_email(subject, [user.email], message)
 
 
-def send_approval_email(user):
-    """Send approval notification email to user"""
+def approval_email(user):
+    """Subject and body of the account approval notification"""
     subject = "Account Approved - Attendify"
     message = f"""
     Hello {user.fullName},
@@ -82,4 +93,61 @@ def send_approval_email(user):
     Attendify Team
     """
     
+    return subject, message
+
+
+def denial_email(user):
+    """Subject and body of the account denial notification"""
+    subject = "Account Request Declined - Attendify"
+    message = f"""
+    Hello {user.fullName},
+    
+    Your request for access to the Attendify system has been declined.
+    
+    If you believe this is a mistake, please contact your administrator.
+    
+    Best regards,
+    Attendify Team
+    """
+    
+    return subject, message
+
+
+ACCESS_EMAILS = {
+    'approved': approval_email,
+    'denied': denial_email,
+}
+
+
+def send_approval_email(user):
+    """Send approval notification email to user"""
+    subject, message = approval_email(user)
     return send_email(subject, [user.email], message)
+
+
+def send_access_emails(users, access):
+    """Notify many users of an access decision in one batch.
+
+    With the queue enabled the messages are stored with one insert; otherwise
+    they are sent over a single mail connection.
+    """
+    build = ACCESS_EMAILS[access]
+    try:
+        if settings.EMAIL_QUEUE_ENABLED:
+            enqueue_emails([
+                OutboundEmail(subject=subject, body=message, recipients=[user.email])
+                for user in users
+                for subject, message in [build(user)]
+            ])
+            return len(users)
+        
+        connection = get_connection()
+        messages = [
+            EmailMessage(subject, message, settings.DEFAULT_FROM_EMAIL, [user.email], connection=connection)
+            for user in users
+            for subject, message in [build(user)]
+        ]
+        return connection.send_messages(messages) or 0
+    except Exception:
+        logger.exception('Error sending %s access email(s)', access)
+        return 0
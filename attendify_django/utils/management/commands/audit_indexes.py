@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from utils.query_audit import explain, registered_queries
+
+
+class Command(BaseCommand):
+    help = "Explain the apps' canonical queries and fail if any of them scans a whole table"
+
+    def add_arguments(self, parser):
+        parser.add_argument('names', nargs='*', help='Only audit queries whose name starts with one of these')
+        parser.add_argument('--plans', action='store_true', help='Print every query plan')
+
+    def handle(self, *args, **options):
+        queries = [
+            query for query in registered_queries()
+            if not options['names'] or query[0].startswith(tuple(options['names']))
+        ]
+        if not queries:
+            raise CommandError('No canonical queries matched')
+
+        failures = []
+        for name, function, allow_scan in queries:
+            try:
+                plan, scanned = explain(function())
+            except NotImplementedError as e:
+                raise CommandError(str(e))
+            scanned = sorted(set(scanned) - allow_scan)
+            if scanned:
+                failures.append(name)
+                self.stdout.write(self.style.ERROR(f"FULL SCAN {name}: {', '.join(scanned)}"))
+            else:
+                self.stdout.write(f'ok        {name}')
+            if scanned or options['plans']:
+                for line in plan.splitlines():
+                    self.stdout.write(f'            {line}')
+
+        if failures:
+            raise CommandError(f'{len(failures)} of {len(queries)} canonical queries scan a whole table')
+        self.stdout.write(self.style.SUCCESS(f'All {len(queries)} canonical queries use an index.'))
@@ -0,0 +1,195 @@
+import datetime
+import json
+
+from django.core import signing
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .responses import success_response
+
+
+def _encode_value(value):
+    # Full precision: DjangoJSONEncoder would cut datetimes to milliseconds
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    return str(value)
+
+
+class _CursorSerializer(signing.JSONSerializer):
+
+    def dumps(self, obj):
+        return json.dumps(obj, separators=(',', ':'), default=_encode_value).encode('latin-1')
+
+
+def _flip(name):
+    return name[1:] if name.startswith('-') else f'-{name}'
+
+
+class KeysetPagination(BasePagination):
+    """Cursor pagination keyed on the queryset ordering plus the primary key.
+
+    Each page is fetched with a ``WHERE (ordering) < (last row)`` seek and a
+    ``LIMIT``, never an ``OFFSET`` or a ``COUNT(*)``, so with an index on the
+    ordering columns any page costs the same as the first. The cursor is an
+    opaque, signed token holding the boundary row's ordering values, so a
+    client can only hand back positions the server issued. Ordering fields
+    must be non-null columns of the model itself.
+    """
+
+    page_size = api_settings.PAGE_SIZE or 20
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'limit'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_ordering(self, queryset):
+        """Ordering of ``queryset`` with the primary key appended as a tie-breaker"""
+        model = queryset.model
+        ordering = list(queryset.query.order_by or model._meta.ordering)
+        fields = []
+        for name in ordering:
+            if not isinstance(name, str) or '__' in name.lstrip('-'):
+                raise ImproperlyConfigured(f'Keyset pagination cannot order by {name!r}')
+            field = self._field(model, name.lstrip('-'))
+            if field.null:
+                raise ImproperlyConfigured(f'Keyset pagination cannot order by nullable field {name!r}')
+            fields.append(field)
+
+        if not any(field.unique for field in fields):
+            descending = bool(ordering) and ordering[-1].startswith('-')
+            ordering.append('-pk' if descending else 'pk')
+        return ordering
+
+    @staticmethod
+    def _field(model, name):
+        if name == 'pk':
+            return model._meta.pk
+        try:
+            return model._meta.get_field(name)
+        except FieldDoesNotExist:
+            raise ImproperlyConfigured(f'Keyset pagination cannot order by unknown field {name!r}')
+
+    def page_queryset(self, queryset, position=None, reverse=False):
+        """Query for the page after ``position`` (before it when ``reverse``), one row over size"""
+        self.model = queryset.model
+        self.ordering = self.get_ordering(queryset)
+        if position is not None:
+            queryset = queryset.filter(self._seek(position, reverse))
+        ordering = [_flip(name) for name in self.ordering] if reverse else self.ordering
+        # One extra row tells whether there is another page, without counting
+        return queryset.order_by(*ordering)[:self.page_size + 1]
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.model = queryset.model
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset)
+
+        cursor = self.decode_cursor(request)
+        position, reverse = cursor if cursor is not None else (None, False)
+        rows = list(self.page_queryset(queryset, position, reverse))
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        self.has_next = has_more if not reverse else True
+        self.has_previous = cursor is not None if not reverse else has_more
+        self.page = rows
+        return rows
+
+    def _seek(self, position, reverse):
+        """Rows strictly after ``position`` in the (possibly reversed) ordering"""
+        condition = Q()
+        equal = {}
+        bound = None
+        for name, value in zip(self.ordering, position):
+            field = name.lstrip('-')
+            descending = name.startswith('-') != reverse
+            condition |= Q(**equal, **{f'{field}__{"lt" if descending else "gt"}': value})
+            equal[field] = value
+            if bound is None:
+                # Redundant range on the leading column lets the planner seek the index
+                bound = Q(**{f'{field}__{"lte" if descending else "gte"}': value})
+        return bound & condition
+
+    def _position(self, obj):
+        return [getattr(obj, self._field(self.model, name.lstrip('-')).attname) for name in self.ordering]
+
+    @property
+    def signer(self):
+        return signing.Signer(salt='utils.pagination.KeysetPagination')
+
+    def encode_cursor(self, obj, reverse):
+        token = self.signer.sign_object({'p': self._position(obj), 'r': reverse}, serializer=_CursorSerializer)
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            payload = self.signer.unsign_object(token, serializer=_CursorSerializer)
+            values, reverse = payload['p'], bool(payload['r'])
+            if not isinstance(values, list) or len(values) != len(self.ordering):
+                raise ValueError
+            position = [
+                self._field(self.model, name.lstrip('-')).to_python(value)
+                for name, value in zip(self.ordering, values)
+            ]
+        except (signing.BadSignature, ValueError, TypeError, KeyError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.request.build_absolute_uri(), self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_data(self, data):
+        return {
+            'results': data,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+        }
+
+    def get_paginated_response(self, data):
+        return success_response("Fetched successfully", data=self.get_paginated_data(data))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'results': schema,
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+            },
+        }
+
+
+def paginate(request, queryset, serializer_class, message):
+    """Keyset-paginate ``queryset`` and wrap the page in a success response"""
+    paginator = KeysetPagination()
+    page = paginator.paginate_queryset(queryset, request)
+    return success_response(
+        message,
+        data=paginator.get_paginated_data(serializer_class(page, many=True).data)
+    )
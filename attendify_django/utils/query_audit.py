@@ -0,0 +1,48 @@
+import re
+
+from django.db import connections, transaction
+from django.utils.module_loading import autodiscover_modules
+
+_queries = {}
+
+# SQLite reports "SCAN <table>" for a table scan and "SCAN <table> USING [COVERING] INDEX" otherwise
+_SQLITE_SCAN = re.compile(r'\bSCAN (\w+)\s*$', re.MULTILINE)
+_POSTGRES_SCAN = re.compile(r'\bSeq Scan on (\w+)')
+
+
+def canonical_query(name, allow_scan=()):
+    """Register a function returning a QuerySet the app relies on being indexed.
+
+    Apps register their hot queries in a ``queries`` module; the
+    ``audit_indexes`` command explains each one. ``allow_scan`` names
+    tables that may be scanned, such as small lookup tables.
+    """
+    def decorator(function):
+        _queries[name] = (function, frozenset(allow_scan))
+        return function
+    return decorator
+
+
+def registered_queries():
+    """(name, function, allow_scan) for every canonical query of the installed apps"""
+    autodiscover_modules('queries')
+    return [(name, *_queries[name]) for name in sorted(_queries)]
+
+
+def explain(queryset):
+    """Query plan of ``queryset`` and the tables it scans in full.
+
+    On PostgreSQL sequential scans are disabled for the explain, so a
+    ``Seq Scan`` that remains means no index can serve the query, whatever
+    the table size.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor == 'sqlite':
+        plan = queryset.explain()
+        return plan, _SQLITE_SCAN.findall(plan)
+    if connection.vendor == 'postgresql':
+        with transaction.atomic(using=queryset.db), connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            plan = queryset.explain()
+        return plan, _POSTGRES_SCAN.findall(plan)
+    raise NotImplementedError(f'Index audits are not supported on {connection.vendor}')
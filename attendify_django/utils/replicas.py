@@ -0,0 +1,126 @@
+import contextvars
+import functools
+import time
+
+from django.conf import settings
+from django.utils.deprecation import MiddlewareMixin
+
+# Per-request routing state: None outside views marked with ``use_replica``
+_routing = contextvars.ContextVar('replica_routing', default=None)
+
+SAFE_METHODS = {'GET', 'HEAD', 'OPTIONS'}
+
+
+def replica_alias():
+    """Database alias reports read from; the primary when no replica is configured"""
+    return settings.REPLICA_DATABASE if settings.REPLICA_DATABASE in settings.DATABASES else 'default'
+
+
+def is_pinned(request):
+    """Whether ``request`` comes from a client that wrote within ``REPLICA_PIN_SECONDS``"""
+    try:
+        pinned_until = float(request.COOKIES.get(settings.REPLICA_PIN_COOKIE, 0))
+    except ValueError:
+        return False
+    return pinned_until > time.time()
+
+
+class ReplicaRouter:
+    """Send reads inside ``use_replica`` views to the replica and everything else to the primary.
+
+    Once a request writes, its remaining reads go to the primary as well, so
+    a view never reads back a replica that hasn't caught up with it.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _routing.get()
+        if state is not None and not state['wrote']:
+            return replica_alias()
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        state = _routing.get()
+        if state is not None:
+            state['wrote'] = True
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == 'default'
+
+
+class primary:
+    """Context manager routing the reads inside it to the primary, e.g. to fill a process cache"""
+
+    def __enter__(self):
+        self._token = _routing.set(None)
+
+    def __exit__(self, *exc_info):
+        _routing.reset(self._token)
+
+
+def _stream_from_replica(chunks, state):
+    # Streamed bodies are produced after the view returns; route their queries the same way
+    chunks = iter(chunks)
+    while True:
+        token = _routing.set(state)
+        try:
+            chunk = next(chunks)
+        except StopIteration:
+            return
+        finally:
+            _routing.reset(token)
+        yield chunk
+
+
+def use_replica(view):
+    """Serve the view's reads from the replica unless the client is pinned to the primary.
+
+    Apply below ``@api_view``/``@permission_classes`` so authentication
+    still reads the primary. Clients that wrote recently carry a pin cookie
+    set by ``ReplicaPinMiddleware`` and keep reading the primary.
+    """
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if replica_alias() == 'default' or is_pinned(request):
+            return view(request, *args, **kwargs)
+        state = {'wrote': False}
+        token = _routing.set(state)
+        try:
+            response = view(request, *args, **kwargs)
+        finally:
+            _routing.reset(token)
+        if getattr(response, 'streaming', False):
+            response.streaming_content = _stream_from_replica(response.streaming_content, state)
+        return response
+    return wrapper
+
+
+class ReplicaPinMiddleware(MiddlewareMixin):
+    """Pin a client to the primary for ``REPLICA_PIN_SECONDS`` after each successful write request.
+
+    Login, marking and other unsafe requests set a short-lived cookie, so
+    the lists fetched right after them see the new rows even while the
+    replica lags.
+    """
+
+    def process_response(self, request, response):
+        if (
+            request.method not in SAFE_METHODS
+            and response.status_code < 400
+            and replica_alias() != 'default'
+        ):
+            seconds = settings.REPLICA_PIN_SECONDS
+            response.set_cookie(
+                settings.REPLICA_PIN_COOKIE,
+                str(time.time() + seconds),
+                max_age=seconds,
+                httponly=True,
+                # Sent cross-site like the jwt cookie
+                samesite='None',
+                secure=True,
+            )
+        return response
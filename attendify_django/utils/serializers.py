@@ -0,0 +1,21 @@
+from rest_framework import serializers
+
+from .spreadsheets import SPREADSHEET_READERS
+
+
+class SpreadsheetUploadSerializer(serializers.Serializer):
+    """Serializer for an uploaded CSV or XLSX file"""
+    
+    file = serializers.FileField()
+    type = serializers.ChoiceField(choices=list(SPREADSHEET_READERS), required=False)
+    dryRun = serializers.BooleanField(default=False)
+    
+    def validate(self, attrs):
+        """Infer the file type from the file name when it is not given"""
+        if not attrs.get('type'):
+            extension = attrs['file'].name.rsplit('.', 1)[-1].lower()
+            if extension not in SPREADSHEET_READERS:
+                raise serializers.ValidationError("type must be csv or xlsx")
+            attrs['type'] = extension
+        
+        return attrs
@@ -0,0 +1,310 @@
+import csv
+import datetime
+import io
+import posixpath
+import re
+import zipfile
+from xml.etree.ElementTree import ParseError, fromstring, iterparse
+from xml.sax.saxutils import escape
+
+# Excel's hard limit per worksheet, including the header row
+XLSX_MAX_ROWS = 1048576
+
+_END = object()
+
+_ILLEGAL_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '{sheets}'
+    '</Types>'
+)
+_SHEET_CONTENT_TYPE = (
+    '<Override PartName="/xl/worksheets/sheet{number}.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+)
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets>{sheets}</sheets></workbook>'
+)
+_WORKBOOK_SHEET = '<sheet name="{name}" sheetId="{number}" r:id="rId{number}"/>'
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '{sheets}</Relationships>'
+)
+_WORKBOOK_REL = (
+    '<Relationship Id="rId{number}" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet{number}.xml"/>'
+)
+_SHEET_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+_SHEET_END = '</sheetData></worksheet>'
+
+_MAIN_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+_REL_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+_PACKAGE_REL_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+_CELL_COLUMN = re.compile(r'[A-Z]+')
+
+
+class SpreadsheetError(ValueError):
+    """Raised when an uploaded file cannot be read as a spreadsheet"""
+
+
+class _Echo:
+    """File-like object that hands back whatever is written to it"""
+
+    def write(self, value):
+        return value
+
+
+class _ChunkBuffer:
+    """Write-only, unseekable buffer drained by the streaming generator"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_csv(header, rows):
+    """Yield CSV lines for ``header`` followed by ``rows``"""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def _xlsx_cell(value):
+    if value is None:
+        return '<c/>'
+    if isinstance(value, bool):
+        return f'<c t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)):
+        return f'<c><v>{value}</v></c>'
+    if isinstance(value, (datetime.date, datetime.time)):
+        value = value.isoformat()
+    text = escape(_ILLEGAL_XML_CHARS.sub('', str(value)))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _xlsx_row(values):
+    return ('<row>' + ''.join(_xlsx_cell(value) for value in values) + '</row>').encode('utf-8')
+
+
+def stream_xlsx(header, rows, sheet_name='Sheet', flush_every=500):
+    """Yield an XLSX workbook for ``header`` followed by ``rows`` in chunks.
+
+    The zip archive is written to an unseekable buffer (so entries use data
+    descriptors) and drained every ``flush_every`` rows, which keeps memory
+    flat however many rows are streamed. Rows beyond Excel's per-sheet limit
+    continue on additional sheets.
+    """
+    buffer = _ChunkBuffer()
+    sheets = 0
+    rows = iter(rows)
+    pending = next(rows, _END)
+
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        while True:
+            sheets += 1
+            with archive.open(f'xl/worksheets/sheet{sheets}.xml', 'w', force_zip64=True) as sheet:
+                sheet.write(_SHEET_START.encode('utf-8'))
+                sheet.write(_xlsx_row(header))
+                written = 1
+                while pending is not _END and written < XLSX_MAX_ROWS:
+                    sheet.write(_xlsx_row(pending))
+                    written += 1
+                    pending = next(rows, _END)
+                    if written % flush_every == 0:
+                        chunk = buffer.drain()
+                        if chunk:
+                            yield chunk
+                sheet.write(_SHEET_END.encode('utf-8'))
+            yield buffer.drain()
+            if pending is _END:
+                break
+
+        names = [
+            escape((f'{sheet_name} {number}' if sheets > 1 else sheet_name)[:31])
+            for number in range(1, sheets + 1)
+        ]
+        numbers = range(1, sheets + 1)
+        archive.writestr('[Content_Types].xml', _CONTENT_TYPES.format(
+            sheets=''.join(_SHEET_CONTENT_TYPE.format(number=number) for number in numbers)
+        ))
+        archive.writestr('_rels/.rels', _ROOT_RELS)
+        archive.writestr('xl/workbook.xml', _WORKBOOK.format(sheets=''.join(
+            _WORKBOOK_SHEET.format(name=name, number=number) for name, number in zip(names, numbers)
+        )))
+        archive.writestr('xl/_rels/workbook.xml.rels', _WORKBOOK_RELS.format(
+            sheets=''.join(_WORKBOOK_REL.format(number=number) for number in numbers)
+        ))
+    yield buffer.drain()
+
+
+def read_csv(file):
+    """Yield the rows of a binary CSV file as lists of strings, one at a time"""
+    text = io.TextIOWrapper(file, encoding='utf-8-sig', newline='')
+    try:
+        yield from csv.reader(text)
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise SpreadsheetError(f'Invalid CSV file: {e}')
+    finally:
+        # Leave the caller's file open
+        text.detach()
+
+
+def _column_index(reference):
+    index = 0
+    for letter in _CELL_COLUMN.match(reference).group():
+        index = index * 26 + ord(letter) - 64
+    return index - 1
+
+
+def _shared_strings(archive):
+    try:
+        source = archive.open('xl/sharedStrings.xml')
+    except KeyError:
+        return []
+    strings = []
+    with source:
+        for _, element in iterparse(source):
+            if element.tag == f'{_MAIN_NS}si':
+                strings.append(''.join(text.text or '' for text in element.iter(f'{_MAIN_NS}t')))
+                element.clear()
+    return strings
+
+
+def _first_sheet(archive):
+    """Path of the workbook's first worksheet"""
+    try:
+        workbook = archive.read('xl/workbook.xml')
+        relations = archive.read('xl/_rels/workbook.xml.rels')
+    except KeyError:
+        return 'xl/worksheets/sheet1.xml'
+    sheet = fromstring(workbook).find(f'{_MAIN_NS}sheets/{_MAIN_NS}sheet')
+    target = None
+    if sheet is not None:
+        for relation in fromstring(relations).iter(f'{_PACKAGE_REL_NS}Relationship'):
+            if relation.get('Id') == sheet.get(f'{_REL_NS}id'):
+                target = relation.get('Target')
+    if not target:
+        return 'xl/worksheets/sheet1.xml'
+    return target.lstrip('/') if target.startswith('/') else posixpath.normpath(f'xl/{target}')
+
+
+def _xlsx_value(cell, strings):
+    kind = cell.get('t')
+    if kind == 'inlineStr':
+        return ''.join(text.text or '' for text in cell.iter(f'{_MAIN_NS}t'))
+    value = cell.findtext(f'{_MAIN_NS}v')
+    if value is None:
+        return ''
+    if kind == 's':
+        return strings[int(value)]
+    if kind == 'b':
+        return 'TRUE' if value == '1' else 'FALSE'
+    if kind is None and value.endswith('.0'):
+        # Whole numbers such as admission years come back as floats
+        return value[:-2]
+    return value
+
+
+def read_xlsx(file):
+    """Yield the rows of the first sheet of an XLSX file as lists of strings.
+
+    The sheet is parsed incrementally and each row is discarded once read,
+    so memory holds one row plus the shared-string table. Blank rows are
+    yielded as empty lists so row numbers match the sheet. Dates are returned
+    as Excel serial numbers; type them as text for import.
+    """
+    try:
+        archive = zipfile.ZipFile(file)
+        strings = _shared_strings(archive)
+        sheet = archive.open(_first_sheet(archive))
+    except (zipfile.BadZipFile, KeyError, ParseError) as e:
+        raise SpreadsheetError(f'Invalid XLSX file: {e}')
+
+    with archive, sheet:
+        try:
+            number = 0
+            for _, element in iterparse(sheet):
+                if element.tag != f'{_MAIN_NS}row':
+                    continue
+                # Empty rows are left out of the file; keep row numbers aligned with Excel's
+                target = int(element.get('r') or number + 1)
+                while number + 1 < target:
+                    number += 1
+                    yield []
+                number = target
+                row = []
+                for cell in element.iter(f'{_MAIN_NS}c'):
+                    reference = cell.get('r')
+                    if reference:
+                        row.extend([''] * (_column_index(reference) - len(row)))
+                    row.append(_xlsx_value(cell, strings))
+                element.clear()
+                yield row
+        except (ParseError, ValueError, IndexError, AttributeError) as e:
+            raise SpreadsheetError(f'Invalid XLSX file: {e}')
+
+
+def header_columns(header, aliases, required):
+    """Map field names to column positions.
+
+    ``aliases`` maps header names, lowercased and without spaces, underscores
+    or hyphens, to field names. Raises ``SpreadsheetError`` listing the
+    ``required`` fields that have no column.
+    """
+    columns = {}
+    for position, value in enumerate(header):
+        field = aliases.get(re.sub(r'[\s_\-]+', '', str(value)).lower())
+        if field and field not in columns:
+            columns[field] = position
+    missing = [name for name in required if name not in columns]
+    if missing:
+        raise SpreadsheetError(f"Missing column(s): {', '.join(missing)}")
+    return columns
+
+
+def row_values(row, columns):
+    """Stripped cell values of ``row`` by field name; missing cells are empty"""
+    return {
+        field: str(row[position]).strip() if position < len(row) else ''
+        for field, position in columns.items()
+    }
+
+
+SPREADSHEET_READERS = {
+    'csv': read_csv,
+    'xlsx': read_xlsx,
+}
@@ -0,0 +1,19 @@
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+
+class AuditIndexesTests(TestCase):
+
+    def test_canonical_queries_use_an_index(self):
+        output = StringIO()
+
+        call_command('audit_indexes', stdout=output)
+
+        self.assertIn('canonical queries use an index', output.getvalue())
+        self.assertNotIn('FULL SCAN', output.getvalue())
+
+    def test_unknown_name_is_an_error(self):
+        with self.assertRaisesMessage(CommandError, 'No canonical queries matched'):
+            call_command('audit_indexes', 'nothing', stdout=StringIO())
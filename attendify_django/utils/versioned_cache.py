@@ -0,0 +1,83 @@
+import threading
+import time
+
+from django.core.cache import caches
+from django.db import transaction
+
+from .replicas import primary
+
+
+class VersionedLocalCache:
+    """Process-local cache whose entries are invalidated by a shared version number.
+
+    Values live in this process's memory, so hits cost no I/O. A version
+    counter kept in one of Django's caches is re-read at most every
+    ``check_interval`` seconds; when another worker bumps it, every local
+    entry is dropped. With the default per-process ``LocMemCache`` the
+    counter is not shared, and ``timeout`` alone bounds how stale another
+    worker's copy can get.
+    """
+
+    def __init__(self, name, timeout=300, check_interval=1.0, cache_alias='default'):
+        self.name = name
+        self.timeout = timeout
+        self.check_interval = check_interval
+        self.cache_alias = cache_alias
+        self._entries = {}
+        self._version = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def version_key(self):
+        return f'versioned:{self.name}:version'
+
+    def _shared_version(self):
+        return caches[self.cache_alias].get(self.version_key, 0)
+
+    def _sync(self):
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return
+        version = self._shared_version()
+        with self._lock:
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+            self._checked_at = now
+
+    def get_or_set(self, key, default):
+        """Return the cached value for ``key``, computing it with ``default()`` on a miss"""
+        self._sync()
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+        # A lagging replica must not be cached for the whole timeout
+        with primary():
+            value = default()
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.timeout, value)
+        return value
+
+    def clear_local(self):
+        with self._lock:
+            self._entries.clear()
+            self._checked_at = 0.0
+
+    def bump(self):
+        """Invalidate the entries of every process now and again after commit.
+
+        The second bump covers a reader that re-cached the old value between
+        the write and the commit.
+        """
+        self._bump()
+        transaction.on_commit(self._bump)
+
+    def _bump(self):
+        cache = caches[self.cache_alias]
+        try:
+            cache.incr(self.version_key)
+        except ValueError:
+            # Counter missing or evicted: any new value differs from what workers hold
+            cache.add(self.version_key, time.time_ns(), None)
+        self.clear_local()